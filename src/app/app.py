@@ -1,3 +1,4 @@
+import os
 from datetime import datetime
 from pathlib import Path
 
@@ -19,30 +20,53 @@ logger = get_logger(name =__name__,  dir_output = '.', base_file = 'log_app.json
 
 app = Flask(__name__)
 app.secret_key = "supersecret"
+# Achter nginx ('x-accel') of Apache/lighttpd ('x-sendfile') verstuurt de proxy downloads zelf
+app.config["DOWNLOAD_OFFLOAD"] = os.environ.get("GENESIS_DOWNLOAD_OFFLOAD")
+app.config["DOWNLOAD_ACCEL_PREFIX"] = os.environ.get("GENESIS_DOWNLOAD_ACCEL_PREFIX", "/protected/")
 app.register_blueprint(browser, url_prefix="/browser")
 app.register_blueprint(config_handler, url_prefix="/configs")
 app.register_blueprint(runner, url_prefix="/runner")
 
 config_registry = ConfigRegistry()
 
+PER_PAGE_DEFAULT = 50
+PER_PAGE_MAX = 500
+
 
 @app.route("/", methods=["GET", "POST"])
 def index() -> Response:
     """Toont de startpagina met een lijst van beschikbare configuratiebestanden.
 
-    Deze functie verzamelt alle configuratiebestanden en rendert de indexpagina waarop deze worden weergegeven.
+    Deze functie haalt één pagina configuratiebestanden op uit de gesorteerde index van het register
+    en rendert de indexpagina waarop deze worden weergegeven. Sorteren, filteren op naamprefix en
+    pagineren gaan via de queryparameters sort, order, q, page en per_page.
 
     Returns:
         Response: Een HTML-pagina met een lijst van configuratiebestanden.
     """
     sort_by = request.args.get('sort', 'name')
     order = request.args.get('order', 'asc')
-    configs = list(config_registry.get_configs())
+    prefix = request.args.get('q', '').strip()
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', PER_PAGE_DEFAULT, type=int), 1), PER_PAGE_MAX)
     key_map = {'name': 'path_config', 'created': 'created', 'modified': 'modified'}
     key = key_map.get(sort_by, 'path_config')
     reverse = order == 'desc'
-    configs.sort(key=lambda x: x[key], reverse=reverse)
-    return render_template('index.html', configs=configs, sort_by=sort_by, order=order)
+    configs, total = config_registry.get_configs_page(
+        sort_key=key, reverse=reverse, prefix=prefix, offset=(page - 1) * per_page, limit=per_page
+    )
+    pages = max((total + per_page - 1) // per_page, 1)
+    return render_template(
+        'index.html',
+        configs=configs,
+        sort_by=sort_by,
+        order=order,
+        q=prefix,
+        page=page,
+        pages=pages,
+        per_page=per_page,
+        total=total,
+    )
 
 
 @app.template_filter("datetimeformat")
@@ -1,17 +1,107 @@
+import json
+import os
 import threading
+import time
+from bisect import bisect_left, insort
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from types import MappingProxyType
 
 from .genesis_runner import GenesisRunner
 from config import GenesisConfig
+from config.stage_cache import StageCache
+from config.version_allocator import VersionAllocator
 from logtools import get_logger
 
 logger = get_logger(name =__name__,  dir_output = '.', base_file = 'log_app.json')
 
+
+def _stat_key_output(dir_output: Path) -> list[int] | None:
+    """Bepaalt de stat-sleutel waarmee wijzigingen aan de outputmap van een configuratie worden herkend.
+
+    Een nieuwe of verwijderde versiemap wijzigt de titelmap; een run die stappen afrondt of met een
+    vingerafdruk eindigt wijzigt de nieuwste versiemap of de map met stapmarkeringen daarin. Zo worden
+    ook runs buiten de app (CLI of batch) opgemerkt zonder het configuratiebestand opnieuw te lezen.
+
+    Args:
+        dir_output: De outputmap van de configuratie ('<folder_intermediate_root>/<title>').
+
+    Returns:
+        list[int] | None: De wijzigingstijden (ns) van deze mappen, of None als de outputmap niet bestaat.
+    """
+    try:
+        stat_key = [dir_output.stat().st_mtime_ns]
+    except OSError:
+        return None
+    if versions := VersionAllocator(dir_output).versions():
+        path_version = dir_output / versions[0]
+        for path in (path_version, path_version / StageCache.DIR_MANIFESTS):
+            try:
+                stat_key.append(path.stat().st_mtime_ns)
+            except OSError:
+                stat_key.append(0)
+    return stat_key
+
+
+def _read_config_metadata(path_config: Path) -> tuple[dict | None, str | None, float]:
+    """Leest en valideert één configuratiebestand en verzamelt de metadata voor het register.
+
+    Staat op moduleniveau en bevat geen runner, zodat de functie ook in een procespool uitgevoerd
+    kan worden. Fouten worden als tekst teruggegeven in plaats van opgeworpen.
+
+    Args:
+        path_config: Het pad naar het configuratiebestand.
+
+    Returns:
+        tuple[dict | None, str | None, float]: De metadata (of None bij een fout), de foutmelding
+        (of None) en de verwerkingsduur in seconden.
+    """
+    time_start = time.perf_counter()
+    try:
+        stat = path_config.stat()
+        genesis_config = GenesisConfig(file_config=path_config, create_version_dir=False)
+        metadata = {
+            "path_config": path_config.name,
+            "dir_output": genesis_config.path_intermediate_root,
+            "exists_output": genesis_config.path_intermediate_root.exists(),
+            "size_output": genesis_config.retention.total_size(),
+            "version_resume": genesis_config.find_resumable_version(),
+            # Pas na het meten bepalen: de boekhouding van de retentie schrijft zelf in de outputmap
+            "stat_output": _stat_key_output(genesis_config.path_intermediate_root),
+            "created": datetime.fromtimestamp(stat.st_ctime),
+            "modified": datetime.fromtimestamp(stat.st_mtime),
+            "stat_key": [stat.st_mtime_ns, stat.st_size, stat.st_ino],
+        }
+        return metadata, None, time.perf_counter() - time_start
+    except Exception as e:
+        return None, str(e), time.perf_counter() - time_start
+
+
 class ConfigRegistry:
-    """Beheert het register van configuratiebestanden en hun metadata."""
+    """Beheert het register van configuratiebestanden en hun metadata.
+
+    Lezers werken op een onveranderlijke snapshot van het register die in zijn geheel wordt
+    vervangen (copy-on-write). Schrijvers bouwen de volgende snapshot buiten de lock op en
+    nemen de schrijflock alleen voor het samenvoegen en omwisselen, zodat lezers nooit op I/O wachten.
+
+    De metadata wordt na elke wijziging met de stat-sleutels van het bestand en van de outputmap
+    weggeschreven naar FILE_SNAPSHOT. Bij het opstarten worden alleen bestanden waarvan een van
+    beide stat-sleutels afwijkt opnieuw gevalideerd, op de achtergrond.
+
+    Meerdere bestanden tegelijk inlezen gebeurt met een begrensde pool van PARSE_MAX_WORKERS
+    threads, of processen als PARSE_WITH_PROCESSES is ingeschakeld.
+
+    Per sorteersleutel uit SORT_KEYS wordt een gesorteerde index bijgehouden die bij elke nieuwe
+    snapshot incrementeel wordt bijgewerkt, zodat pagina's zonder sorteren kunnen worden opgehaald.
+    """
     _instance = None
     CONFIG_DIR = Path("configs").resolve()
+    FILE_SNAPSHOT = CONFIG_DIR / ".registry_snapshot.json"
+    SNAPSHOT_VERSION = 5
+    PARSE_MAX_WORKERS = os.cpu_count() or 1
+    PARSE_WITH_PROCESSES = False
+    SORT_KEYS = ("path_config", "created", "modified")
     _lock = threading.Lock()
 
 
@@ -33,26 +123,190 @@ class ConfigRegistry:
     def __init__(self):
         """Initialiseert een nieuwe instantie van ConfigRegistry.
 
-        Zet de status- en configuratieregisters op bij het aanmaken van de instantie.
+        Zet de status- en configuratieregisters op bij het aanmaken van de instantie. Als er een
+        opgeslagen snapshot is wordt het register daaruit opgebouwd en worden gewijzigde bestanden
+        op de achtergrond gevalideerd; zonder snapshot worden alle bestanden direct ingelezen.
+        """
+        if getattr(self, "_initialized", False):
+            return
+        self._initialized = True
+        self._lock_write = threading.Lock()
+        self._statuses = MappingProxyType({})
+        self._configs = MappingProxyType({})
+        self._sort_indexes = MappingProxyType({key: () for key in self.SORT_KEYS})
+
+        snapshot = self._read_snapshot()
+        if not snapshot:
+            self._publish(configs=self.init_configs())
+            self._write_snapshot()
+            return
+
+        configs, paths_stale = {}, []
+        for path_config in self._paths_config():
+            meta = snapshot.get(path_config.name)
+            if meta is not None and not self._is_stale(path_config, meta):
+                configs[path_config.name] = self._create_config_entry_from_snapshot(path_config, meta)
+            else:
+                paths_stale.append(path_config)
+        self._publish(configs=configs)
+        if paths_stale or len(configs) != len(snapshot):
+            threading.Thread(target=self._revalidate, args=(paths_stale,), daemon=True).start()
+
+    @property
+    def configs(self) -> MappingProxyType:
+        """Geeft de actuele, onveranderlijke snapshot van het configuratieregister.
+
+        Returns:
+            MappingProxyType: Een alleen-lezen mapping van bestandsnaam naar configuratie-informatie.
+        """
+        return self._configs
+
+    @property
+    def statuses(self) -> MappingProxyType:
+        """Geeft de actuele, onveranderlijke snapshot van de statuslijst.
+
+        Returns:
+            MappingProxyType: Een alleen-lezen mapping van bestandsnaam naar status.
+        """
+        return self._statuses
+
+    def _publish(self, configs: dict | None = None, statuses: dict | None = None) -> None:
+        """Vervangt de gepubliceerde snapshots atomair door nieuwe versies.
+
+        Moet aangeroepen worden terwijl de schrijflock wordt vastgehouden. De sorteerindexen worden
+        samen met het register vervangen.
+
+        Args:
+            configs: Het nieuwe configuratieregister, of None om het huidige te behouden.
+            statuses: De nieuwe statuslijst, of None om de huidige te behouden.
+        """
+        if configs is not None:
+            self._sort_indexes = self._update_sort_indexes(self._configs, configs)
+            self._configs = MappingProxyType(configs)
+        if statuses is not None:
+            self._statuses = MappingProxyType(statuses)
+
+    def _update_sort_indexes(self, configs_old: MappingProxyType, configs_new: dict) -> MappingProxyType:
+        """Werkt de sorteerindexen incrementeel bij voor het verschil tussen twee snapshots.
+
+        Alleen verwijderde, gewijzigde en nieuwe items worden met binair zoeken uit de index
+        gehaald of erin gevoegd; de rest van de index blijft ongemoeid.
+
+        Args:
+            configs_old: De huidige snapshot van het register.
+            configs_new: De nieuwe inhoud van het register.
+
+        Returns:
+            MappingProxyType: Per sorteersleutel een tuple van (waarde, bestandsnaam)-paren in oplopende volgorde.
+        """
+        removed = [
+            (filename, config)
+            for filename, config in configs_old.items()
+            if configs_new.get(filename) is not config
+        ]
+        added = [
+            (filename, config)
+            for filename, config in configs_new.items()
+            if configs_old.get(filename) is not config
+        ]
+        sort_indexes = {}
+        for key in self.SORT_KEYS:
+            index = list(self._sort_indexes[key])
+            for filename, config in removed:
+                pos = bisect_left(index, (config[key], filename))
+                if pos < len(index) and index[pos] == (config[key], filename):
+                    del index[pos]
+            for filename, config in added:
+                insort(index, (config[key], filename))
+            sort_indexes[key] = tuple(index)
+        return MappingProxyType(sort_indexes)
+
+    @staticmethod
+    def _stat_key(path_config: Path) -> list[int] | None:
+        """Bepaalt de stat-sleutel waarmee wijzigingen aan een configuratiebestand worden herkend.
+
+        Args:
+            path_config: Het pad naar het configuratiebestand.
+
+        Returns:
+            list[int] | None: Wijzigingstijd (ns), grootte en inode, of None als het bestand niet bestaat.
         """
-        self.statuses = {}
-        self.configs = self.init_configs()
+        try:
+            stat = path_config.stat()
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size, stat.st_ino]
+
+    @classmethod
+    def _is_stale(cls, path_config: Path, meta: dict) -> bool:
+        """Controleert of de metadata van een configuratie opnieuw bepaald moet worden.
+
+        Dat is zo als het configuratiebestand is gewijzigd, maar ook als de outputmap is gewijzigd,
+        omdat de grootte en de te hervatten versie daarvan afhangen.
+
+        Args:
+            path_config: Het pad naar het configuratiebestand.
+            meta: De bekende metadata van het configuratiebestand.
+
+        Returns:
+            bool: True als het bestand opnieuw ingelezen moet worden.
+        """
+        return (
+            meta["stat_key"] != cls._stat_key(path_config)
+            or meta["stat_output"] != _stat_key_output(Path(meta["dir_output"]))
+        )
+
+    @classmethod
+    def _paths_config(cls) -> list[Path]:
+        """Geeft de paden van alle YAML-configuratiebestanden in de configuratiemap.
+
+        Returns:
+            list[Path]: De paden naar de configuratiebestanden.
+        """
+        return [
+            f
+            for f in cls.CONFIG_DIR.iterdir()
+            if f.is_file() and f.suffix.lower() in [".yaml", ".yml"]
+        ]
 
     @classmethod
     def _create_config_entry(cls, path_config: Path) -> dict:
-        try:
-            genesis_config = GenesisConfig(file_config=path_config, create_version_dir=False)
-            return {
-                "path_config": path_config.name,
-                "dir_output": genesis_config.path_intermediate_root,
-                "exists_output": genesis_config.path_intermediate_root.exists(),
-                "created": datetime.fromtimestamp(path_config.stat().st_ctime),
-                "modified": datetime.fromtimestamp(path_config.stat().st_mtime),
-                "runner": GenesisRunner(path_config=path_config),
-            }
-        except Exception as e:
-            logger.error(f"Fout bij het verwerken van {path_config.name}: {str(e)}")
-            raise
+        metadata, error, _ = _read_config_metadata(path_config)
+        if error is not None:
+            logger.error(f"Fout bij het verwerken van {path_config.name}: {error}")
+            raise ValueError(error)
+        return {**metadata, "runner": GenesisRunner(path_config=path_config)}
+
+    @classmethod
+    def _create_config_entries(cls, paths_config: list[Path]) -> dict:
+        """Leest meerdere configuratiebestanden parallel in met een begrensde workerpool.
+
+        De resultaten worden in een stabiele volgorde (op bestandsnaam) verzameld, ongeacht de
+        volgorde waarin de workers klaar zijn. Fouten en verwerkingstijden worden per bestand gelogd.
+
+        Args:
+            paths_config: De paden van de configuratiebestanden die ingelezen moeten worden.
+
+        Returns:
+            dict: Een dictionary met configuratiebestandsnamen als sleutels en hun metadata als waarden.
+        """
+        paths_config = sorted(paths_config, key=lambda p: p.name)
+        if len(paths_config) <= 1:
+            results = [_read_config_metadata(path_config) for path_config in paths_config]
+        else:
+            executor_class = ProcessPoolExecutor if cls.PARSE_WITH_PROCESSES else ThreadPoolExecutor
+            max_workers = max(1, min(cls.PARSE_MAX_WORKERS, len(paths_config)))
+            with executor_class(max_workers=max_workers) as executor:
+                results = list(executor.map(_read_config_metadata, paths_config))
+
+        result = {}
+        for path_config, (metadata, error, duration) in zip(paths_config, results):
+            if error is not None:
+                logger.error(f"Fout bij het verwerken van {path_config.name}: {error}")
+                continue
+            logger.info(f"Configuratiebestand {path_config.name} ingelezen in {duration * 1000:.1f} ms.")
+            result[path_config.name] = {**metadata, "runner": GenesisRunner(path_config=path_config)}
+        return result
 
     @classmethod
     def init_configs(cls):
@@ -64,28 +318,145 @@ class ConfigRegistry:
         Returns:
             dict: Een dictionary met configuratiebestandsnamen als sleutels en hun metadata als waarden.
         """
-        paths_config = [
-                f
-                for f in cls.CONFIG_DIR.iterdir()
-                if f.is_file() and f.suffix.lower() in [".yaml", ".yml"]
-            ]
+        return cls._create_config_entries(cls._paths_config())
 
-        result = {}
-        for path_config in paths_config:
-            try:
-                result[path_config.name] = cls._create_config_entry(path_config)
-            except Exception:
-                continue
-        return result
+    @classmethod
+    def _read_snapshot(cls) -> dict:
+        """Leest de opgeslagen snapshot van het register in.
+
+        Een ontbrekende, onleesbare of verouderde snapshot levert een leeg resultaat op,
+        waarna het register volledig opnieuw wordt ingelezen.
+
+        Returns:
+            dict: De opgeslagen metadata per configuratiebestandsnaam.
+        """
+        try:
+            with open(cls.FILE_SNAPSHOT, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Snapshot van het configuratieregister niet leesbaar: {e}")
+            return {}
+        if snapshot.get("version") != cls.SNAPSHOT_VERSION:
+            return {}
+        return snapshot.get("configs", {})
+
+    def _write_snapshot(self) -> None:
+        """Schrijft de huidige snapshot van het register atomair weg naar FILE_SNAPSHOT."""
+        snapshot = {
+            "version": self.SNAPSHOT_VERSION,
+            "configs": {
+                filename: {
+                    "stat_key": config["stat_key"],
+                    "dir_output": str(config["dir_output"]),
+                    "exists_output": config["exists_output"],
+                    "size_output": config["size_output"],
+                    "version_resume": config["version_resume"],
+                    "stat_output": config["stat_output"],
+                    "created": config["created"].timestamp(),
+                    "modified": config["modified"].timestamp(),
+                }
+                for filename, config in self._configs.items()
+            },
+        }
+        path_tmp = self.FILE_SNAPSHOT.with_name(f"{self.FILE_SNAPSHOT.name}.{os.getpid()}.tmp")
+        try:
+            with open(path_tmp, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, separators=(",", ":"))
+            os.replace(path_tmp, self.FILE_SNAPSHOT)
+        except OSError as e:
+            logger.warning(f"Snapshot van het configuratieregister kon niet worden opgeslagen: {e}")
+
+    @staticmethod
+    def _create_config_entry_from_snapshot(path_config: Path, meta: dict) -> dict:
+        """Maakt een configuratie-informatie dictionary aan uit opgeslagen snapshot-metadata.
+
+        Args:
+            path_config: Het pad naar het configuratiebestand.
+            meta: De opgeslagen metadata van het configuratiebestand.
+
+        Returns:
+            dict: De configuratie-informatie dictionary.
+        """
+        return {
+            "path_config": path_config.name,
+            "dir_output": Path(meta["dir_output"]),
+            "exists_output": meta["exists_output"],
+            "size_output": meta["size_output"],
+            "version_resume": meta["version_resume"],
+            "stat_output": meta["stat_output"],
+            "created": datetime.fromtimestamp(meta["created"]),
+            "modified": datetime.fromtimestamp(meta["modified"]),
+            "stat_key": meta["stat_key"],
+            "runner": GenesisRunner(path_config=path_config),
+        }
+
+    def _revalidate(self, paths_config: list[Path]) -> None:
+        """Leest de opgegeven configuratiebestanden opnieuw in en voegt ze samen in het register.
+
+        Het inlezen gebeurt buiten de lock. Bij het samenvoegen blijven lopende runners behouden
+        en worden items waarvan het bestand niet meer bestaat verwijderd.
+
+        Args:
+            paths_config: De paden van de configuratiebestanden die opnieuw ingelezen moeten worden.
+        """
+        configs_parsed = self._create_config_entries(paths_config)
+        with self._lock_write:
+            configs = {
+                filename: config
+                for filename, config in self._configs.items()
+                if (self.CONFIG_DIR / filename).exists()
+            }
+            for filename, config in configs_parsed.items():
+                if config_current := configs.get(filename):
+                    config = {**config, "runner": config_current["runner"]}
+                configs[filename] = config
+            self._publish(configs=configs)
+            self._write_snapshot()
 
     def refresh(self) -> None:
         """Vernieuwt het configuratieregister met de laatste configuratiebestanden.
 
-        Laadt alle configuratiebestanden opnieuw in en werkt het register bij.
+        Alleen bestanden die nieuw zijn of waarvan het bestand of de outputmap is gewijzigd worden buiten de lock
+        opnieuw ingelezen; verwijderde bestanden verdwijnen uit het register. Lopende runners blijven behouden.
         """
-        with self._lock:
-            self.configs = self.init_configs()
-            logger.info("Config registry refreshed.")
+        configs_current = self._configs
+        paths_stale = [
+            path_config
+            for path_config in self._paths_config()
+            if (config := configs_current.get(path_config.name)) is None
+            or self._is_stale(path_config, config)
+        ]
+        self._revalidate(paths_stale)
+        logger.info("Config registry refreshed.")
+
+    def maintain_output(self, filename: str) -> list[str]:
+        """Onderhoudt de outputversies van een configuratie en werkt de schijfboekhouding bij.
+
+        Ontdubbelt de output als dat is ingeschakeld, past het bewaarbeleid toe en ruimt daarna
+        ongebruikte blobs op. Bedoeld om op de achtergrond te draaien, bijvoorbeeld nadat een run is afgerond.
+
+        Args:
+            filename: De naam van het configuratiebestand waarvan de outputversies worden onderhouden.
+
+        Returns:
+            list[str]: De verwijderde versienamen.
+        """
+        path_config = self.CONFIG_DIR / filename
+        try:
+            genesis_config = GenesisConfig(file_config=path_config, create_version_dir=False)
+            if content_store := genesis_config.content_store:
+                linked, saved = content_store.deduplicate(genesis_config.path_intermediate_root)
+                logger.info(f"Output van {filename} ontdubbeld: {linked} bestanden gekoppeld, {saved} bytes bespaard.")
+            pruned = genesis_config.retention.prune()
+            if content_store and pruned:
+                content_store.collect_garbage()
+        except Exception as e:
+            logger.error(f"Fout bij het opschonen van de output van {filename}: {e}")
+            return []
+        self._revalidate([path_config])
+        return pruned
 
     def delete(self, filename: str) -> None:
         """Verwijdert een configuratiebestand uit het register.
@@ -96,11 +467,14 @@ class ConfigRegistry:
         Args:
             filename: De naam van het configuratiebestand dat verwijderd moet worden.
         """
-        with self._lock:
-            if filename in self.configs:
-                del self.configs[filename]
-                if filename in self.statuses:
-                    del self.statuses[filename]
+        with self._lock_write:
+            if filename in self._configs:
+                configs = dict(self._configs)
+                del configs[filename]
+                statuses = dict(self._statuses)
+                statuses.pop(filename, None)
+                self._publish(configs=configs, statuses=statuses)
+                self._write_snapshot()
                 logger.info(f"Configuratiebestand {filename} verwijderd uit register.")
             else:
                 logger.warning(f"Configuratiebestand {filename} niet gevonden in register.")
@@ -113,8 +487,50 @@ class ConfigRegistry:
         Returns:
             list[dict]: Een lijst met configuratie-informatie dictionaries.
         """
-        with self._lock:
-            return list(self.configs.values())
+        return list(self._configs.values())
+
+    def get_configs_page(
+        self,
+        sort_key: str = "path_config",
+        reverse: bool = False,
+        prefix: str = "",
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> tuple[list[dict], int]:
+        """Geeft een gesorteerde, gefilterde pagina van de configuratie-informatie terug.
+
+        Gebruikt de bijgehouden sorteerindex in plaats van het register per aanvraag te sorteren.
+        Filteren op naamprefix gebeurt met binair zoeken als op naam wordt gesorteerd. Items die
+        tussen het lezen van de index en het register zijn verwijderd worden overgeslagen.
+
+        Args:
+            sort_key: De sorteersleutel, een van SORT_KEYS.
+            reverse: Of er aflopend gesorteerd wordt.
+            prefix: Alleen configuratiebestanden waarvan de naam hiermee begint.
+            offset: Het aantal items dat wordt overgeslagen.
+            limit: Het maximaal aantal items op de pagina, of None voor alle items.
+
+        Returns:
+            tuple[list[dict], int]: De configuratie-informatie dictionaries op de pagina en het totaal aantal gefilterde items.
+
+        Raises:
+            KeyError: Als de sorteersleutel onbekend is.
+        """
+        index = self._sort_indexes[sort_key]
+        configs = self._configs
+        if prefix and sort_key == "path_config":
+            index = index[bisect_left(index, (prefix,)) : bisect_left(index, (prefix + "\U0010ffff",))]
+        elif prefix:
+            index = [item for item in index if item[1].startswith(prefix)]
+        total = len(index)
+        if reverse:
+            end = max(total - offset, 0)
+            start = 0 if limit is None else max(end - limit, 0)
+            items = reversed(index[start:end])
+        else:
+            items = index[offset : None if limit is None else offset + limit]
+        page = [config for _, filename in items if (config := configs.get(filename)) is not None]
+        return page, total
 
     def get_config(self, filename: str) -> dict | None:
         """Geeft de configuratie-informatie terug voor het opgegeven bestand.
@@ -131,11 +547,10 @@ class ConfigRegistry:
         Raises:
             KeyError: Als het configuratiebestand niet gevonden is in het register.
         """
-        with self._lock:
-            config = self.configs.get(filename)
-            if config is None:
-                raise KeyError(f"Configuratiebestand {filename} niet gevonden in register.")
-            return config
+        config = self._configs.get(filename)
+        if config is None:
+            raise KeyError(f"Configuratiebestand {filename} niet gevonden in register.")
+        return config
 
     def get_config_runner(self, filename: str) -> GenesisRunner | None:
         """Geeft de GenesisRunner-instantie terug voor het opgegeven configuratiebestand.
@@ -148,9 +563,8 @@ class ConfigRegistry:
         Returns:
             GenesisRunner | None: De GenesisRunner-instantie of None als het bestand niet gevonden is.
         """
-        with self._lock:
-            config = self.configs.get(filename)
-            return config.get("runner") if config else None
+        config = self._configs.get(filename)
+        return config.get("runner") if config else None
 
     def update_status(self, filename, status) -> None:
         """Werk de status bij van een configuratiebestand in het register.
@@ -161,8 +575,8 @@ class ConfigRegistry:
             filename: De naam van het configuratiebestand waarvan de status wordt bijgewerkt.
             status: De nieuwe statuswaarde voor het configuratiebestand.
         """
-        with self._lock:
-            self.statuses[filename] = status
+        with self._lock_write:
+            self._publish(statuses={**self._statuses, filename: status})
 
     def config_runner_status(self, filename: str) -> str | None:
         """Geeft de status van de GenesisRunner voor het opgegeven configuratiebestand terug.
@@ -175,17 +589,15 @@ class ConfigRegistry:
         Returns:
             str | None: De status van de GenesisRunner, of None als het bestand of de runner niet gevonden is.
         """
-        with self._lock:
-            if config := self.configs.get(filename):
-                runner = config.get("runner")
-                return runner.status() if runner else None
-            return None
+        runner = self.get_config_runner(filename)
+        return runner.status if runner else None
 
     def add(self, file_config: str) -> None:
         """Voegt een nieuw configuratiebestand toe aan het register.
 
         Controleert of het opgegeven bestand bestaat en voegt het toe aan het configuratieregister met bijbehorende metadata.
-        Logt waarschuwingen of fouten als het bestand niet gevonden of niet toegankelijk is.
+        Het bestand wordt buiten de lock ingelezen; alleen het omwisselen van de snapshot gebeurt onder de schrijflock.
+        Staat het bestand al in het register, dan wordt de metadata bijgewerkt en blijft de bestaande runner behouden.
 
         Args:
             file_config: De naam van het toe te voegen configuratiebestand.
@@ -193,20 +605,25 @@ class ConfigRegistry:
         Raises:
             FileNotFoundError: Als het configuratiebestand niet bestaat.
         """
+        path_config = self.CONFIG_DIR / file_config
+        if not path_config.exists():
+            logger.error(f"Configuratiebestand {file_config} bestaat niet.")
+            raise FileNotFoundError(f"Configuratiebestand {file_config} bestaat niet.")
         try:
-            self._create_config_entry(file_config)
+            config = self._create_config_entry(path_config)
         except OSError as e:
             logger.warning(f"Configuratiebestand '{file_config}' niet gevonden of niet toegankelijk tijdens toevoegen: {e}")
+            return
         except Exception as e:
             logger.error(f"Onverwachte fout bij toevoegen van configuratiebestand '{file_config}': {e}")
+            return
 
-        with self._lock:
-            path_config = self.CONFIG_DIR / file_config
-            if not path_config.exists():
-                logger.error(f"Configuratiebestand {file_config} bestaat niet.")
-                raise FileNotFoundError(f"Configuratiebestand {file_config} bestaat niet.")
-            self.configs[path_config.name] = self._create_config_entry(path_config)
-            logger.info(f"Configuratiebestand {file_config} toegevoegd aan register.")
+        with self._lock_write:
+            if config_current := self._configs.get(path_config.name):
+                config = {**config, "runner": config_current["runner"]}
+            self._publish(configs={**self._configs, path_config.name: config})
+            self._write_snapshot()
+        logger.info(f"Configuratiebestand {file_config} toegevoegd aan register.")
 
     def get_status_all(self) -> list[dict]:
         """Geeft de statusinformatie van alle configuratiebestanden in het register terug.
@@ -216,5 +633,4 @@ class ConfigRegistry:
         Returns:
             list[dict]: Een lijst met configuratie-informatie dictionaries.
         """
-        with self._lock:
-            return list(self.configs.values())
+        return list(self._configs.values())
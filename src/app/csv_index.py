@@ -0,0 +1,240 @@
+import csv
+import io
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterator
+
+
+class CsvIndex:
+    """Index van de byte-offsets waarop de records van een CSV-bestand beginnen.
+
+    Het bestand wordt één keer binair doorlopen; een regeleinde binnen een geciteerd veld begint
+    geen nieuw record. Daarna kost het lezen van een willekeurige reeks records één seek en één
+    read van precies die bytes. Gesorteerde volgordes per kolom worden bij de eerste vraag bepaald
+    en in de index bewaard.
+    """
+
+    MAX_SORTS = 4
+
+    def __init__(self, path_file: Path, encoding: str = "utf-8"):
+        """Bouwt de index voor een CSV-bestand.
+
+        Args:
+            path_file (Path): Het pad naar het CSV-bestand.
+            encoding (str): De tekencodering van het bestand.
+        """
+        self.path_file = Path(path_file)
+        self.encoding = encoding
+        stat = os.stat(self.path_file)
+        self.key_stat = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        self.offsets = array("q")  # Begin van elk record, plus het einde van het laatste record
+        self._sorts: OrderedDict[tuple[str, bool], array] = OrderedDict()
+        self._lock = threading.Lock()
+        self._build()
+        self.header = self._read_records(0, 1)[0] if len(self.offsets) > 1 else []
+
+    def _build(self) -> None:
+        """Doorloopt het bestand en legt het begin van elk record vast."""
+        offset = 0
+        in_quotes = False
+        with open(self.path_file, "rb") as f:
+            for line in f:
+                if not in_quotes and line.strip(b"\r\n"):
+                    self.offsets.append(offset)
+                if line.count(b'"') % 2:
+                    in_quotes = not in_quotes
+                offset += len(line)
+        self.offsets.append(offset)
+
+    @property
+    def row_count(self) -> int:
+        """Het aantal datarecords, zonder de kopregel."""
+        return max(len(self.offsets) - 2, 0)
+
+    def _read_records(self, start: int, stop: int) -> list[list[str]]:
+        """Leest de aaneengesloten records start tot stop (exclusief), waarbij record 0 de kopregel is."""
+        stop = min(stop, len(self.offsets) - 1)
+        if start >= stop:
+            return []
+        with open(self.path_file, "rb") as f:
+            f.seek(self.offsets[start])
+            data = f.read(self.offsets[stop] - self.offsets[start])
+        # Lege regels hebben geen offset in de index; csv.reader geeft ze als lege records terug
+        records = [row for row in csv.reader(io.StringIO(data.decode(self.encoding, errors="replace"), newline="")) if row]
+        return records[: stop - start]
+
+    def _read_record(self, f, record: int) -> list[str]:
+        """Leest één record uit een al geopend bestand."""
+        f.seek(self.offsets[record])
+        data = f.read(self.offsets[record + 1] - self.offsets[record])
+        return next(csv.reader(io.StringIO(data.decode(self.encoding, errors="replace"), newline="")), [])
+
+    def _sorted_rows(self, column: str, descending: bool) -> array:
+        """Geeft de rijnummers gesorteerd op een kolom; wordt één keer per kolom en richting bepaald."""
+        key = (column, descending)
+        with self._lock:
+            if key in self._sorts:
+                self._sorts.move_to_end(key)
+                return self._sorts[key]
+        index_column = self.header.index(column)
+        values = []
+        with open(self.path_file, encoding=self.encoding, errors="replace", newline="") as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for row in reader:
+                if row:
+                    values.append(row[index_column] if index_column < len(row) else "")
+        order = array("q", sorted(range(len(values)), key=values.__getitem__, reverse=descending))
+        with self._lock:
+            self._sorts[key] = order
+            while len(self._sorts) > self.MAX_SORTS:
+                self._sorts.popitem(last=False)
+        return order
+
+    def rows(self, start: int, stop: int, sort_column: str | None = None, descending: bool = False) -> list[tuple[int, list[str]]]:
+        """Geeft de datarecords start tot stop (exclusief), optioneel in een gesorteerde volgorde.
+
+        Args:
+            start (int): De positie van het eerste record, vanaf 0.
+            stop (int): De positie na het laatste record.
+            sort_column (str | None): De kolom waarop gesorteerd wordt, of None voor de bestandsvolgorde.
+            descending (bool): Of aflopend gesorteerd wordt.
+
+        Returns:
+            list[tuple[int, list[str]]]: Per record het rijnummer in het bestand en de velden.
+
+        Raises:
+            ValueError: Als de sorteerkolom niet bestaat.
+        """
+        start, stop = max(start, 0), min(stop, self.row_count)
+        if start >= stop:
+            return []
+        if sort_column is None:
+            return list(enumerate(self._read_records(start + 1, stop + 1), start=start))
+        order = self._sorted_rows(sort_column, descending)
+        with open(self.path_file, "rb") as f:
+            return [(row, self._read_record(f, row + 1)) for row in order[start:stop]]
+
+    @property
+    def version(self) -> str:
+        """Het versielabel van het bestand waarop de index gebouwd is; wijzigt bij elke schrijfactie."""
+        mtime_ns, size, ino = self.key_stat
+        return f"{mtime_ns:x}-{size:x}-{ino:x}"
+
+    def write_patched(self, f_out, changes: dict[int, dict[str, str]]) -> None:
+        """Schrijft het bestand met gewijzigde rijen in één sequentiële doorloop naar een ander bestand.
+
+        Ongewijzigde stukken worden als bytes gekopieerd; alleen de gewijzigde records worden opnieuw
+        als CSV geschreven, met hetzelfde regeleinde als het origineel.
+
+        Args:
+            f_out: Het binair geopende doelbestand.
+            changes (dict[int, dict[str, str]]): Per rijnummer (vanaf 0, zonder kopregel) de nieuwe waarden per kolom.
+
+        Raises:
+            ValueError: Als een rijnummer of kolom niet bestaat.
+        """
+        for row, values in changes.items():
+            if not 0 <= row < self.row_count:
+                raise ValueError(f"Rij {row} bestaat niet.")
+            if unknown := set(values) - set(self.header):
+                raise ValueError(f"Onbekende kolom(men): {', '.join(sorted(unknown))}.")
+        with open(self.path_file, "rb") as f_in:
+            position = 0
+            for row in sorted(changes):
+                record = row + 1
+                _copy_bytes(f_in, f_out, self.offsets[record] - position)
+                data = f_in.read(self.offsets[record + 1] - self.offsets[record])
+                position = self.offsets[record + 1]
+                text = data.decode(self.encoding, errors="replace")
+                fields = next(csv.reader(io.StringIO(text, newline="")), [])
+                fields += [""] * (len(self.header) - len(fields))
+                for column, value in changes[row].items():
+                    fields[self.header.index(column)] = value
+                # Het bereik van een record loopt door tot het volgende record, inclusief lege regels;
+                # alleen het record zelf wordt vervangen, het regeleinde en de lege regels blijven staan
+                body = data.rstrip(b"\r\n")
+                buffer = io.StringIO()
+                csv.writer(buffer, lineterminator="").writerow(fields)
+                f_out.write(buffer.getvalue().encode(self.encoding))
+                f_out.write(data[len(body):])
+            _copy_bytes(f_in, f_out, None)
+
+
+def iter_export(
+    index: CsvIndex,
+    columns: list[str] | None = None,
+    filters: dict[str, str] | None = None,
+    sort_column: str | None = None,
+    descending: bool = False,
+    size_chunk: int = 64 * 1024,
+) -> Iterator[bytes]:
+    """Streamt een CSV-bestand in blokken, met optioneel een kolomselectie, rijfilters en sortering.
+
+    Zonder selectie, filters of sortering worden de bytes ongewijzigd van schijf doorgegeven. Anders
+    wordt het bestand rij voor rij gelezen en herschreven; bij sorteren via de gesorteerde volgorde
+    van de index, zodat nooit het hele bestand in het geheugen staat.
+
+    Args:
+        index (CsvIndex): De index van het CSV-bestand.
+        columns (list[str] | None): De kolommen die geëxporteerd worden, of None voor alle kolommen.
+        filters (dict[str, str] | None): Per kolom een tekst die de waarde moet bevatten (hoofdletterongevoelig).
+        sort_column (str | None): De kolom waarop gesorteerd wordt, of None voor de bestandsvolgorde.
+        descending (bool): Of aflopend gesorteerd wordt.
+        size_chunk (int): De grootte van de blokken in bytes.
+
+    Yields:
+        bytes: Opeenvolgende blokken van het exportbestand.
+
+    Raises:
+        ValueError: Als een kolom niet bestaat.
+    """
+    if unknown := (set(columns or []) | set(filters or {}) | ({sort_column} - {None})) - set(index.header):
+        raise ValueError(f"Onbekende kolom(men): {', '.join(sorted(unknown))}.")
+    if not columns and not filters and sort_column is None:
+        with open(index.path_file, "rb") as f:
+            while chunk := f.read(size_chunk):
+                yield chunk
+        return
+
+    positions = [index.header.index(column) for column in columns or index.header]
+    filters = [(index.header.index(column), text.lower()) for column, text in (filters or {}).items()]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow([index.header[position] for position in positions])
+
+    def records() -> Iterator[list[str]]:
+        if sort_column is None:
+            with open(index.path_file, encoding=index.encoding, errors="replace", newline="") as f:
+                reader = csv.reader(f)
+                next(reader, None)
+                yield from (row for row in reader if row)
+        else:
+            with open(index.path_file, "rb") as f:
+                for row in index._sorted_rows(sort_column, descending):
+                    yield index._read_record(f, row + 1)
+
+    for row in records():
+        row += [""] * (len(index.header) - len(row))
+        if all(text in row[position].lower() for position, text in filters):
+            writer.writerow([row[position] for position in positions])
+            if buffer.tell() >= size_chunk:
+                yield buffer.getvalue().encode(index.encoding)
+                buffer.seek(0)
+                buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode(index.encoding)
+
+
+def _copy_bytes(f_in, f_out, length: int | None, size_chunk: int = 1024 * 1024) -> None:
+    """Kopieert length bytes (of alles tot het einde bij None) vanaf de huidige positie in blokken."""
+    while length is None or length > 0:
+        chunk = f_in.read(size_chunk if length is None else min(size_chunk, length))
+        if not chunk:
+            break
+        f_out.write(chunk)
+        if length is not None:
+            length -= len(chunk)
@@ -0,0 +1,177 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+
+SORT_KEYS = ("name", "type", "size", "created", "modified")
+
+
+def scan_directory(path_absolute: Path, path_root: Path) -> list[dict]:
+    """Leest de inhoud van een directory in met één os.scandir-doorloop.
+
+    Het type en de stat van elk item komen uit de DirEntry, die deze bij het scannen al meekrijgt of
+    hooguit één keer opvraagt, zodat er per bestand geen losse Path-objecten en stat-aanroepen nodig zijn.
+
+    Args:
+        path_absolute (Path): Het absolute pad naar de directory.
+        path_root (Path): De root van de bestandsbrowser; paden worden hieraan relatief gemaakt.
+
+    Returns:
+        list[dict]: Per item de naam, extensie, relatieve pad, grootte, tijden en of het een map is.
+    """
+    prefix = Path(path_absolute).relative_to(path_root).as_posix()
+    prefix = "" if prefix == "." else f"{prefix}/"
+    entries = []
+    with os.scandir(path_absolute) as it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir()
+                stat = entry.stat()
+            except OSError:
+                continue  # Verdwenen tijdens het scannen of een kapotte link
+            name = entry.name
+            ext = os.path.splitext(name)[1].lower().replace(".", "") if not is_dir else ""
+            entries.append(
+                {
+                    "name": name,
+                    "ext": ext,
+                    "path": f"{prefix}{name}",
+                    "size": 0 if is_dir else stat.st_size,
+                    "modified": stat.st_mtime,
+                    "created": stat.st_ctime,
+                    "is_dir": is_dir,
+                }
+            )
+    return entries
+
+
+def listing_tag(entries: list[dict]) -> str:
+    """Bepaalt een versielabel voor de inhoud van een directory uit de naam, wijzigingstijd en grootte van de items.
+
+    Het label hangt niet af van de volgorde van scannen of het moment van inlezen, zodat een opnieuw
+    ingelezen, ongewijzigde directory hetzelfde label houdt.
+
+    Args:
+        entries (list[dict]): De items zoals teruggegeven door scan_directory().
+
+    Returns:
+        str: Het versielabel.
+    """
+    digest = hashlib.sha1()
+    for name, modified, size in sorted((entry["name"], entry["modified"], entry["size"]) for entry in entries):
+        digest.update(f"{name}\0{modified!r}\0{size}\n".encode("utf-8", "surrogateescape"))
+    return digest.hexdigest()[:16]
+
+
+def query_listing(
+    entries: list[dict],
+    sort_key: str = "name",
+    reverse: bool = False,
+    name_filter: str = "",
+    offset: int = 0,
+    limit: int | None = None,
+) -> tuple[list[dict], int]:
+    """Filtert, sorteert en pagineert de items van een directory; mappen staan altijd vóór bestanden.
+
+    Args:
+        entries (list[dict]): De items zoals teruggegeven door scan_directory().
+        sort_key (str): De sorteersleutel; een van SORT_KEYS.
+        reverse (bool): Of binnen mappen en bestanden aflopend gesorteerd wordt.
+        name_filter (str): Alleen items waarvan de naam deze tekst bevat (hoofdletterongevoelig).
+        offset (int): Het aantal items dat wordt overgeslagen.
+        limit (int | None): Het maximaal aantal items, of None voor alle items.
+
+    Returns:
+        tuple[list[dict], int]: De items van de pagina en het totaal aantal items na filteren.
+    """
+    if name_filter:
+        name_filter = name_filter.lower()
+        entries = [entry for entry in entries if name_filter in entry["name"].lower()]
+    if sort_key == "type":
+        key = lambda entry: (entry["ext"], entry["name"].lower())
+    elif sort_key in ("size", "created", "modified"):
+        key = lambda entry: (entry[sort_key], entry["name"].lower())
+    else:
+        key = lambda entry: entry["name"].lower()
+    dirs = sorted((entry for entry in entries if entry["is_dir"]), key=key, reverse=reverse)
+    files = sorted((entry for entry in entries if not entry["is_dir"]), key=key, reverse=reverse)
+    ordered = dirs + files
+    end = None if limit is None else offset + limit
+    return ordered[offset:end], len(ordered)
+
+
+def with_datetimes(entries: list[dict]) -> list[dict]:
+    """Zet de tijdstempels van items om naar datetime-objecten voor weergave in een template.
+
+    Args:
+        entries (list[dict]): De items met tijdstempels in seconden.
+
+    Returns:
+        list[dict]: Kopieën van de items met 'created' en 'modified' als datetime.
+    """
+    return [
+        {
+            **entry,
+            "created": datetime.fromtimestamp(entry["created"]),
+            "modified": datetime.fromtimestamp(entry["modified"]),
+        }
+        for entry in entries
+    ]
+
+
+class ListingCache:
+    """LRU-cache van ingelezen directories, gevalideerd met de wijzigingstijd en inode van de directory.
+
+    Een directory krijgt een nieuwe wijzigingstijd als er items bij komen, verdwijnen of hernoemd
+    worden, zodat één stat-aanroep volstaat om een cacheresultaat te controleren. Grootte en tijden
+    van bestanden die ter plekke wijzigen veranderen de directory niet; daarom wordt een resultaat
+    na MAX_AGE seconden hoe dan ook opnieuw ingelezen.
+    """
+
+    MAX_ENTRIES = 128
+    MAX_AGE = 30.0
+
+    def __init__(self, max_entries: int | None = None, max_age: float | None = None):
+        """Initialiseert een lege ListingCache.
+
+        Args:
+            max_entries (int | None): Het maximaal aantal directories in de cache.
+            max_age (float | None): Het maximaal aantal seconden dat een resultaat gebruikt wordt.
+        """
+        self.max_entries = max_entries or self.MAX_ENTRIES
+        self.max_age = max_age if max_age is not None else self.MAX_AGE
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path_absolute: Path, path_root: Path) -> tuple[list[dict], str, float]:
+        """Geeft de items van een directory uit de cache, of leest de directory opnieuw in.
+
+        Args:
+            path_absolute (Path): Het absolute pad naar de directory.
+            path_root (Path): De root van de bestandsbrowser.
+
+        Returns:
+            tuple[list[dict], str, float]: De items (niet wijzigen), een versielabel van de items
+            (zie listing_tag()) en de wijzigingstijd van de directory.
+        """
+        key = str(path_absolute)
+        stat = os.stat(path_absolute)
+        key_stat = (stat.st_mtime_ns, stat.st_ino, stat.st_dev)
+        now = time.time()
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached and cached["key_stat"] == key_stat and now - cached["scanned"] < self.max_age:
+                self._entries.move_to_end(key)
+                return cached["entries"], cached["tag"], stat.st_mtime
+
+        entries = scan_directory(path_absolute, path_root)
+        tag = listing_tag(entries)
+        with self._lock:
+            self._entries[key] = {"key_stat": key_stat, "scanned": now, "entries": entries, "tag": tag}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entries, tag, stat.st_mtime
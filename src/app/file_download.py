@@ -0,0 +1,135 @@
+import mimetypes
+import os
+import unicodedata
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator
+from urllib.parse import quote
+
+from flask import Response, current_app, request
+from werkzeug.datastructures import Headers
+from werkzeug.wsgi import wrap_file
+
+SIZE_CHUNK = 1024 * 1024
+OFFLOAD_MODES = ("x-accel", "x-sendfile")
+
+
+def send_download(path_absolute: Path, path_root: Path, as_attachment: bool = True) -> Response:
+    """Biedt een bestand aan met ondersteuning voor hervatbare downloads en conditionele verzoeken.
+
+    Ondersteunt Range en If-Range (206 Partial Content, of 416 bij een bereik buiten het bestand) en
+    If-None-Match en If-Modified-Since (304 Not Modified). De inhoud gaat via wsgi.file_wrapper, zodat
+    een server als gunicorn het bestand zonder kopie door Python met sendfile verstuurt; alleen een
+    bereik dat vóór het einde van het bestand stopt wordt in blokken gelezen.
+
+    Met DOWNLOAD_OFFLOAD in de app-configuratie ('x-accel' voor nginx of 'x-sendfile' voor Apache en
+    lighttpd) stuurt de app alleen een header en verstuurt de proxy het bestand zelf, inclusief bereiken.
+
+    Args:
+        path_absolute (Path): Het absolute pad naar het bestand.
+        path_root (Path): De root van de bestandsbrowser; het pad voor de proxy is hieraan relatief.
+        as_attachment (bool): Of de browser het bestand moet opslaan in plaats van tonen.
+
+    Returns:
+        Response: De respons met het (deel van het) bestand, een 304 of een 416.
+    """
+    stat = os.stat(path_absolute)
+    etag = f"{stat.st_mtime_ns:x}-{stat.st_size:x}-{stat.st_ino:x}"
+    last_modified = datetime.fromtimestamp(int(stat.st_mtime), tz=timezone.utc)
+    mimetype = mimetypes.guess_type(path_absolute.name)[0] or "application/octet-stream"
+
+    response = Response(mimetype=mimetype)
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    response.headers["Accept-Ranges"] = "bytes"
+    if as_attachment:
+        set_attachment(response.headers, path_absolute.name)
+
+    offload = current_app.config.get("DOWNLOAD_OFFLOAD")
+    if offload in OFFLOAD_MODES:
+        path_relative = Path(path_absolute).relative_to(path_root).as_posix()
+        if offload == "x-accel":
+            prefix = current_app.config.get("DOWNLOAD_ACCEL_PREFIX", "/protected/")
+            response.headers["X-Accel-Redirect"] = f"{prefix.rstrip('/')}/{path_relative}"
+        else:
+            response.headers["X-Sendfile"] = str(path_absolute)
+        return response
+
+    if _not_modified(etag, last_modified):
+        response.status_code = 304
+        return response
+
+    start, stop = 0, stat.st_size
+    if request.range and _if_range_matches(etag, last_modified):
+        if len(request.range.ranges) == 1:  # Meerdere bereiken tegelijk worden genegeerd; dan volgt het hele bestand
+            if (bounds := request.range.range_for_length(stat.st_size)) is None:
+                response.status_code = 416
+                response.headers["Content-Range"] = f"bytes */{stat.st_size}"
+                return response
+            start, stop = bounds
+            response.status_code = 206
+            response.content_range = f"bytes {start}-{stop - 1}/{stat.st_size}"
+
+    f = open(path_absolute, "rb")
+    f.seek(start)
+    if stop == stat.st_size:
+        response.response = wrap_file(request.environ, f, SIZE_CHUNK)
+    else:
+        response.response = _iter_range(f, stop - start)
+    response.direct_passthrough = True
+    response.content_length = stop - start
+    return response
+
+
+def set_attachment(headers: Headers, filename: str) -> None:
+    """Zet de Content-Disposition-header waarmee de browser een bestand onder de opgegeven naam opslaat.
+
+    Een headerwaarde moet latin-1 zijn; net als bij Flask's send_file krijgt een naam met andere tekens
+    daarom een ASCII-variant in 'filename' en de volledige naam volgens RFC 5987 in 'filename*'.
+
+    Args:
+        headers (Headers): De headers van de respons.
+        filename (str): De bestandsnaam voor de download.
+    """
+    try:
+        filename.encode("ascii")
+    except UnicodeEncodeError:
+        simple = unicodedata.normalize("NFKD", filename).encode("ascii", "ignore").decode("ascii")
+        quoted = quote(filename, safe="!#$&+-.^_`|~")  # De attr-char-tekens uit RFC 5987
+        names = {"filename": simple, "filename*": f"UTF-8''{quoted}"}
+    else:
+        names = {"filename": filename}
+    headers.set("Content-Disposition", "attachment", **names)
+
+
+def _not_modified(etag: str, last_modified: datetime) -> bool:
+    """Controleert If-None-Match en, als die ontbreekt, If-Modified-Since."""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def _if_range_matches(etag: str, last_modified: datetime) -> bool:
+    """Controleert If-Range: een bereik geldt alleen als het bestand sindsdien niet gewijzigd is."""
+    if_range = request.if_range
+    if if_range.etag:
+        return if_range.etag == etag
+    if if_range.date:
+        return last_modified <= if_range.date
+    return True
+
+
+def _iter_range(f, length: int) -> Iterator[bytes]:
+    """Leest length bytes vanaf de huidige positie in blokken en sluit daarna het bestand."""
+    try:
+        while length > 0:
+            chunk = f.read(min(SIZE_CHUNK, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        f.close()
@@ -0,0 +1,52 @@
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
+
+
+class FileIndexCache:
+    """LRU-cache van indexen op bestanden, gevalideerd met de wijzigingstijd, grootte en inode van het bestand.
+
+    Een index is een object dat met het pad van het bestand wordt opgebouwd en de stat waarop het
+    gebouwd is bijhoudt in het attribuut key_stat, zoals CsvIndex en JsonIndex.
+    """
+
+    MAX_ENTRIES = 16
+
+    def __init__(self, index_class: Callable, max_entries: int | None = None):
+        """Initialiseert een lege FileIndexCache.
+
+        Args:
+            index_class (Callable): De klasse van de index; wordt aangeroepen met het pad van het bestand.
+            max_entries (int | None): Het maximaal aantal geïndexeerde bestanden.
+        """
+        self.index_class = index_class
+        self.max_entries = max_entries or self.MAX_ENTRIES
+        self._entries: OrderedDict[str, object] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path_file: Path):
+        """Geeft de index van een bestand, en bouwt die opnieuw op als het bestand gewijzigd is.
+
+        Args:
+            path_file (Path): Het pad naar het bestand.
+
+        Returns:
+            De actuele index.
+        """
+        key = str(Path(path_file).resolve())
+        stat = os.stat(key)
+        key_stat = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        with self._lock:
+            index = self._entries.get(key)
+            if index is not None and index.key_stat == key_stat:
+                self._entries.move_to_end(key)
+                return index
+        index = self.index_class(key)
+        with self._lock:
+            self._entries[key] = index
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return index
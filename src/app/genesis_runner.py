@@ -17,17 +17,17 @@ class GenesisRunner:
         self.path_config = path_config
         self._status = "idle"  # 'idle' | 'running' | 'finished' | 'awaiting_input'
 
-    def start(self):
+    def start(self, args: list[str] | None = None):
         """Start een nieuw Genesis-proces met het opgegeven configuratiebestand.
 
         Deze methode initialiseert het proces en start een thread om de uitvoer te verzamelen.
 
         Args:
-            path_config (Path): Het pad naar het configuratiebestand.
+            args (list[str] | None): Extra command line argumenten voor genesis.py, zoals ['--resume', 'v00.01.02'].
         """
         try:
             self._process = subprocess.Popen(
-                [sys.executable, "src/genesis.py", str(self.path_config)],  # str() for safety
+                [sys.executable, "src/genesis.py", str(self.path_config), *(args or [])],  # str() for safety
                 stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
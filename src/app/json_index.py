@@ -0,0 +1,253 @@
+import json
+import mmap
+import os
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+
+# Een volledige string (met escapes) of een structureel teken; alles daartussen wordt overgeslagen
+PATTERN_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{},:]', re.DOTALL)
+WHITESPACE = b" \t\r\n"
+TYPES = {ord("{"): "object", ord("["): "array", ord('"'): "string", ord("t"): "boolean", ord("f"): "boolean", ord("n"): "null"}
+
+
+def parse_pointer(pointer: str) -> list[str]:
+    """Splitst een JSON Pointer (RFC 6901), zoals '/tables/0/name', in de afzonderlijke sleutels.
+
+    Args:
+        pointer (str): De JSON Pointer; een lege string verwijst naar de root.
+
+    Returns:
+        list[str]: De sleutels van root naar het knooppunt.
+
+    Raises:
+        KeyError: Als de pointer niet met '/' begint.
+    """
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise KeyError(pointer)
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+class JsonIndex:
+    """Structurele index van een JSON-bestand op basis van byte-offsets.
+
+    Per container (object of array) wordt bij de eerste vraag alleen het eigen bereik van het bestand
+    gescand om het begin en einde van de directe kinderen vast te leggen, en die van de kinderen één
+    niveau dieper; diepere containers worden daarbij overgeslagen. Een knooppunt uitklappen leest
+    daardoor alleen het bijbehorende stuk van het bestand, en de gescande containers worden in de
+    index bewaard.
+    """
+
+    MAX_NODES = 1024
+    MAX_NESTED = 256
+    PREVIEW_MAX = 256
+
+    def __init__(self, path_file: Path):
+        """Initialiseert de index voor een JSON-bestand en bepaalt het bereik van de root.
+
+        Args:
+            path_file (Path): Het pad naar het JSON-bestand.
+
+        Raises:
+            ValueError: Als het bestand leeg is.
+        """
+        self.path_file = Path(path_file)
+        stat = os.stat(self.path_file)
+        self.key_stat = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        if stat.st_size == 0:
+            raise ValueError(f"'{self.path_file.name}' is leeg.")
+        self._nodes: OrderedDict[tuple, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        with self._mapped() as mm:
+            self.root = self._strip(mm, 0, len(mm))
+
+    def _mapped(self) -> mmap.mmap:
+        """Geeft een alleen-lezen memory map van het bestand."""
+        with open(self.path_file, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @staticmethod
+    def _strip(mm, start: int, end: int) -> tuple[int, int]:
+        """Verkleint een bereik tot de eerste en laatste byte die geen witruimte is."""
+        while start < end and mm[start] in WHITESPACE:
+            start += 1
+        while end > start and mm[end - 1] in WHITESPACE:
+            end -= 1
+        return start, end
+
+    def _scan(self, mm, start: int, end: int) -> tuple[dict, dict[str, dict]]:
+        """Bepaalt de directe kinderen van de container in het bereik start tot end.
+
+        In dezelfde doorloop worden ook de kinderen van de eerste MAX_NESTED geneste containers
+        vastgelegd, zodat het uitklappen daarvan geen nieuwe scan van hetzelfde bereik kost.
+
+        Returns:
+            tuple[dict, dict[str, dict]]: De container en per sleutel (of index) de geneste containers.
+        """
+        root = self._frame(mm, start)
+        stack, nested = [root], {}
+        depth = 0
+        for match in PATTERN_TOKEN.finditer(mm, start + 1, end - 1):
+            position = match.start()
+            char = mm[position]
+            if char == ord('"'):
+                if depth < len(stack) and stack[depth]["keys"] is not None and stack[depth]["key"] is None:
+                    stack[depth]["key"] = json.loads(match.group())
+            elif char in b"[{":
+                depth += 1
+                if depth == 1 and len(nested) < self.MAX_NESTED:
+                    stack.append(self._frame(mm, position))
+            elif char in b"]}":
+                depth -= 1
+                if depth == 0 and len(stack) > 1:
+                    frame = stack.pop()
+                    self._add_child(mm, frame, position)
+                    key = root["key"] if root["keys"] is not None else len(root["starts"])
+                    nested[str(key)] = self._node_from(frame, position + 1)
+            elif depth < len(stack):
+                frame = stack[depth]
+                if char == ord(":"):
+                    frame["begin"] = match.end()
+                else:
+                    self._add_child(mm, frame, position)
+                    frame["begin"], frame["key"] = match.end(), None
+        self._add_child(mm, root, end - 1)
+        return self._node_from(root, end), nested
+
+    @staticmethod
+    def _frame(mm, start: int) -> dict:
+        """Begint de administratie van een container die op positie start opent."""
+        is_object = mm[start] == ord("{")
+        return {"start": start, "keys": [] if is_object else None, "starts": array("q"), "ends": array("q"), "begin": start + 1, "key": None}
+
+    def _add_child(self, mm, frame: dict, position_end: int) -> None:
+        """Legt het kind vast dat loopt van het begin van het huidige element tot position_end."""
+        child_start, child_end = self._strip(mm, frame["begin"], position_end)
+        if child_start < child_end:
+            frame["starts"].append(child_start)
+            frame["ends"].append(child_end)
+            if frame["keys"] is not None:
+                frame["keys"].append(frame["key"])
+
+    @staticmethod
+    def _node_from(frame: dict, end: int) -> dict:
+        """Zet de administratie van een gescande container om naar een knooppunt van de index."""
+        node = {
+            "type": "object" if frame["keys"] is not None else "array",
+            "keys": frame["keys"],
+            "starts": frame["starts"],
+            "ends": frame["ends"],
+            "span": (frame["start"], end),
+        }
+        if node["keys"] is not None:
+            node["positions"] = {key: position for position, key in enumerate(node["keys"])}
+        return node
+
+    def _node(self, mm, path: tuple) -> dict:
+        """Geeft de gescande container op een pad, uit de index of door het bereik te scannen."""
+        with self._lock:
+            if path in self._nodes:
+                self._nodes.move_to_end(path)
+                return self._nodes[path]
+        start, end = self._locate(mm, path)
+        if mm[start] not in b"[{":
+            raise KeyError("/".join(path))
+        node, nested = self._scan(mm, start, end)
+        with self._lock:
+            for key, node_nested in nested.items():
+                self._nodes[(*path, key)] = node_nested
+            self._nodes[path] = node
+            while len(self._nodes) > self.MAX_NODES:
+                self._nodes.popitem(last=False)
+        return node
+
+    def _locate(self, mm, path: tuple) -> tuple[int, int]:
+        """Bepaalt het bereik van het knooppunt op een pad door de containers erboven te scannen."""
+        if not path:
+            return self.root
+        parent = self._node(mm, path[:-1])
+        key = path[-1]
+        if parent["type"] == "object":
+            position = parent["positions"].get(key)
+        else:
+            position = int(key) if key.isdigit() else None
+        if position is None or position >= len(parent["starts"]):
+            raise KeyError("/".join(path))
+        return parent["starts"][position], parent["ends"][position]
+
+    def _describe(self, mm, path: tuple, key, start: int, end: int) -> dict:
+        """Beschrijft één kind: het type, de grootte in bytes en voor kleine waarden de waarde zelf.
+
+        Het aantal kinderen van een geneste container is alleen bekend als die al eerder gescand is;
+        anders is het None en wordt de container pas bij het uitklappen gelezen.
+        """
+        child = {"key": key, "type": TYPES.get(mm[start], "number"), "bytes": end - start}
+        if child["type"] in ("object", "array"):
+            with self._lock:
+                node = self._nodes.get((*path, str(key)))
+            child["count"] = len(node["starts"]) if node else None
+        elif end - start <= self.PREVIEW_MAX:
+            child["value"] = json.loads(mm[start:end])
+        else:
+            child["preview"] = mm[start:start + self.PREVIEW_MAX].decode("utf-8", errors="replace")
+        return child
+
+    def children(self, pointer: str, offset: int = 0, limit: int = 1000) -> dict:
+        """Geeft een knooppunt met (een pagina van) de directe kinderen, zonder dieper te lezen.
+
+        Args:
+            pointer (str): De JSON Pointer van het knooppunt; een lege string voor de root.
+            offset (int): Het aantal kinderen dat wordt overgeslagen.
+            limit (int): Het maximaal aantal kinderen.
+
+        Returns:
+            dict: Het pad, type, aantal kinderen, de grootte in bytes en per kind de sleutel (of
+            index), het type, de grootte en bij kleine waarden de waarde.
+
+        Raises:
+            KeyError: Als het pad niet bestaat.
+        """
+        path = tuple(parse_pointer(pointer))
+        with self._mapped() as mm:
+            start, end = self._locate(mm, path)
+            if mm[start] not in b"[{":
+                return {"path": pointer, **self._describe_scalar(mm, start, end)}
+            node = self._node(mm, path)
+            stop = min(offset + limit, len(node["starts"]))
+            keys = node["keys"] if node["keys"] is not None else range(len(node["starts"]))
+            children = [
+                self._describe(mm, path, keys[position], node["starts"][position], node["ends"][position])
+                for position in range(offset, stop)
+            ]
+        return {
+            "path": pointer,
+            "type": node["type"],
+            "count": len(node["starts"]),
+            "bytes": end - start,
+            "offset": offset,
+            "children": children,
+        }
+
+    def _describe_scalar(self, mm, start: int, end: int) -> dict:
+        """Beschrijft een enkelvoudige waarde op een pad."""
+        return {"type": TYPES.get(mm[start], "number"), "bytes": end - start, "value": json.loads(mm[start:end])}
+
+    def read(self, pointer: str) -> bytes:
+        """Leest de ruwe JSON van een knooppunt, zonder de rest van het bestand te lezen.
+
+        Args:
+            pointer (str): De JSON Pointer van het knooppunt.
+
+        Returns:
+            bytes: De JSON-tekst van het knooppunt.
+
+        Raises:
+            KeyError: Als het pad niet bestaat.
+        """
+        with self._mapped() as mm:
+            start, end = self._locate(mm, tuple(parse_pointer(pointer)))
+            return mm[start:end]
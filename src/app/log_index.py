@@ -0,0 +1,230 @@
+import json
+import os
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Callable, Iterator
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+PATTERN_ANSI = re.compile(r"\x1b\[[0-9;]*m")
+PATTERN_ASCTIME = re.compile(rb'"asctime":\s*"([^"]*)"')
+PATTERN_ROTATED = re.compile(r"^(?P<base>.+)\.(?P<number>\d+)$")
+SUFFIXES_JSON_LINES = (".jsonl", ".ndjson")
+
+
+class LogIndex:
+    """Index van een JSON-lines logbestand, zoals geschreven door de logtools JSON-formatter.
+
+    Het bestand wordt één keer doorlopen om het begin van elke regel vast te leggen. Van elke
+    SPARSE_EVERY-ste regel wordt daarnaast het tijdstip (asctime) bewaard; omdat een logbestand in
+    tijdsvolgorde wordt aangevuld, geeft een binaire zoekactie daarin het bereik van regels dat in
+    een tijdvak kan vallen, zonder de regels daarbuiten te lezen.
+    """
+
+    SPARSE_EVERY = 64
+    SIZE_BLOCK = 256
+
+    def __init__(self, path_file: Path):
+        """Bouwt de index voor een logbestand.
+
+        Args:
+            path_file (Path): Het pad naar het logbestand.
+        """
+        self.path_file = Path(path_file)
+        stat = os.stat(self.path_file)
+        self.key_stat = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        self.offsets = array("q")  # Begin van elke regel, plus het einde van de laatste regel
+        self.sparse_times: list[str] = []
+        self.sparse_lines: list[int] = []
+        self._build()
+
+    def _build(self) -> None:
+        """Doorloopt het bestand en legt de regelbegins en de tijdstippen van de steekproef vast."""
+        offset = 0
+        with open(self.path_file, "rb") as f:
+            for number, line in enumerate(f):
+                self.offsets.append(offset)
+                offset += len(line)
+                if number % self.SPARSE_EVERY == 0 and (match := PATTERN_ASCTIME.search(line)):
+                    time = match.group(1).decode("utf-8", errors="replace")
+                    # Alleen oplopende tijdstippen, zodat de steekproef doorzoekbaar blijft
+                    if not self.sparse_times or time >= self.sparse_times[-1]:
+                        self.sparse_times.append(time)
+                        self.sparse_lines.append(number)
+        self.offsets.append(offset)
+
+    @property
+    def line_count(self) -> int:
+        """Het aantal regels in het bestand."""
+        return len(self.offsets) - 1
+
+    def line_range(self, since: str | None = None, until: str | None = None) -> tuple[int, int]:
+        """Bepaalt via de steekproef welke regels binnen een tijdvak kunnen vallen.
+
+        Args:
+            since (str | None): Het vroegste tijdstip in het formaat van asctime, of None.
+            until (str | None): Het laatste tijdstip (een prefix volstaat, zoals '2025-01-31 12:00'), of None.
+
+        Returns:
+            tuple[int, int]: De eerste regel en de regel na de laatste die binnen het tijdvak kan vallen.
+        """
+        start, stop = 0, self.line_count
+        if since and self.sparse_times:
+            position = bisect_left(self.sparse_times, since)
+            start = self.sparse_lines[position - 1] if position else 0
+        if until and self.sparse_times:
+            position = bisect_right(self.sparse_times, f"{until}\x7f")
+            stop = self.sparse_lines[position] if position < len(self.sparse_lines) else self.line_count
+        return start, stop
+
+    def iter_reverse(self, start: int, stop: int) -> Iterator[tuple[int, bytes]]:
+        """Geeft de regels start tot stop (exclusief) van achter naar voren, in blokken van SIZE_BLOCK regels.
+
+        Args:
+            start (int): De eerste regel.
+            stop (int): De regel na de laatste.
+
+        Yields:
+            tuple[int, bytes]: Het regelnummer en de inhoud van de regel.
+        """
+        start, stop = max(start, 0), min(stop, self.line_count)
+        with open(self.path_file, "rb") as f:
+            while stop > start:
+                block_start = max(start, stop - self.SIZE_BLOCK)
+                f.seek(self.offsets[block_start])
+                data = f.read(self.offsets[stop] - self.offsets[block_start])
+                lines = data.split(b"\n")
+                if lines and lines[-1] == b"":
+                    lines.pop()
+                for number in range(stop - 1, block_start - 1, -1):
+                    yield number, lines[number - block_start]
+                stop = block_start
+
+
+def rotated_files(path_file: Path) -> list[Path]:
+    """Geeft een logbestand met de geroteerde voorgangers ('.1' tot en met '.10'), van nieuw naar oud.
+
+    Args:
+        path_file (Path): Het pad naar het logbestand of naar een van de geroteerde bestanden.
+
+    Returns:
+        list[Path]: Het actuele bestand gevolgd door de bestaande geroteerde bestanden, oplopend genummerd.
+    """
+    path_file = Path(path_file)
+    if (match := PATTERN_ROTATED.match(path_file.name)) and Path(path_file.parent, match["base"]).exists():
+        path_file = path_file.parent / match["base"]
+    numbered = []
+    for path in path_file.parent.glob(f"{path_file.name}.*"):
+        suffix = path.name[len(path_file.name) + 1:]
+        if suffix.isdigit():
+            numbered.append((int(suffix), path))
+    return [path_file, *(path for _, path in sorted(numbered))]
+
+
+def is_json_lines(path_file: Path) -> bool:
+    """Controleert of een bestand JSON lines bevat: meerdere regels met elk een volledig JSON-object.
+
+    Args:
+        path_file (Path): Het pad naar het bestand.
+
+    Returns:
+        bool: True als het bestand als logbestand getoond moet worden.
+    """
+    path_file = Path(path_file)
+    if path_file.suffix.lower() in SUFFIXES_JSON_LINES:
+        return True
+    if (match := PATTERN_ROTATED.match(path_file.name)) and match["base"].lower().endswith(".json"):
+        return True
+    with open(path_file, "rb") as f:
+        first = f.readline(64 * 1024)
+        rest = f.read(64 * 1024).strip()
+    try:
+        return isinstance(json.loads(first), dict) and bool(rest)
+    except ValueError:
+        return False
+
+
+def query_logs(
+    get_index: Callable[[Path], LogIndex],
+    path_file: Path,
+    level: str | None = None,
+    module: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    text: str | None = None,
+    cursor: str | None = None,
+    limit: int = 100,
+) -> tuple[list[dict], str | None]:
+    """Zoekt logregels van nieuw naar oud in een logbestand en de geroteerde voorgangers.
+
+    De bestanden worden regel voor regel van achter naar voren doorlopen en alleen regels die aan
+    alle filters voldoen worden ingelezen. Met een tijdvak wordt per bestand alleen het bereik
+    gelezen dat de steekproef van de index aanwijst.
+
+    Het zoeken op tekst gebeurt in de gedecodeerde waarden van een regel, omdat JSON tekens buiten
+    ASCII als '\\uXXXX' opslaat. Een ASCII-zoektekst wordt eerst in de ruwe bytes gezocht, zodat
+    regels zonder die tekst niet geparsed hoeven te worden.
+
+    Args:
+        get_index (Callable[[Path], LogIndex]): Geeft de (gecachete) index van een bestand.
+        path_file (Path): Het pad naar het logbestand.
+        level (str | None): Het minimale niveau, zoals 'WARNING'.
+        module (str | None): Alleen regels van deze module.
+        since (str | None): Het vroegste tijdstip in het formaat van asctime.
+        until (str | None): Het laatste tijdstip; een prefix zoals '2025-01-31 12:00' volstaat.
+        text (str | None): Alleen regels die deze tekst bevatten (hoofdletterongevoelig).
+        cursor (str | None): De cursor van de vorige pagina, of None om bij de nieuwste regel te beginnen.
+        limit (int): Het maximaal aantal regels.
+
+    Returns:
+        tuple[list[dict], str | None]: De regels (met bestand en regelnummer in '_file' en '_line') en
+        de cursor voor de volgende, oudere pagina, of None als er geen oudere regels zijn.
+
+    Raises:
+        ValueError: Als de cursor of het niveau ongeldig is.
+    """
+    files = rotated_files(path_file)
+    position_file, line_cursor = 0, None
+    if cursor:
+        position_file, line_cursor = (int(part) for part in cursor.split(":", 1))
+    if level and level.upper() not in LEVELS:
+        raise ValueError(f"Onbekend niveau '{level}'.")
+    level_min = LEVELS[level.upper()] if level else None
+    text = text.lower() if text else None
+    # Alleen ASCII zonder tekens die JSON escapet staat letterlijk in de ruwe regel
+    text_raw = None
+    if text and text.isascii() and text.isprintable() and not set(text) & set('"\\'):
+        text_raw = text.encode("ascii")
+    until_key = f"{until}\x7f" if until else None
+
+    entries = []
+    for position in range(position_file, len(files)):
+        index = get_index(files[position])
+        start, stop = index.line_range(since, until)
+        if position == position_file and line_cursor is not None:
+            stop = min(stop, line_cursor)
+        for number, line in index.iter_reverse(start, stop):
+            if len(entries) == limit:
+                return entries, f"{position}:{number + 1}"
+            if text_raw and text_raw not in line.lower():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Een regel die nog geschreven wordt, of geen JSON
+            if not isinstance(record, dict):
+                continue
+            # De kleurenformatter van de console kleurt het niveau ook in het JSON-log
+            record = {key: PATTERN_ANSI.sub("", value) if isinstance(value, str) else value for key, value in record.items()}
+            time = record.get("asctime", "")
+            if (since and time < since) or (until_key and time > until_key):
+                continue
+            if level_min and LEVELS.get(record.get("levelname"), 0) < level_min:
+                continue
+            if module and record.get("module") != module:
+                continue
+            if text and not any(text in str(value).lower() for value in record.values()):
+                continue
+            entries.append({**record, "_file": files[position].name, "_line": number})
+    return entries, None
@@ -1,8 +1,11 @@
 import csv
+import hashlib
 import io
-import json
 import os
-from datetime import datetime
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from pathlib import Path
 
 from flask import (
@@ -13,13 +16,39 @@ from flask import (
     redirect,
     render_template,
     request,
-    send_file,
-    send_from_directory,
+    stream_with_context,
     url_for,
 )
 
+from ..csv_index import CsvIndex, iter_export
+from ..directory_listing import SORT_KEYS, ListingCache, query_listing, with_datetimes
+from ..file_download import send_download, set_attachment
+from ..file_index_cache import FileIndexCache
+from ..json_index import JsonIndex
+from ..log_index import LEVELS, SUFFIXES_JSON_LINES, LogIndex, is_json_lines, query_logs, rotated_files
+from ..text_index import TextIndex
+from ..zip_stream import iter_zip
+
 browser = Blueprint("browser", __name__)
 
+PER_PAGE_DEFAULT = 200
+PER_PAGE_MAX = 2000
+listing_cache = ListingCache()
+CSV_PAGE_SIZE = 100
+CSV_PAGE_SIZE_MAX = 1000
+csv_indexes = FileIndexCache(CsvIndex)
+JSON_CHILDREN_LIMIT = 500
+JSON_CHILDREN_LIMIT_MAX = 5000
+json_indexes = FileIndexCache(JsonIndex)
+LOG_PAGE_SIZE = 200
+LOG_PAGE_SIZE_MAX = 2000
+log_indexes = FileIndexCache(LogIndex, max_entries=64)
+TEXT_INLINE_MAX = 1024 * 1024
+TEXT_WINDOW = 500
+TEXT_WINDOW_MAX = 5000
+text_indexes = FileIndexCache(TextIndex)
+_lock_csv_patch = threading.Lock()
+
 
 def secure_path(path):
     root = Path(".").resolve()
@@ -31,6 +60,31 @@ def secure_path(path):
     return full_path
 
 
+@contextmanager
+def open_replacing(path_file, mode="w", **kwargs):
+    """Opent een tijdelijk bestand dat bij succes het opgegeven bestand atomair vervangt.
+
+    Het origineel wordt nooit ter plekke overschreven: een crash halverwege laat het intact, en
+    hardlinks naar gedeelde blobs in de content-addressed opslag blijven ongewijzigd.
+
+    Args:
+        path_file: Het pad naar het bestand dat vervangen wordt.
+        mode: De modus voor open(), 'w' of 'wb'.
+        **kwargs: Extra argumenten voor open(), zoals encoding en newline.
+
+    Yields:
+        Het geopende tijdelijke bestand.
+    """
+    path_tmp = f"{path_file}.{os.getpid()}.tmp"
+    try:
+        with open(path_tmp, mode, **kwargs) as f:
+            yield f
+        os.replace(path_tmp, path_file)
+    finally:
+        if os.path.exists(path_tmp):
+            os.unlink(path_tmp)
+
+
 @browser.route("/browse/", defaults={"req_path": ""})
 @browser.route("/browse/<path:req_path>")
 def browse(req_path):
@@ -68,56 +122,104 @@ def handle_file_request(path_absolute, req_path):
         Response: Een response die het bestand toont in de juiste viewer of als download aanbiedt.
     """
     ext = path_absolute.suffix.lower()
+    if (ext in (".json", *SUFFIXES_JSON_LINES) or ext[1:].isdigit()) and is_json_lines(path_absolute):
+        return redirect(url_for("browser.open_log", path_file=req_path))
     if ext == ".html":
         return open_html(req_path)
     elif ext == ".json":
         return open_json(req_path)
     elif ext == ".sql":
         return redirect(url_for("browser.open_sql", path_file=req_path))
+    elif ext in (".log", ".txt"):
+        return redirect(url_for("browser.open_text", path_file=req_path))
     elif ext == ".csv":
         return redirect(url_for("browser.edit_csv", path_file=req_path))
     else:
-        return send_from_directory(
-            str(path_absolute.parent),
-            path_absolute.name,
-            as_attachment=True,
-        )
+        return send_download(path_absolute, Path(".").resolve())
 
 
 def render_directory_listing(path_absolute, req_path):
-    """Genereert een HTML-pagina met de inhoud van een directory.
+    """Genereert een HTML-pagina of JSON-respons met één pagina van de inhoud van een directory.
+
+    De directory wordt met os.scandir ingelezen; sorteren, filteren op naam en pagineren gebeuren aan
+    de serverkant via de queryparameters sort, order, q, page en per_page. Met format=json wordt de
+    pagina als JSON teruggegeven, zodat de template volgende pagina's incrementeel kan laden.
 
-    Deze functie verzamelt informatie over alle bestanden en mappen in de opgegeven directory en rendert deze in een browser-template.
+    Ingelezen directories komen uit een LRU-cache. De respons krijgt een ETag en Last-Modified, zodat
+    de browser kan hervalideren; bij een ongewijzigde directory volgt een 304 zonder te renderen.
 
     Args:
         path_absolute (Path): Het absolute pad naar de directory.
         req_path (str): Het relatieve pad dat door de gebruiker is aangevraagd.
 
     Returns:
-        Response: Een HTML-pagina met een lijst van bestanden en mappen in de directory.
+        Response: Een HTML-pagina of JSON-respons met een lijst van bestanden en mappen in de directory.
     """
-    path_root = Path(".").resolve()
-    path_files = sorted(path_absolute.iterdir(), key=lambda p: (not p.is_dir(), p.name))
-    files_data = [
-        {"path": path_file, "stat": path_file.stat()} for path_file in path_files
-    ]
-    file_list = [
-        {
-            "name": file_data["path"].name,
-            "ext": file_data["path"].suffix.lower().replace(".", ""),
-            "path": str(file_data["path"].relative_to(path_root)).replace("\\", "/"),
-            "modified": datetime.fromtimestamp(file_data["stat"].st_mtime),
-            "created": datetime.fromtimestamp(file_data["stat"].st_ctime),
-            "is_dir": file_data["path"].is_dir(),
-        }
-        for file_data in files_data
-    ]
+    sort_by = request.args.get("sort", "name")
+    sort_by = sort_by if sort_by in SORT_KEYS else "name"
+    order = request.args.get("order", "asc")
+    name_filter = request.args.get("q", "").strip()
+    page = max(request.args.get("page", 1, type=int), 1)
+    per_page = min(max(request.args.get("per_page", PER_PAGE_DEFAULT, type=int), 1), PER_PAGE_MAX)
+
+    entries, tag, mtime = listing_cache.get(path_absolute, Path(".").resolve())
+    etag = f"{tag}-{hashlib.sha1(request.query_string).hexdigest()[:12]}"
+    if request.if_none_match.contains_weak(etag):
+        return conditional_response(Response(status=304), etag, mtime)
+
+    files, total = query_listing(
+        entries,
+        sort_key=sort_by,
+        reverse=order == "desc",
+        name_filter=name_filter,
+        offset=(page - 1) * per_page,
+        limit=per_page,
+    )
+    pages = max((total + per_page - 1) // per_page, 1)
+
+    if request.args.get("format") == "json":
+        files = [
+            {
+                **file,
+                "created": datetime.fromtimestamp(file["created"]).isoformat(timespec="minutes"),
+                "modified": datetime.fromtimestamp(file["modified"]).isoformat(timespec="minutes"),
+            }
+            for file in files
+        ]
+        response = jsonify(files=files, total=total, page=page, pages=pages, per_page=per_page)
+        return conditional_response(response, etag, mtime)
 
     req_path_formatted = str(req_path).replace("\\", "/")
-    return render_template(
-        "browser/browser.html", files=file_list, current_path=req_path_formatted
+    html = render_template(
+        "browser/browser.html",
+        files=with_datetimes(files),
+        current_path=req_path_formatted,
+        sort_by=sort_by,
+        order=order,
+        q=name_filter,
+        page=page,
+        pages=pages,
+        per_page=per_page,
+        total=total,
     )
+    return conditional_response(Response(html, mimetype="text/html"), etag, mtime)
+
 
+def conditional_response(response: Response, etag: str, mtime: float) -> Response:
+    """Voorziet een respons van validatieheaders, zodat de browser met If-None-Match kan hervalideren.
+
+    Args:
+        response (Response): De respons.
+        etag (str): De (zwakke) ETag van de inhoud.
+        mtime (float): De wijzigingstijd van de bron als Last-Modified.
+
+    Returns:
+        Response: De respons met ETag, Last-Modified en Cache-Control: no-cache.
+    """
+    response.set_etag(etag, weak=True)
+    response.last_modified = datetime.fromtimestamp(mtime, tz=timezone.utc)
+    response.cache_control.no_cache = True
+    return response
 
 
 @browser.route("/download-file/<path:path_file>")
@@ -125,6 +227,7 @@ def download_file(path_file: str) -> Response:
     """Biedt een bestand aan voor download aan de gebruiker.
 
     Deze functie controleert of het opgegeven bestand bestaat en stuurt het als download naar de client. Als het bestand niet gevonden wordt, retourneert de functie een foutmelding.
+    Downloads zijn hervatbaar (Range) en worden niet opnieuw verstuurd als de client ze al heeft; zie send_download().
 
     Args:
         path_file (str): Het pad naar het bestand dat gedownload moet worden.
@@ -132,12 +235,36 @@ def download_file(path_file: str) -> Response:
     Returns:
         Response: Het bestand als download of een foutmelding als het niet gevonden is.
     """
-    path_file = Path(path_file).resolve()
-    if path_file.exists():
-        return send_file(path_file, as_attachment=True)
+    path_absolute = secure_path(path_file)
+    if path_absolute.is_file():
+        return send_download(path_absolute, Path(".").resolve())
     return "Geen log gevonden", 404
 
 
+@browser.route("/download-folder/", defaults={"req_path": ""})
+@browser.route("/download-folder/<path:req_path>")
+def download_folder(req_path: str) -> Response:
+    """Biedt een directory, zoals een versiemap van de output, aan als zip-archief.
+
+    Het archief wordt tijdens het versturen opgebouwd (zie iter_zip()); er wordt geen tijdelijk
+    bestand geschreven en het geheugengebruik hangt niet af van de grootte van de directory.
+
+    Args:
+        req_path (str): Het relatieve pad naar de directory.
+
+    Returns:
+        Response: Het zip-archief als download.
+    """
+    path_absolute = secure_path(req_path)
+    if not path_absolute.is_dir():
+        abort(404)
+    name = path_absolute.resolve().name or "output"
+    response = Response(stream_with_context(iter_zip(path_absolute.resolve())), mimetype="application/zip")
+    set_attachment(response.headers, f"{name}.zip")
+    response.headers["X-Accel-Buffering"] = "no"  # Laat nginx het archief direct doorsturen
+    return response
+
+
 @browser.route("/open/html/<path:path_file>")
 def open_html(path_file: str):
     """Opent een HTML-bestand en retourneert de inhoud als HTML-respons.
@@ -159,24 +286,82 @@ def open_html(path_file: str):
 
 @browser.route("/open/json/<path:path_file>")
 def open_json(path_file: str):
-    """Opent een JSON-bestand en toont de inhoud in een HTML-template.
+    """Toont een JSON-bestand als boom die per knooppunt wordt uitgeklapt.
 
-    Deze functie leest het opgegeven JSON-bestand, formatteert de inhoud en rendert deze in een HTML-pagina.
+    Zonder queryparameter path wordt de boompagina gerenderd. Met path (een JSON Pointer zoals
+    '/tables/0'; leeg voor de root) wordt alleen dat knooppunt als JSON teruggegeven: het type,
+    het aantal kinderen en per kind de sleutel, het type en de grootte in bytes, gepagineerd met
+    offset en limit. Met format=raw komt de ruwe JSON van het knooppunt terug. Via de structurele
+    index van het bestand wordt daarbij alleen het stuk van het bestand gelezen dat bij het knooppunt hoort.
 
     Args:
         path_file (str): Het pad naar het JSON-bestand dat geopend moet worden.
 
     Returns:
-        Response: Een HTML-pagina met de geformatteerde JSON-inhoud.
+        Response: De boompagina, de beschrijving van een knooppunt of de ruwe JSON van een knooppunt.
     """
-    # Beveilig het pad naar het JSON-bestand
     abs_path = secure_path(path_file)
+    if not abs_path.is_file():
+        abort(404)
+    if "path" not in request.args:
+        return render_template("browser/json_tree.html", path_file=path_file, limit=JSON_CHILDREN_LIMIT)
 
-    # Lees de JSON-data
-    with open(abs_path, encoding="utf-8") as f:
-        content = json.load(f)
+    pointer = request.args.get("path", "")
+    try:
+        index = json_indexes.get(abs_path)
+        if request.args.get("format") == "raw":
+            return Response(index.read(pointer), mimetype="application/json")
+        offset = max(request.args.get("offset", 0, type=int), 0)
+        limit = min(max(request.args.get("limit", JSON_CHILDREN_LIMIT, type=int), 1), JSON_CHILDREN_LIMIT_MAX)
+        return jsonify(index.children(pointer, offset=offset, limit=limit))
+    except KeyError:
+        return jsonify({"status": "error", "message": f"Pad '{pointer}' bestaat niet"}), 404
+    except ValueError as e:
+        return jsonify({"status": "error", "message": f"Ongeldige JSON: {e}"}), 400
+
+
+@browser.route("/open/log/<path:path_file>")
+def open_log(path_file: str):
+    """Toont een JSON-lines logbestand, inclusief de geroteerde voorgangers, van nieuw naar oud.
+
+    Zonder format=json wordt de viewer gerenderd. Met format=json komt één pagina logregels terug,
+    gefilterd op de queryparameters level (minimaal niveau), module, since en until (tijdvak) en q
+    (tekst). De parameter cursor uit het vorige antwoord geeft de volgende, oudere pagina.
 
-    return jsonify(data=content)
+    Args:
+        path_file (str): Het pad naar het logbestand.
+
+    Returns:
+        Response: De viewer, of een JSON-object met de regels en de cursor voor de volgende pagina.
+    """
+    abs_path = secure_path(path_file)
+    if not abs_path.is_file():
+        abort(404)
+    if request.args.get("format") != "json":
+        return render_template(
+            "browser/log_view.html",
+            path_file=path_file,
+            files=[path.name for path in rotated_files(abs_path)],
+            levels=list(LEVELS),
+        )
+
+    limit = min(max(request.args.get("limit", LOG_PAGE_SIZE, type=int), 1), LOG_PAGE_SIZE_MAX)
+    try:
+        entries, cursor = query_logs(
+            log_indexes.get,
+            abs_path,
+            level=request.args.get("level") or None,
+            module=request.args.get("module") or None,
+            # Een datetime-local veld gebruikt een 'T' waar asctime een spatie heeft
+            since=request.args.get("since", "").replace("T", " ") or None,
+            until=request.args.get("until", "").replace("T", " ") or None,
+            text=request.args.get("q") or None,
+            cursor=request.args.get("cursor") or None,
+            limit=limit,
+        )
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    return jsonify(entries=entries, cursor=cursor)
 
 
 @browser.route("/open/sql/<path:path_file>", methods=["GET", "POST"])
@@ -185,7 +370,8 @@ def open_sql(path_file: str):
 
     Deze functie verwerkt GET- en POST-verzoeken voor het bewerken en opslaan van een SQL-bestand.
     Bij een POST-verzoek wordt het bestand opgeslagen en wordt de gebruiker teruggeleid naar de bestandsbrowser.
-    Bij een GET-verzoek wordt de inhoud van het bestand geladen en weergegeven.
+    Bij een GET-verzoek wordt de inhoud van het bestand geladen en weergegeven; een bestand groter
+    dan TEXT_INLINE_MAX wordt doorgestuurd naar de viewer voor grote tekstbestanden.
 
     Args:
         path_file (str): Het pad naar het SQL-bestand dat bewerkt moet worden.
@@ -196,9 +382,11 @@ def open_sql(path_file: str):
     abs_path = secure_path(path_file)
     if request.method == "POST":
         content = request.form["content"]
-        with open(abs_path, "w", encoding="utf-8") as f:
+        with open_replacing(abs_path, encoding="utf-8") as f:
             f.write(content)
         return redirect(url_for("browser.browse", req_path=os.path.dirname(path_file)))
+    if abs_path.stat().st_size > TEXT_INLINE_MAX:
+        return redirect(url_for("browser.open_text", path_file=path_file))
     with open(abs_path, encoding="utf-8") as f:
         content = f.read()
     return render_template(
@@ -210,6 +398,59 @@ def open_sql(path_file: str):
     )
 
 
+@browser.route("/open/text/<path:path_file>")
+def open_text(path_file: str):
+    """Toont een (groot) tekstbestand, zoals gegenereerde SQL of een tekstlog, zonder het volledig in te lezen.
+
+    De pagina bevat alleen het aantal regels; de viewer haalt vensters van regels op via text_lines
+    terwijl er gescrold wordt, en kan direct naar het begin, het einde of een regelnummer springen.
+
+    Args:
+        path_file (str): Het pad naar het tekstbestand.
+
+    Returns:
+        Response: Een HTML-pagina met de viewer.
+    """
+    abs_path = secure_path(path_file)
+    if not abs_path.is_file():
+        abort(404)
+    index = text_indexes.get(abs_path)
+    return render_template(
+        "browser/text_view.html",
+        path_file=path_file,
+        file_type=abs_path.suffix.lower().lstrip("."),
+        total=index.line_count,
+        window=TEXT_WINDOW,
+    )
+
+
+@browser.route("/text_lines/<path:path_file>")
+def text_lines(path_file: str):
+    """Geeft een venster van regels van een tekstbestand als JSON, met behulp van de regel-index van het bestand.
+
+    Het venster wordt opgegeven met start en stop (regel N tot M, vanaf 0). Met tail=N komen de
+    laatste N regels terug.
+
+    Args:
+        path_file (str): Het pad naar het tekstbestand.
+
+    Returns:
+        Response: Een JSON-object met de eerste regel van het venster, de regels en het totaal aantal regels.
+    """
+    abs_path = secure_path(path_file)
+    if not abs_path.is_file():
+        abort(404)
+    index = text_indexes.get(abs_path)
+    if "tail" in request.args:
+        size = min(max(request.args.get("tail", TEXT_WINDOW, type=int), 1), TEXT_WINDOW_MAX)
+        start = max(index.line_count - size, 0)
+        stop = index.line_count
+    else:
+        start = max(request.args.get("start", 0, type=int), 0)
+        stop = min(request.args.get("stop", start + TEXT_WINDOW, type=int), start + TEXT_WINDOW_MAX)
+    return jsonify(start=start, lines=index.lines(start, stop), total=index.line_count)
+
+
 @browser.route("/edit_csv/<path:path_file>", methods=["GET", "POST"])
 def edit_csv(path_file: str):
     """Biedt een interface om een CSV-bestand te bekijken en te bewerken.
@@ -224,93 +465,208 @@ def edit_csv(path_file: str):
     Returns:
         Response: Een HTML-pagina voor het bewerken van het CSV-bestand of een JSON-status na opslaan.
     """
-
-    if not os.path.exists(path_file):
+    path_absolute = secure_path(path_file)
+    if not path_absolute.is_file():
         return "Bestand niet gevonden", 404
 
     if request.method == "GET":
         return handle_edit_csv_get(path_file)
 
     if request.method == "POST":
-        return handle_edit_csv_post(path_file)
+        return handle_edit_csv_post(path_absolute)
 
 
 def handle_edit_csv_get(path_file: str):
-    """Leest de inhoud van een CSV-bestand en rendert deze in een HTML-template.
+    """Rendert de CSV-viewer voor een bestand; de rijen worden per pagina via csv_rows opgehaald.
 
-    Deze functie opent het opgegeven CSV-bestand, leest de rijen en stuurt deze naar de template voor bewerking.
+    Alleen de kopregel wordt gelezen (via de rij-index van het bestand), zodat het openen van een
+    CSV-bestand van elke grootte één pagina aan I/O kost.
 
     Args:
-        path_file (str): Het pad naar het CSV-bestand dat gelezen moet worden.
+        path_file (str): Het pad naar het CSV-bestand dat getoond moet worden.
 
     Returns:
-        Response: Een HTML-pagina met de inhoud van het CSV-bestand.
+        Response: Een HTML-pagina met de kolommen van het CSV-bestand.
     """
-    with open(path_file, newline="", encoding="utf-8") as csvfile:
-        reader = csv.DictReader(csvfile)
-        data = list(reader)
-    return render_template("browser/edit_csv.html", path_file=path_file, data=data)
+    index = csv_indexes.get(secure_path(path_file))
+    return render_template(
+        "browser/edit_csv.html",
+        path_file=path_file,
+        columns=index.header,
+        total=index.row_count,
+        page_size=CSV_PAGE_SIZE,
+        version=index.version,
+    )
 
 
-def handle_edit_csv_post(csv_path):
-    """Slaat nieuwe CSV-inhoud op in het opgegeven bestand.
+def handle_csv_patch(csv_path: Path, patch: dict):
+    """Past een patch met gewijzigde cellen en rijen toe op een CSV-bestand; zie handle_edit_csv_post.
 
-    Deze functie ontvangt de nieuwe CSV-data van de client en schrijft deze naar het opgegeven bestandspad.
+    Args:
+        csv_path (Path): Het absolute, via secure_path gecontroleerde pad naar het CSV-bestand.
+        patch (dict): De patch met 'version', 'cells' en/of 'rows'.
+
+    Returns:
+        Response: Een JSON-object met de status en de nieuwe versie, een 409-fout bij een verouderde
+        versie of een 400-fout bij een ongeldige patch.
+    """
+    changes: dict[int, dict[str, str]] = {}
+    try:
+        for cell in patch.get("cells", []):
+            changes.setdefault(int(cell["row"]), {})[str(cell["field"])] = str(cell["value"] if cell["value"] is not None else "")
+        for row in patch.get("rows", []):
+            changes.setdefault(int(row["row"]), {}).update(
+                {str(field): str(value if value is not None else "") for field, value in row["values"].items()}
+            )
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return jsonify({"status": "error", "message": "Ongeldige patch"}), 400
+
+    with _lock_csv_patch:
+        index = csv_indexes.get(csv_path)
+        if patch.get("version") != index.version:
+            return jsonify({
+                "status": "conflict",
+                "message": "Het bestand is gewijzigd sinds het geopend is; herlaad en probeer opnieuw.",
+                "version": index.version,
+            }), 409
+        try:
+            with open_replacing(csv_path, mode="wb") as f:
+                index.write_patched(f, changes)
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+        version = csv_indexes.get(csv_path).version
+    return jsonify({"status": "success", "version": version})
+
+
+@browser.route("/csv_rows/<path:path_file>")
+def csv_rows(path_file: str):
+    """Geeft een reeks rijen van een CSV-bestand als JSON, met behulp van de rij-index van het bestand.
+
+    De reeks wordt opgegeven met start en stop (rij N tot M, vanaf 0), of met page en size zoals
+    Tabulator die bij remote paginering meestuurt. Sorteren gaat via sort[0][field] en sort[0][dir].
+
+    Args:
+        path_file (str): Het pad naar het CSV-bestand.
+
+    Returns:
+        Response: Een JSON-object met de kolommen, de rijen (elk met het rijnummer in '_row'), het totaal
+        aantal rijen en het aantal pagina's.
+    """
+    path_absolute = secure_path(path_file)
+    if not path_absolute.is_file():
+        abort(404)
+    index = csv_indexes.get(path_absolute)
+    size = min(max(request.args.get("size", CSV_PAGE_SIZE, type=int), 1), CSV_PAGE_SIZE_MAX)
+    if "start" in request.args:
+        start = max(request.args.get("start", 0, type=int), 0)
+        stop = min(request.args.get("stop", start + size, type=int), start + CSV_PAGE_SIZE_MAX)
+    else:
+        start = (max(request.args.get("page", 1, type=int), 1) - 1) * size
+        stop = start + size
+    sort_column = request.args.get("sort[0][field]")
+    sort_column = sort_column if sort_column in index.header else None
+    descending = request.args.get("sort[0][dir]") == "desc"
+
+    rows = index.rows(start, stop, sort_column=sort_column, descending=descending)
+    data = [{"_row": row, **dict(zip(index.header, values))} for row, values in rows]
+    return jsonify(
+        columns=index.header,
+        data=data,
+        total=index.row_count,
+        last_page=max((index.row_count + size - 1) // size, 1),
+    )
+
+
+def handle_edit_csv_post(csv_path: Path):
+    """Slaat wijzigingen in een CSV-bestand op.
+
+    Verwacht bij voorkeur een patch met alleen de gewijzigde cellen en rijen:
+    {"version": ..., "cells": [{"row": n, "field": kolom, "value": waarde}], "rows": [{"row": n, "values": {kolom: waarde}}]}.
+    Rijnummers zijn die uit '_row' van csv_rows. De patch wordt in één doorloop naar een tijdelijk
+    bestand geschreven dat het origineel atomair vervangt. Als het bestand sinds 'version' gewijzigd
+    is, wordt de patch geweigerd. Een volledige CSV onder "csv" wordt nog ondersteund.
 
     Args:
-        csv_path (str): Het pad naar het CSV-bestand waarin de nieuwe data moet worden opgeslagen.
+        csv_path (Path): Het absolute, via secure_path gecontroleerde pad naar het CSV-bestand.
 
     Returns:
-        Response: Een JSON-object met de status van de opslagoperatie.
+        Response: Een JSON-object met de status van de opslagoperatie en de nieuwe versie van het bestand.
     """
     data = request.get_json(silent=True)
+    if data and ("cells" in data or "rows" in data):
+        return handle_csv_patch(csv_path, data)
     if not data or "csv" not in data:
         return jsonify({"status": "error", "message": "Ongeldige of ontbrekende JSON-data"}), 400
     new_csv = data["csv"]
-    with open(csv_path, "w", newline="", encoding="utf-8") as csvfile:
+    with open_replacing(csv_path, newline="", encoding="utf-8") as csvfile:
         reader = csv.reader(io.StringIO(new_csv))
         writer = csv.writer(csvfile)
         writer.writerows(reader)
     return jsonify({"status": "success"})
 
 
-@browser.route("/get_csv_data/<path:path_file>")
-def get_csv_data(path_file: str):
-    """Haalt de inhoud van een CSV-bestand op en retourneert deze als tekst.
+@browser.route("/export_csv/<path:path_file>")
+def export_csv(path_file: str):
+    """Streamt een CSV-bestand als download rechtstreeks van schijf.
 
-    Deze functie leest het opgegeven CSV-bestand en stuurt de inhoud terug naar de client.
+    Optionele queryparameters: columns (kommagescheiden kolomselectie), filter[kolom] (de waarde moet
+    deze tekst bevatten), sort en dir (asc of desc) en gzip=1 om de uitvoer gecomprimeerd te versturen.
 
     Args:
-        path_file (str): Het pad naar het CSV-bestand dat opgehaald moet worden.
+        path_file (str): Het pad naar het CSV-bestand.
 
     Returns:
-        str: De inhoud van het CSV-bestand als tekst.
+        Response: Een gestreamde CSV-download, of een 400-fout bij een onbekende kolom.
     """
-    path_file = Path(path_file).resolve()
-    with open(path_file, "r", encoding="utf-8") as f:
-        return f.read()
-
+    path_absolute = secure_path(path_file)
+    if not path_absolute.is_file():
+        abort(404)
+    index = csv_indexes.get(path_absolute)
+    columns = [column for column in request.args.get("columns", "").split(",") if column]
+    filters = {
+        key[len("filter["):-1]: value
+        for key, value in request.args.items()
+        if key.startswith("filter[") and key.endswith("]") and value
+    }
+    sort_column = request.args.get("sort") or None
+    try:
+        chunks = iter_export(
+            index,
+            columns=columns or None,
+            filters=filters,
+            sort_column=sort_column,
+            descending=request.args.get("dir") == "desc",
+        )
+        first = next(chunks, b"")  # Valideert de kolommen voordat de respons begint
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    def generate():
+        yield first
+        yield from chunks
+
+    filename = path_absolute.name
+    body = generate()
+    if request.args.get("gzip") == "1":
+        body = gzip_stream(body)
+        filename += ".gz"
+    mimetype = "application/gzip" if filename.endswith(".gz") else "text/csv"
+    response = Response(stream_with_context(body), mimetype=mimetype)
+    set_attachment(response.headers, filename)
+    return response
 
-@browser.route("/download_csv/<path:path_file>", methods=["POST"])
-def download_csv(path_file: str):
-    """Slaat de ontvangen CSV-gegevens op in het opgegeven bestandspad.
 
-    Deze functie ontvangt CSV-data via een POST-verzoek en schrijft deze naar het opgegeven bestand.
-    Na het succesvol opslaan van de gegevens wordt een bevestiging in JSON-formaat geretourneerd.
+def gzip_stream(chunks):
+    """Comprimeert een stroom van blokken bytes naar gzip-formaat, blok voor blok.
 
     Args:
-        path_file (str): Het pad naar het CSV-bestand waarin de gegevens moeten worden opgeslagen.
+        chunks: De ongecomprimeerde blokken.
 
-    Returns:
-        Response: Een JSON-object met de status van de opslagoperatie.
+    Yields:
+        bytes: De gecomprimeerde blokken.
     """
-    filename = Path(path_file).name
-    data = request.get_json()
-    csv_data = data.get("csv", "")
-
-    response = Response(
-        csv_data,
-        mimetype="text/csv",
-        headers={"Content-Disposition": f"attachment; filename={filename}"},
-    )
-    return response
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31: gzip-header en -trailer
+    for chunk in chunks:
+        if data := compressor.compress(chunk):
+            yield data
+    yield compressor.flush()
@@ -10,8 +10,12 @@ from flask import (
     url_for,
 )
 
+from config import GenesisConfig
+from logtools import get_logger
 from ..configs_registry import ConfigRegistry
 
+logger = get_logger(name =__name__,  dir_output = '.', base_file = 'log_app.json')
+
 config_handler = Blueprint("config_handler", __name__)
 
 CONFIG_DIR = Path("configs").resolve()
@@ -62,9 +66,26 @@ def _handle_save(filename: str, path_file: Path, content: str):
     save_config_file(path_file, content)
     flash(f"✅ Bestand '{filename}' opgeslagen.", "success")
     config_registry.refresh()  # Ververst het register om wijzigingsdatum bij te werken
+    _flash_plan(path_file)
     return _render_editor(filename, path_file)
 
 
+def _flash_plan(path_file: Path):
+    """Toont welke stappen een volgende run met het opgeslagen configuratiebestand opnieuw zou uitvoeren."""
+    try:
+        plan = GenesisConfig(file_config=path_file, create_version_dir=False).plan()
+    except Exception as e:
+        logger.warning(f"Plan voor {path_file.name} kon niet worden bepaald: {e}")
+        return
+    if plan["version"] is None:
+        return
+    stale = [stage for stage, units in plan["stages"].items() if units["stale"]]
+    if stale:
+        flash(f"ℹ️ Ten opzichte van {plan['version']} worden opnieuw uitgevoerd: {', '.join(stale)}.", "info")
+    else:
+        flash(f"ℹ️ Invoer ongewijzigd ten opzichte van {plan['version']}.", "info")
+
+
 def _handle_save_as(filename: str, content: str):
     """Slaat de inhoud op als een nieuw configuratiebestand met een opgegeven naam."""
     file_name_new = request.form.get("new_name").strip()
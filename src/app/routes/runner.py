@@ -3,6 +3,8 @@ import time
 from pathlib import Path
 
 from ansi2html import Ansi2HTMLConverter
+from config import GenesisConfig
+from logtools import get_logger
 from ..configs_registry import ConfigRegistry
 from flask import (
     Blueprint,
@@ -14,26 +16,180 @@ from flask import (
     url_for,
 )
 
+logger = get_logger(name =__name__,  dir_output = '.', base_file = 'log_app.json')
+
 runner = Blueprint("runner", __name__)
 
 CONFIG_DIR = Path("configs").resolve()
 OUTPUT_DIR = Path("output").resolve()
 config_registry = ConfigRegistry()
+ANSWER_POLICIES = ["ask", "yes", "no", "fail"]  # Zie genesis.py --answer
 outputs = {}  # filename: {'lines': [], 'prompt': None, 'awaiting': False, 'lock': threading.Lock()}
 
 
+def find_cached_version(filename: str) -> tuple[str, Path] | None:
+    """Zoekt een eerdere succesvolle versie die met exact dezelfde invoer is gemaakt.
+
+    Bepaalt de vingerafdruk van de huidige invoer (configuratie, PowerDesigner-modellen en templates)
+    en vergelijkt deze met de vastgelegde vingerafdrukken van de bestaande versies.
+
+    Args:
+        filename: De naam van het configuratiebestand.
+
+    Returns:
+        tuple[str, Path] | None: De versienaam en het pad naar de versiemap, of None als er geen overeenkomende versie is.
+    """
+    try:
+        genesis_config = GenesisConfig(file_config=CONFIG_DIR / filename, create_version_dir=False)
+        latest = genesis_config.find_latest_success()
+        digest = genesis_config.fingerprint(recorded=latest[1] if latest else None)["digest"]
+    except Exception as e:
+        logger.warning(f"Vingerafdruk van {filename} kon niet worden bepaald: {e}")
+        return None
+    if version := genesis_config.find_version_with_fingerprint(digest):
+        return version, Path(genesis_config.folder_intermediate_root) / genesis_config.title / version
+    return None
+
+
+@runner.route("/plan/<filename>")
+def plan(filename: str) -> Response:
+    """Geeft zonder iets uit te voeren terug wat een volgende run opnieuw zou genereren.
+
+    Args:
+        filename: De naam van het configuratiebestand.
+
+    Returns:
+        Response: Een Flask JSON-respons met de vergeleken versie, de gewijzigde invoerbestanden en de
+        opnieuw uit te voeren eenheden per stap, of een 400-fout als de configuratie ongeldig is.
+    """
+    try:
+        genesis_config = GenesisConfig(file_config=CONFIG_DIR / filename, create_version_dir=False)
+        return jsonify(genesis_config.plan())
+    except Exception as e:
+        logger.warning(f"Plan voor {filename} kon niet worden bepaald: {e}")
+        return jsonify({"error": str(e)}), 400
+
+
 @runner.route("/start/<filename>", methods=['POST'])
 def start(filename: str) -> Response:
     """Start de GenesisRunner voor het opgegeven configuratiebestand.
 
     Initialiseert uitvoertracking en start de runner als deze inactief of afgerond is. Na het starten of als de runner al actief is, wordt doorgestuurd naar de outputpagina.
+    Als een eerdere succesvolle versie met exact dezelfde invoer bestaat, wordt eerst aangeboden die versie
+    te hergebruiken; met het formulierveld 'cache=ignore' wordt toch een nieuwe run gestart.
+
+    Args:
+        filename: De naam van het configuratiebestand waarvoor de runner gestart moet worden.
+
+    Returns:
+        Response: Een Flask-redirect naar de outputpagina, een keuzepagina voor hergebruik, of een 400-fout als de runner al actief is.
+    """
+    runner = config_registry.get_config_runner(filename)
+    if runner.status in ["idle", "finished"] and request.form.get("cache") != "ignore":
+        if cached := find_cached_version(filename):
+            version, path_version = cached
+            return render_template(
+                "runner_cached.html",
+                config=filename,
+                version=version,
+                path_version=path_version.as_posix(),
+                answer=request.form.get("answer", ""),
+            )
+    return launch(filename)
+
+
+@runner.route("/resume/<filename>", methods=['POST'])
+def resume(filename: str) -> Response:
+    """Hervat een afgebroken run van het opgegeven configuratiebestand vanaf de eerste onvoltooide stap.
+
+    Alleen de nieuwste versie die niet succesvol is afgerond maar waarvan al stappen voltooid zijn kan
+    hervat worden. Het formulierveld 'version' is optioneel; als het is meegegeven moet het die versie zijn.
+
+    Args:
+        filename: De naam van het configuratiebestand waarvan de run hervat moet worden.
+
+    Returns:
+        Response: Een Flask-redirect naar de outputpagina, een 404-fout als er niets te hervatten is of
+        een 409-fout als de gevraagde versie niet de te hervatten versie is.
+    """
+    version_requested = request.form.get("version")
+    version = None
+    try:
+        genesis_config = GenesisConfig(file_config=CONFIG_DIR / filename, create_version_dir=False)
+        version = genesis_config.find_resumable_version()
+    except Exception as e:
+        logger.warning(f"Te hervatten versie van {filename} kon niet worden bepaald: {e}")
+    if not version:
+        return render_template("error.html", message=f"Geen afgebroken run van {filename} om te hervatten."), 404
+    if version_requested and version_requested != version:
+        message = f"Versie '{version_requested}' van {filename} kan niet worden hervat; alleen {version} komt in aanmerking."
+        return render_template("error.html", message=message), 409
+    return launch(filename, args=["--resume", version])
+
+
+def snapshot_args(filename: str, args: list[str]) -> list[str]:
+    """Valideert de configuratie in dit proces en geeft de argumenten om die als snapshot aan genesis.py door te geven.
+
+    De versie wordt hier al gereserveerd (of bij hervatten overgenomen), zodat het kindproces exact de
+    configuratie en versie gebruikt van het moment van starten. Als dat niet lukt, leest het kindproces
+    het configuratiebestand zelf.
+
+    Args:
+        filename: De naam van het configuratiebestand.
+        args: De overige argumenten voor genesis.py.
+
+    Returns:
+        list[str]: De argumenten voor de snapshot, of een lege lijst.
+    """
+    version = args[args.index("--resume") + 1] if "--resume" in args else None
+    try:
+        genesis_config = GenesisConfig(
+            file_config=CONFIG_DIR / filename, create_version_dir=version is None, version=version
+        )
+        return ["--snapshot", genesis_config.write_snapshot()]
+    except Exception as e:
+        logger.warning(f"Configuratiesnapshot van {filename} kon niet worden gemaakt: {e}")
+        return []
+
+
+def discard_snapshot(args_snapshot: list[str], resume: bool) -> None:
+    """Ruimt de snapshot en de daarvoor gereserveerde versiemap op als het kindproces niet gestart kon worden.
+
+    Bij hervatten blijft de versiemap staan, want die bevat de resultaten van de afgebroken run. Een
+    nieuwe versiemap wordt alleen verwijderd als die nog leeg is.
+
+    Args:
+        args_snapshot: De argumenten zoals teruggegeven door snapshot_args().
+        resume: Of de run een afgebroken versie hervat.
+    """
+    if not args_snapshot:
+        return
+    path_snapshot = args_snapshot[1]
+    try:
+        genesis_config = GenesisConfig.from_snapshot(path_snapshot)  # Verwijdert ook het snapshotbestand
+        if not resume:
+            genesis_config.discard_version()
+    except Exception as e:
+        logger.warning(f"Snapshot '{path_snapshot}' kon niet worden opgeruimd: {e}")
+
+
+def launch(filename: str, args: list[str] | None = None) -> Response:
+    """Start de GenesisRunner en de verzamelthread voor de uitvoer als de runner inactief of afgerond is.
 
     Args:
         filename: De naam van het configuratiebestand waarvoor de runner gestart moet worden.
+        args: Extra command line argumenten voor genesis.py.
+
+    Het formulierveld 'answer' bepaalt het antwoordbeleid bij waarschuwingen voor deze run; zonder
+    waarde geldt 'ignore-warnings' uit de configuratie.
 
     Returns:
-        Response: Een Flask-redirect naar de outputpagina, of een 400-fout als de runner al actief is.
+        Response: Een Flask-redirect naar de outputpagina.
     """
+    args = list(args or [])
+    answer = request.form.get("answer")
+    if answer in ANSWER_POLICIES:
+        args += ["--answer", answer]
     runner = config_registry.get_config_runner(filename)
     if filename not in outputs:
         outputs[filename] = {
@@ -50,7 +206,12 @@ def start(filename: str) -> Response:
             outputs[filename]["lines"] = []
             outputs[filename]["prompt"] = None
             outputs[filename]["awaiting"] = False
-        runner.start()
+        args_snapshot = snapshot_args(filename, args)
+        try:
+            runner.start(args + args_snapshot)
+        except Exception:
+            discard_snapshot(args_snapshot, resume="--resume" in args)
+            raise
 
         def collector():
             """Verzamelt uitvoer van de GenesisRunner en verwerkt prompts.
@@ -66,6 +227,7 @@ def start(filename: str) -> Response:
                     if "Afgerond" in line:
                         pass  # Finished handled by status
             # After stream ends, ensure status updates
+            config_registry.maintain_output(filename)
 
         threading.Thread(target=collector, daemon=True).start()
 
@@ -144,9 +306,8 @@ def get_status():
         Response: Een Flask JSON-respons met de status en prompt van elke configuratie.
     """
     status_dict = {}
-    for filename in config_registry.configs:
-        runner = config_registry.get_config_runner(filename)
-        stat = runner.status
+    for filename, config in config_registry.configs.items():
+        stat = config["runner"].status
         awaiting = False
         prompt = None
         if filename in outputs:
@@ -0,0 +1,65 @@
+import mmap
+import os
+from array import array
+from itertools import accumulate
+from pathlib import Path
+
+
+class TextIndex:
+    """Index van de byte-offsets waarop de regels van een tekstbestand beginnen.
+
+    Het bestand wordt één keer in blokken doorlopen; daarna wordt een venster van regels direct uit
+    een memory map van het bestand gelezen, zonder de rest van het bestand te lezen.
+    """
+
+    SIZE_BLOCK = 4 * 1024 * 1024
+
+    def __init__(self, path_file: Path, encoding: str = "utf-8"):
+        """Bouwt de index voor een tekstbestand.
+
+        Args:
+            path_file (Path): Het pad naar het tekstbestand.
+            encoding (str): De tekencodering van het bestand.
+        """
+        self.path_file = Path(path_file)
+        self.encoding = encoding
+        stat = os.stat(self.path_file)
+        self.key_stat = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        self.offsets = array("q", [0])  # Begin van elke regel, plus het einde van de laatste regel
+        self._build(stat.st_size)
+
+    def _build(self, size: int) -> None:
+        """Doorloopt het bestand in blokken en legt het begin van elke regel vast."""
+        offset = 0
+        with open(self.path_file, "rb") as f:
+            while block := f.read(self.SIZE_BLOCK):
+                # De lengte van elk stuk tot en met een regeleinde geeft het begin van de volgende regel
+                starts = accumulate((len(part) + 1 for part in block.split(b"\n")[:-1]), initial=offset)
+                next(starts)
+                self.offsets.extend(starts)
+                offset += len(block)
+        # Een laatste regel zonder regeleinde loopt tot het einde van het bestand
+        if self.offsets[-1] != size:
+            self.offsets.append(size)
+
+    @property
+    def line_count(self) -> int:
+        """Het aantal regels in het bestand."""
+        return len(self.offsets) - 1
+
+    def lines(self, start: int, stop: int) -> list[str]:
+        """Geeft de regels start tot stop (exclusief), vanaf 0, zonder regeleindes.
+
+        Args:
+            start (int): De eerste regel.
+            stop (int): De regel na de laatste.
+
+        Returns:
+            list[str]: De regels binnen het bestand; buiten het bestand vallende regels ontbreken.
+        """
+        start, stop = max(start, 0), min(stop, self.line_count)
+        if start >= stop:
+            return []
+        with open(self.path_file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            data = mm[self.offsets[start]:self.offsets[stop]]
+        return [line.removesuffix("\r") for line in data.decode(self.encoding, errors="replace").split("\n")[: stop - start]]
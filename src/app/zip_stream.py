@@ -0,0 +1,81 @@
+import io
+import os
+import zipfile
+from pathlib import Path
+from typing import Iterator
+
+SIZE_CHUNK = 1024 * 1024
+# Bestanden die al gecomprimeerd zijn; deflate levert daar niets op en kost alleen rekentijd
+SUFFIXES_STORED = {
+    ".7z", ".bz2", ".docx", ".gif", ".gz", ".jpeg", ".jpg", ".mp4", ".parquet", ".png",
+    ".pptx", ".tgz", ".webp", ".xlsx", ".xz", ".zip", ".zst",
+}
+
+
+class _StreamBuffer(io.RawIOBase):
+    """Schrijfdoel voor zipfile dat de geschreven bytes vasthoudt tot ze worden opgehaald.
+
+    Omdat de buffer niet seekable is, schrijft zipfile de groottes en controlesommen na elk
+    bestand in een data descriptor in plaats van terug te springen naar de header.
+    """
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def pop(self) -> bytes:
+        """Geeft de bytes die sinds de vorige aanroep geschreven zijn en maakt de buffer leeg."""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip(path_dir: Path) -> Iterator[bytes]:
+    """Streamt een directory als zip-archief, terwijl het archief wordt opgebouwd.
+
+    Er wordt geen tijdelijk bestand geschreven: elk blok dat zipfile produceert wordt direct
+    doorgegeven, zodat het geheugengebruik niet afhangt van de grootte van de bestanden. Bestanden
+    met een extensie uit SUFFIXES_STORED worden ongecomprimeerd opgeslagen, de rest met deflate.
+    Symbolische links worden overgeslagen, zodat er niets van buiten de directory in het archief komt.
+
+    Args:
+        path_dir (Path): De directory die wordt ingepakt; de paden in het archief beginnen met de naam ervan.
+
+    Yields:
+        bytes: Opeenvolgende blokken van het zip-archief.
+    """
+    path_dir = Path(path_dir)
+    buffer = _StreamBuffer()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for root, dirs, files in os.walk(path_dir):
+            dirs[:] = sorted(name for name in dirs if not os.path.islink(os.path.join(root, name)))
+            path_root = Path(root)
+            arcname_root = Path(path_dir.name, path_root.relative_to(path_dir)).as_posix()
+            if not dirs and not files:
+                archive.writestr(zipfile.ZipInfo.from_file(path_root, arcname_root), b"")
+            for name in sorted(files):
+                path_file = path_root / name
+                if path_file.is_symlink() or not path_file.is_file():
+                    continue
+                info = zipfile.ZipInfo.from_file(path_file, f"{arcname_root}/{name}")
+                stored = path_file.suffix.lower() in SUFFIXES_STORED
+                info.compress_type = zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED
+                with open(path_file, "rb") as f_in, archive.open(info, "w") as f_out:
+                    while chunk := f_in.read(SIZE_CHUNK):
+                        f_out.write(chunk)
+                        if data := buffer.pop():
+                            yield data
+                if data := buffer.pop():
+                    yield data
+    yield buffer.pop()
@@ -0,0 +1,152 @@
+import hashlib
+import os
+from pathlib import Path
+
+from logtools import get_logger
+
+from .version_allocator import locked
+
+logger = get_logger(name =__name__,  dir_output = '.', base_file = 'log_genesis.json')
+
+
+class ContentStore:
+    """
+    Content-addressed opslag die identieke bestanden in de outputversies via hardlinks deelt.
+
+    Elk uniek bestand wordt één keer als blob onder '<path_store>/<xx>/<sha256>' vastgelegd; identieke
+    bestanden in andere versiemappen worden vervangen door een hardlink naar die blob. Voor lezers
+    (bestandsbrowser, downloads) verandert er niets. Bestanden die al een hardlink hebben worden niet
+    opnieuw gehasht, zodat een herhaalde doorloop alleen nieuwe bestanden leest.
+
+    Schrijvers moeten een bestand vervangen in plaats van het ter plekke te overschrijven, anders
+    wijzigt de inhoud in alle versies die de blob delen.
+
+    Ontdubbelen en opruimen gebeuren onder een procesoverstijgende lock op de opslag, zodat het
+    opruimen geen blob verwijdert die een gelijktijdige doorloop net wil koppelen.
+    """
+
+    DIR_STORE = ".blobs"
+    FILE_LOCK = ".lock"
+    SIZE_CHUNK = 1024 * 1024
+
+    def __init__(self, path_store: Path):
+        """
+        Initialiseert de ContentStore.
+
+        Args:
+            path_store (Path): De map waarin de blobs worden opgeslagen; moet op hetzelfde bestandssysteem staan als de output.
+        """
+        self.path_store = Path(path_store)
+        self.path_lock = self.path_store / self.FILE_LOCK
+
+    def _hash_file(self, path: str) -> str:
+        """
+        Berekent de SHA-256 van een bestand in blokken.
+
+        Args:
+            path (str): Het pad naar het bestand.
+
+        Returns:
+            str: De hexadecimale hash.
+        """
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(self.SIZE_CHUNK):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _path_blob(self, digest: str) -> Path:
+        """
+        Geeft het pad van de blob voor een hash, verdeeld over submappen op de eerste twee tekens.
+        """
+        return self.path_store / digest[:2] / digest
+
+    def add(self, path: str, stat: os.stat_result | None = None) -> int:
+        """
+        Legt een bestand vast in de opslag en vervangt het door een hardlink naar de blob als die al bestaat.
+
+        Args:
+            path (str): Het pad naar het bestand.
+            stat (os.stat_result | None): De stat van het bestand, als die al bekend is.
+
+        Returns:
+            int: Het aantal bespaarde bytes.
+        """
+        stat = stat or os.stat(path, follow_symlinks=False)
+        path_blob = self._path_blob(self._hash_file(path))
+        try:
+            stat_blob = path_blob.stat()
+        except FileNotFoundError:
+            path_blob.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.link(path, path_blob)
+            except FileExistsError:
+                return self.add(path, stat)
+            return 0
+        if stat_blob.st_ino == stat.st_ino and stat_blob.st_dev == stat.st_dev:
+            return 0
+        path_tmp = f"{path}.{os.getpid()}.lnk"
+        os.link(path_blob, path_tmp)
+        os.replace(path_tmp, path)
+        return stat.st_size
+
+    def deduplicate(self, path_root: Path) -> tuple[int, int]:
+        """
+        Doorloopt een map en deelt alle bestanden die nog geen hardlink hebben via de opslag.
+
+        Args:
+            path_root (Path): De map die ontdubbeld wordt, bijvoorbeeld '<folder_intermediate_root>/<title>'.
+
+        Returns:
+            tuple[int, int]: Het aantal gekoppelde bestanden en het aantal bespaarde bytes.
+        """
+        linked, saved = 0, 0
+        stack = [str(path_root)]
+        with locked(self.path_lock):
+            while stack:
+                path_dir = stack.pop()
+                try:
+                    with os.scandir(path_dir) as it:
+                        entries = list(it)
+                except OSError as e:
+                    logger.warning(f"Map '{path_dir}' overgeslagen bij het ontdubbelen: {e}")
+                    continue
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                            continue
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        stat = entry.stat(follow_symlinks=False)
+                        if stat.st_nlink > 1:
+                            continue
+                        bytes_saved = self.add(entry.path, stat)
+                    except OSError as e:  # Bijvoorbeeld verwijderd tijdens de doorloop of geen rechten
+                        logger.warning(f"Bestand '{entry.path}' overgeslagen bij het ontdubbelen: {e}")
+                        continue
+                    linked += 1 if bytes_saved else 0
+                    saved += bytes_saved
+        return linked, saved
+
+    def collect_garbage(self) -> int:
+        """
+        Verwijdert blobs waarnaar geen enkel outputbestand meer verwijst.
+
+        Returns:
+            int: Het aantal verwijderde blobs.
+        """
+        removed = 0
+        if not self.path_store.exists():
+            return removed
+        with locked(self.path_lock):
+            for path_dir in self.path_store.iterdir():
+                if path_dir.is_symlink() or not path_dir.is_dir():  # Zoals het lockbestand
+                    continue
+                for entry in os.scandir(path_dir):
+                    if entry.is_file(follow_symlinks=False) and entry.stat(follow_symlinks=False).st_nlink == 1:
+                        os.unlink(entry.path)
+                        removed += 1
+        return removed
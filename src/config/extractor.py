@@ -1,3 +1,4 @@
+import os
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -7,10 +8,11 @@ from .base import BaseConfigComponent
 class ExtractorConfigData:
     """Configuration settings for the Extractor.
 
-    Specifies the folder for extractor output.
+    Specifies the folder for extractor output and the number of worker processes for extracting models in parallel.
     """
 
     folder_output: str = "RETW"
+    workers: int | None = None
 
 
 class ExtractorConfig(BaseConfigComponent):
@@ -42,4 +44,15 @@ class ExtractorConfig(BaseConfigComponent):
         """
         folder = self.path_intermediate / self._data.folder_output
         self.create_dir(folder)
-        return folder
\ No newline at end of file
+        return folder
+
+    @property
+    def workers(self) -> int:
+        """
+        Geeft het aantal workerprocessen waarmee modellen parallel worden geëxtraheerd.
+        Zonder instelling wordt het aantal beschikbare processorkernen gebruikt.
+
+        Returns:
+            int: Het aantal workerprocessen.
+        """
+        return max(1, self._data.workers or os.cpu_count() or 1)
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+SIZE_CHUNK = 1024 * 1024
+
+_cache_hashes: dict[tuple[str, int, int, int], str] = {}
+_lock_cache = threading.Lock()
+
+
+def hash_file(path: Path) -> str:
+    """
+    Berekent de SHA-256 van een bestand.
+    Hashes worden per proces bewaard op basis van pad, wijzigingstijd, grootte en inode, zodat een
+    ongewijzigd bestand niet opnieuw gelezen wordt.
+
+    Args:
+        path (Path): Het pad naar het bestand.
+
+    Returns:
+        str: De hexadecimale hash.
+    """
+    stat = os.stat(path)
+    key = (str(path), stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    with _lock_cache:
+        if digest := _cache_hashes.get(key):
+            return digest
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(SIZE_CHUNK):
+            sha.update(chunk)
+    digest = sha.hexdigest()
+    with _lock_cache:
+        _cache_hashes[key] = digest
+    return digest
+
+
+def hash_data(data: dict) -> str:
+    """
+    Berekent de SHA-256 van een dictionary, onafhankelijk van de volgorde van de sleutels.
+
+    Args:
+        data (dict): Naar JSON serialiseerbare gegevens.
+
+    Returns:
+        str: De hexadecimale hash.
+    """
+    serialized = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+def list_files(path: Path) -> list[Path]:
+    """
+    Geeft alle bestanden in een map (recursief) in een stabiele volgorde, of het bestand zelf.
+
+    Args:
+        path (Path): Een map of bestand.
+
+    Returns:
+        list[Path]: De gevonden bestanden; leeg als het pad niet bestaat.
+    """
+    path = Path(path)
+    if path.is_file():
+        return [path]
+    if not path.is_dir():
+        return []
+    return sorted(p for p in path.rglob("*") if p.is_file())
+
+
+def hash_files(paths: list[Path], known: dict[str, str] | None = None) -> dict[str, str]:
+    """
+    Berekent de hashes van een lijst bestanden.
+
+    Args:
+        paths (list[Path]): De bestanden.
+        known (dict[str, str] | None): Al bekende hashes per bestandspad die niet opnieuw berekend hoeven te worden.
+
+    Returns:
+        dict[str, str]: Per bestandspad (relatief aan de werkmap, met '/' als scheidingsteken) de hash.
+    """
+    known = known or {}
+    hashes = {}
+    for path in paths:
+        key = _path_key(path)
+        hashes[key] = known.get(key) or hash_file(path)
+    return hashes
+
+
+def stat_files(paths: list[Path]) -> dict[str, list[int]]:
+    """
+    Bepaalt de wijzigingstijd en grootte van een lijst bestanden, zonder ze te lezen.
+
+    Args:
+        paths (list[Path]): De bestanden.
+
+    Returns:
+        dict[str, list[int]]: Per bestandspad de wijzigingstijd in ns en de grootte in bytes.
+    """
+    stats = {}
+    for path in paths:
+        stat = os.stat(path)
+        stats[_path_key(path)] = [stat.st_mtime_ns, stat.st_size]
+    return stats
+
+
+def diff(hashes_old: dict[str, str], hashes_new: dict[str, str]) -> dict[str, list[str]]:
+    """
+    Vergelijkt twee verzamelingen bestandshashes.
+
+    Args:
+        hashes_old (dict[str, str]): De eerder vastgelegde hashes per bestandspad.
+        hashes_new (dict[str, str]): De huidige hashes per bestandspad.
+
+    Returns:
+        dict[str, list[str]]: De gesorteerde bestandspaden onder 'added', 'changed' en 'removed'.
+    """
+    return {
+        "added": sorted(set(hashes_new) - set(hashes_old)),
+        "changed": sorted(key for key in hashes_new.keys() & hashes_old.keys() if hashes_new[key] != hashes_old[key]),
+        "removed": sorted(set(hashes_old) - set(hashes_new)),
+    }
+
+
+def _path_key(path: Path) -> str:
+    """
+    Geeft een stabiele sleutel voor een bestandspad, ongeacht of het absoluut of relatief is opgegeven.
+    """
+    try:
+        return Path(os.path.relpath(path)).as_posix()
+    except ValueError:  # Ander station op Windows
+        return Path(path).resolve().as_posix()
+
+
+def combine(hashes: dict) -> str:
+    """
+    Combineert een (geneste) dictionary met hashes tot één stabiele hash.
+
+    Args:
+        hashes (dict): Sleutels met hashes of geneste dictionaries met hashes.
+
+    Returns:
+        str: De gecombineerde hexadecimale hash.
+    """
+    sha = hashlib.sha256()
+    for key in sorted(hashes):
+        value = hashes[key]
+        value = combine(value) if isinstance(value, dict) else value
+        sha.update(f"{key}={value}\n".encode("utf-8"))
+    return sha.hexdigest()
@@ -63,6 +63,26 @@ class GeneratorConfig(BaseConfigComponent):
         self.create_dir(folder)
         return folder
 
+    @property
+    def dir_templates(self) -> Path:
+        """
+        Geeft het pad naar de map met templates voor het gekozen platform.
+
+        Returns:
+            Path: Het pad naar de map met templates.
+        """
+        return self._data.dir_templates
+
+    @property
+    def dir_scripts_mdde(self) -> Path:
+        """
+        Geeft het pad naar de map met MDDE scripts voor de generator.
+
+        Returns:
+            Path: Het pad naar de map met MDDE scripts.
+        """
+        return self._data.dir_scripts_mdde
+
     @property
     def template_platform(self) -> str:
         """
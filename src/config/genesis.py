@@ -1,19 +1,27 @@
+import json
 import os
-from dataclasses import dataclass, field, fields, is_dataclass, MISSING
+import tempfile
+from dataclasses import asdict, dataclass, field, fields, is_dataclass, MISSING
 from io import StringIO
 from pathlib import Path
 from typing import Any
 
 import yaml
+from dacite import Config, DaciteError, from_dict
 from logtools import get_logger
 
-from .base import BaseConfigApplication
+from .base import BaseConfigApplication, ConfigFileError
+from .content_store import ContentStore
 from .deploy_mdde import DeploymentMDDEConfig, DeploymentMDDEConfigData
 from .devops import DevOpsConfig, DevOpsConfigData
 from .extractor import ExtractorConfig, ExtractorConfigData
+from .fingerprint import combine, diff, hash_data, hash_files, list_files, stat_files
+from .stage_cache import StageCache
 from .integrator import IntegratorConfig, IntegratorConfigData
 from .generator import GeneratorConfig, GeneratorConfigData
 from .power_designer import PowerDesignerConfig, PowerDesignerConfigData
+from .retention import RetentionConfig, RetentionConfigData
+from .version_allocator import VersionAllocator, parse_version
 
 logger = get_logger(name =__name__,  dir_output = '.', base_file = 'log_genesis.json')
 
@@ -29,6 +37,7 @@ class GenesisConfigData:
     title: str
     folder_intermediate_root: str
     ignore_warnings: bool = False
+    deduplicate_output: bool = False
     power_designer: PowerDesignerConfigData = field(
         default_factory=PowerDesignerConfigData
     )
@@ -39,16 +48,24 @@ class GenesisConfigData:
     deployment_mdde: DeploymentMDDEConfigData = field(
         default_factory=DeploymentMDDEConfigData
     )
+    retention: RetentionConfigData = field(default_factory=RetentionConfigData)
 
 
 class GenesisConfig(BaseConfigApplication[GenesisConfigData]):
     CONFIG_DATACLASS = GenesisConfigData
+    FILE_FINGERPRINT = ".fingerprint.json"
     """
     Beheert de volledige applicatieconfiguratie voor Genesis en laadt deze uit een YAML-bestand.
     Biedt toegang tot alle deelconfiguraties, paden en hulpfuncties voor het werken met configuratiebestanden.
     """
 
-    def __init__(self, file_config: str, create_version_dir: True):
+    def __init__(
+        self,
+        file_config: str,
+        create_version_dir: True,
+        version: str | None = None,
+        data: GenesisConfigData | None = None,
+    ):
         """
         Initialiseert de GenesisConfig met een configuratiebestand en optioneel het aanmaken van een versie-directory.
         Laadt de configuratiegegevens, stelt de relevante paden en deelconfiguraties in, en bepaalt de volgende versie.
@@ -56,14 +73,28 @@ class GenesisConfig(BaseConfigApplication[GenesisConfigData]):
         Args:
             file_config (str): Het pad naar het configuratiebestand.
             create_version_dir (bool): Of de versie-directory moet worden aangemaakt.
+            version (str | None): Een bestaande versie die hervat wordt in plaats van een nieuwe versie.
+            data (GenesisConfigData | None): Al gevalideerde configuratiegegevens; het bestand wordt dan niet gelezen.
+
+        Raises:
+            ConfigFileError: Als de te hervatten versie geen geldige versienaam is of niet bestaat.
         """
         self._file = Path(file_config)
-        data = self._read_file()
+        data = data if data is not None else self._read_file()
+        self._data = data
         self.create_version_dir = create_version_dir
         self.folder_intermediate_root = data.folder_intermediate_root
         self.title = data.title
         self.ignore_warnings = data.ignore_warnings
-        self._version = self._determine_next_version()
+        self.deduplicate_output = data.deduplicate_output
+        if version is not None:
+            if parse_version(version) is None:
+                raise ConfigFileError(f"'{version}' is geen geldige versienaam.", 400)
+            if not (Path(self.folder_intermediate_root) / self.title / version).is_dir():
+                raise ConfigFileError(f"Versie '{version}' van '{self.title}' bestaat niet en kan niet worden hervat.", 404)
+            self._version = version
+        else:
+            self._version = self._determine_next_version()
         self.power_designer = PowerDesignerConfig(data.power_designer)
         self.extractor = ExtractorConfig(
             data.extractor, path_intermediate=self.path_intermediate
@@ -80,36 +111,315 @@ class GenesisConfig(BaseConfigApplication[GenesisConfigData]):
         self.devops = DevOpsConfig(
             data.devops, path_output_root=data.folder_intermediate_root
         )
+        self.retention = RetentionConfig(
+            data.retention, path_root=Path(self.folder_intermediate_root) / self.title
+        )
+
+    def write_snapshot(self) -> str:
+        """
+        Schrijft de gevalideerde configuratie en de bepaalde versie naar een tijdelijk bestand.
+
+        Een kindproces kan hiermee via from_snapshot() exact deze configuratie gebruiken, zonder
+        het YAML-bestand opnieuw te lezen en te valideren.
+
+        Returns:
+            str: Het pad naar het tijdelijke snapshotbestand.
+        """
+        fd, path_snapshot = tempfile.mkstemp(prefix="genesis_", suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"file_config": str(self._file), "version": self._version, "data": asdict(self._data)}, f)
+        return path_snapshot
+
+    @classmethod
+    def from_snapshot(cls, path_snapshot: str) -> "GenesisConfig":
+        """
+        Maakt een GenesisConfig aan uit een snapshot van write_snapshot() en verwijdert het snapshotbestand.
+
+        De versie uit de snapshot is al door het ouderproces gereserveerd en wordt overgenomen.
+
+        Args:
+            path_snapshot (str): Het pad naar het snapshotbestand.
+
+        Returns:
+            GenesisConfig: De configuratie zoals die bij het aanmaken van de snapshot was.
+
+        Raises:
+            ConfigFileError: Als de snapshot ontbreekt of onleesbaar is.
+        """
+        try:
+            with open(path_snapshot, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            os.remove(path_snapshot)
+            data = from_dict(data_class=cls.CONFIG_DATACLASS, data=snapshot["data"], config=Config(strict=True))
+        except (OSError, ValueError, KeyError, DaciteError) as e:
+            raise ConfigFileError(f"Configuratiesnapshot '{path_snapshot}' is onleesbaar: {e}", 104) from e
+        return cls(
+            file_config=snapshot["file_config"],
+            create_version_dir=True,
+            version=snapshot["version"],
+            data=data,
+        )
 
     def _determine_next_version(self) -> str:
         """
-        Bepaalt de volgende versienaam voor de outputfolder op basis van bestaande versies.
-        Zoekt naar bestaande versiemappen en verhoogt het patch-nummer, of start bij de standaardversie als er geen zijn.
+        Bepaalt de volgende versienaam voor de outputfolder via de versie-index van de titelmap.
+        Als de versie-directory moet worden aangemaakt wordt de versie atomair gereserveerd, anders
+        wordt alleen de volgende versie opgevraagd.
 
         Returns:
             str: De volgende versienaam in het formaat 'vXX.XX.XX'.
         """
-        version = "v00.01.00"
-        folder = Path(
-            os.path.join(
-                self.folder_intermediate_root,
-                self.title,
-            )
-        )
-        if folder.exists():
-            if lst_versions := [
-                version for version in folder.iterdir() if version.is_dir()
-            ]:
-                # Extract version numbers, sort them, and increment the latest
-                versions = sorted(
-                    [v.name for v in lst_versions if v.name.startswith("v")],
-                    key=lambda s: list(map(int, s[1:].split("."))),
-                )
-                latest_version = versions[-1]
-                major, minor, patch = map(int, latest_version[1:].split("."))
-                patch += 1
-                version = f"v{major:02}.{minor:02}.{patch:02}"
-        return version
+        allocator = VersionAllocator(Path(self.folder_intermediate_root) / self.title)
+        if self.create_version_dir:
+            return allocator.allocate()
+        return allocator.peek()
+
+    def input_files(self) -> dict[str, list[Path]]:
+        """
+        Geeft alle gedeclareerde invoerbestanden van een run, gegroepeerd per soort invoer.
+
+        Returns:
+            dict[str, list[Path]]: Per groep ('config', 'power_designer', 'templates', 'mdde_scripts', 'codelists') de bestanden.
+
+        Raises:
+            ConfigFileError: Als een of meer PowerDesigner-bestanden ontbreken.
+        """
+        return {
+            "config": [self._file],
+            "power_designer": self.power_designer.files,
+            "templates": list_files(self.generator.dir_templates),
+            "mdde_scripts": list_files(self.generator.dir_scripts_mdde),
+            "codelists": list_files(self.deploy_mdde.path_data_input),
+        }
+
+    def fingerprint(self, recorded: dict | None = None) -> dict:
+        """
+        Bepaalt de vingerafdruk van een run op basis van de hashes van alle gedeclareerde invoer.
+
+        Als een eerder vastgelegde vingerafdruk wordt meegegeven, worden bestanden waarvan de
+        wijzigingstijd en grootte niet zijn veranderd niet opnieuw gelezen maar wordt de vastgelegde hash gebruikt.
+
+        Voor het configuratiebestand wordt de gevalideerde configuratie gehasht in plaats van het bestand,
+        zodat een run vanuit een snapshot de configuratie van het startmoment vastlegt, ook als het
+        bestand daarna nog is gewijzigd.
+
+        Args:
+            recorded (dict | None): Een eerder vastgelegde vingerafdruk, zoals gelezen met read_fingerprint().
+
+        Returns:
+            dict: De gecombineerde hash onder 'digest', de hashes per groep en bestand onder 'inputs'
+            en de wijzigingstijd en grootte per groep en bestand onder 'stats'.
+        """
+        recorded = recorded or {}
+        inputs, stats = {}, {}
+        for group, paths in self.input_files().items():
+            stats[group] = stat_files(paths)
+            if group == "config":
+                inputs[group] = {key: hash_data(asdict(self._data)) for key in stats[group]}
+                continue
+            hashes_recorded = recorded.get("inputs", {}).get(group, {})
+            stats_recorded = recorded.get("stats", {}).get(group, {})
+            known = {
+                key: hash_recorded
+                for key, hash_recorded in hashes_recorded.items()
+                if stats_recorded.get(key) == stats[group].get(key)
+            }
+            inputs[group] = hash_files(paths, known=known)
+        return {"digest": combine(inputs), "inputs": inputs, "stats": stats}
+
+    def stage_keys(self, fingerprint: dict) -> dict[str, dict[str, str]]:
+        """
+        Bepaalt de invoersleutel per pipelinestap en per eenheid binnen een stap.
+
+        De extractor heeft een eenheid per PowerDesigner-model, zodat een wijziging in één model alleen
+        dat model opnieuw laat extraheren. Elke volgende stap hangt af van de sleutels van de vorige stap,
+        de eigen instellingen en de eigen invoerbestanden.
+
+        Args:
+            fingerprint (dict): De vingerafdruk van de run, zoals bepaald door fingerprint().
+
+        Returns:
+            dict[str, dict[str, str]]: Per stap (in uitvoervolgorde) de sleutel per eenheid; een lege
+            eenheidsnaam betekent dat de stap als geheel wordt uitgevoerd.
+        """
+        inputs = fingerprint["inputs"]
+        settings_extractor = asdict(self.extractor._data)
+        settings_extractor.pop("workers")  # Beïnvloedt de uitvoer niet
+        settings_extractor = combine({"extractor": json.dumps(settings_extractor, sort_keys=True)})
+        keys_extractor = {
+            Path(path_model).name: combine({"model": hash_model, "settings": settings_extractor})
+            for path_model, hash_model in inputs["power_designer"].items()
+        }
+        key_integrator = combine({
+            "extractor": keys_extractor,
+            "settings": json.dumps(asdict(self.integrator._data), sort_keys=True),
+        })
+        key_generator = combine({
+            "integrator": key_integrator,
+            "templates": inputs["templates"],
+            "settings": json.dumps(asdict(self.generator._data), sort_keys=True),
+        })
+        key_deploy_mdde = combine({
+            "generator": key_generator,
+            "mdde_scripts": inputs["mdde_scripts"],
+            "codelists": inputs["codelists"],
+            "settings": json.dumps(asdict(self.deploy_mdde._data), sort_keys=True),
+        })
+        return {
+            "extractor": keys_extractor,
+            "integrator": {"": key_integrator},
+            "generator": {"": key_generator},
+            "deploy_mdde": {"": key_deploy_mdde},
+        }
+
+    def find_latest_success(self) -> tuple[str, dict] | None:
+        """
+        Zoekt de nieuwste succesvol afgeronde versie.
+
+        Returns:
+            tuple[str, dict] | None: De versienaam en de vastgelegde vingerafdruk, of None als er geen is.
+        """
+        for version in VersionAllocator(Path(self.folder_intermediate_root) / self.title).versions():
+            fingerprint = self.read_fingerprint(version)
+            if fingerprint and fingerprint.get("status") == "success":
+                return version, fingerprint
+        return None
+
+    def plan(self) -> dict:
+        """
+        Bepaalt zonder iets uit te voeren wat een volgende run opnieuw zou genereren.
+
+        Vergelijkt de huidige invoer met de vingerafdruk van de nieuwste succesvolle versie en de
+        invoersleutel per eenheid met de sleutels die in die versie zijn vastgelegd. Alleen gewijzigde
+        bestanden worden gelezen.
+
+        Returns:
+            dict: De vergeleken versie onder 'version' (None als er nog geen is), per invoergroep de
+            toegevoegde, gewijzigde en verwijderde bestanden onder 'files', en per stap de eenheden
+            die opnieuw ('stale') of niet opnieuw ('fresh') uitgevoerd worden onder 'stages'.
+
+        Raises:
+            ConfigFileError: Als een of meer PowerDesigner-bestanden ontbreken.
+        """
+        version, recorded = self.find_latest_success() or (None, None)
+        fingerprint = self.fingerprint(recorded)
+        inputs_recorded = recorded.get("inputs", {}) if recorded else {}
+        files = {
+            group: diff(inputs_recorded.get(group, {}), hashes)
+            for group, hashes in fingerprint["inputs"].items()
+        }
+        cache = StageCache(Path(self.folder_intermediate_root) / self.title / version) if version else None
+        stages = {}
+        for stage, keys in self.stage_keys(fingerprint).items():
+            stale = [unit for unit, key in keys.items() if cache is None or cache.recorded_key(stage, unit) != key]
+            stages[stage] = {"stale": stale, "fresh": [unit for unit in keys if unit not in stale]}
+        return {"version": version, "digest": fingerprint["digest"], "files": files, "stages": stages}
+
+    @staticmethod
+    def stage_key(keys: dict[str, str] | None) -> str | None:
+        """
+        Combineert de sleutels van alle eenheden van een stap tot één sleutel voor de voltooiingsmarkering.
+
+        Args:
+            keys (dict[str, str] | None): De sleutel per eenheid, zoals bepaald door stage_keys().
+
+        Returns:
+            str | None: De sleutel van de stap, of None als er geen sleutels zijn.
+        """
+        return combine(keys) if keys else None
+
+    def find_resumable_version(self) -> str | None:
+        """
+        Zoekt de nieuwste versie die niet succesvol is afgerond maar waarvan al stappen voltooid zijn.
+
+        Returns:
+            str | None: De versienaam, of None als er niets te hervatten is.
+        """
+        path_root = Path(self.folder_intermediate_root) / self.title
+        versions = VersionAllocator(path_root).versions()
+        if not versions:
+            return None
+        version = versions[0]
+        fingerprint = self.read_fingerprint(version)
+        if fingerprint and fingerprint.get("status") == "success":
+            return None
+        if StageCache(path_root / version).stages_complete():
+            return version
+        return None
+
+    @property
+    def stage_cache(self) -> StageCache:
+        """
+        Geeft de cache van uitvoer per pipelinestap voor de versiemap van deze run.
+        Bij ingeschakeld ontdubbelen worden bestanden gelinkt in plaats van gekopieerd.
+
+        Returns:
+            StageCache: De stapcache.
+        """
+        return StageCache(self.path_intermediate, link=self.deduplicate_output)
+
+    def running(self):
+        """
+        Houdt de runlock op de versiemap van deze run vast, zodat het bewaarbeleid de versie niet verwijdert.
+
+        Returns:
+            De contextmanager die de lock vasthoudt zolang de run loopt.
+        """
+        return VersionAllocator(Path(self.folder_intermediate_root) / self.title).run_lock(self._version)
+
+    def discard_version(self) -> None:
+        """
+        Verwijdert de lege versiemap van deze run en haalt de versie uit de versie-index.
+
+        Raises:
+            OSError: Als de versiemap niet leeg is of niet verwijderd kan worden.
+        """
+        self.path_intermediate.rmdir()
+        VersionAllocator(Path(self.folder_intermediate_root) / self.title).release(self._version)
+
+    def write_fingerprint(self, fingerprint: dict, status: str = "success") -> None:
+        """
+        Legt de vingerafdruk van een run vast in de versiemap van deze run.
+
+        Args:
+            fingerprint (dict): De vingerafdruk zoals bepaald bij de start van de run.
+            status (str): De afloop van de run.
+        """
+        with open(self.path_intermediate / self.FILE_FINGERPRINT, "w", encoding="utf-8") as f:
+            json.dump({"version": self._version, "status": status, **fingerprint}, f)
+
+    def read_fingerprint(self, version: str) -> dict | None:
+        """
+        Leest de vastgelegde vingerafdruk van een eerdere versie.
+
+        Args:
+            version (str): De versienaam.
+
+        Returns:
+            dict | None: De vingerafdruk, of None als die ontbreekt of onleesbaar is.
+        """
+        path = Path(self.folder_intermediate_root) / self.title / version / self.FILE_FINGERPRINT
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def find_version_with_fingerprint(self, digest: str) -> str | None:
+        """
+        Zoekt de nieuwste succesvolle versie die met exact dezelfde invoer is gemaakt.
+
+        Args:
+            digest (str): De gecombineerde hash van de invoer.
+
+        Returns:
+            str | None: De versienaam, of None als er geen overeenkomende versie is.
+        """
+        for version in VersionAllocator(Path(self.folder_intermediate_root) / self.title).versions():
+            fingerprint = self.read_fingerprint(version)
+            if fingerprint and fingerprint.get("status") == "success" and fingerprint.get("digest") == digest:
+                return version
+        return None
 
     def _config_to_yaml_with_comments(
         self, config_dataclass: Any, field_comments: dict, indent=0
@@ -165,6 +475,7 @@ class GenesisConfig(BaseConfigApplication[GenesisConfigData]):
             "title": "De naam van de huidige uitvoering (bijv. 'dry-run')",
             "folder_intermediate_root": "Basis-map waar tussenresultaten worden opgeslagen",
             "ignore-warnings": "Negeert waarschuwingen voor non-interactieve runs",
+            "deduplicate_output": "Deelt identieke bestanden tussen versies via hardlinks",
             "power_designer": "Instellingen voor PowerDesigner LDM-bestanden",
             "folder": "Submap binnen de root waar PowerDesigner bestanden staan",
             "files": "Lijst van PowerDesigner .ldm-bestanden",
@@ -174,6 +485,10 @@ class GenesisConfig(BaseConfigApplication[GenesisConfigData]):
             "publisher": "Instellingen voor publicatie van scripts",
             "devops": "DevOps instellingen zoals werkitems en branch",
             "work_item_description": "Omschrijving van het DevOps werkitem",
+            "retention": "Bewaarbeleid voor oude versies van de tussenresultaten",
+            "keep_last": "Aantal meest recente versies dat altijd bewaard blijft",
+            "keep_days": "Versies jonger dan dit aantal dagen blijven bewaard",
+            "max_size_mb": "Maximale totale grootte van alle versies in MB",
         }
         example_config = GenesisConfigData()
         yaml_with_comments = self._config_to_yaml_with_comments(
@@ -196,6 +511,19 @@ class GenesisConfig(BaseConfigApplication[GenesisConfigData]):
             folder.mkdir(parents=True, exist_ok=True)
         return folder
 
+    @property
+    def content_store(self) -> ContentStore | None:
+        """
+        Geeft de content-addressed opslag voor het ontdubbelen van de tussenresultaten.
+        De opslag staat in de basis-map, zodat de hardlinks op hetzelfde bestandssysteem blijven.
+
+        Returns:
+            ContentStore | None: De opslag, of None als ontdubbelen niet is ingeschakeld.
+        """
+        if not self.deduplicate_output:
+            return None
+        return ContentStore(Path(self.folder_intermediate_root) / ContentStore.DIR_STORE)
+
     @property
     def path_intermediate_root(self) -> Path:
         """
@@ -1,4 +1,3 @@
-import os
 from dataclasses import dataclass, field, fields, is_dataclass, MISSING
 from io import StringIO
 from pathlib import Path
@@ -10,6 +9,7 @@ from logtools import get_logger
 from .base import BaseConfigApplication
 from .deploy_mdde import DeploymentMDDEConfig, DeploymentMDDEConfigData
 from .devops import DevOpsConfig, DevOpsConfigData
+from .version_allocator import VersionAllocator
 
 logger = get_logger(name =__name__,  dir_output = '.', base_file = 'log_morningstar.json')
 
@@ -68,33 +68,12 @@ class MorningstarConfig(BaseConfigApplication[MorningstarConfigData]):
 
     def _determine_version(self) -> str:
         """
-        Bepaalt de volgende versienaam voor de outputfolder op basis van bestaande versies.
-        Zoekt naar bestaande versiemappen en verhoogt het patch-nummer, of start bij de standaardversie als er geen zijn.
+        Reserveert atomair de volgende versienaam voor de outputfolder via de versie-index van de titelmap.
 
         Returns:
             str: De volgende versienaam in het formaat 'vXX.XX.XX'.
         """
-        version = "v00.01.00"
-        folder = Path(
-            os.path.join(
-                self.folder_intermediate_root,
-                self.title,
-            )
-        )
-        if folder.exists():
-            if lst_versions := [
-                version for version in folder.iterdir() if version.is_dir()
-            ]:
-                # Extract version numbers, sort them, and increment the latest
-                versions = sorted(
-                    [v.name for v in lst_versions if v.name.startswith("v")],
-                    key=lambda s: list(map(int, s[1:].split("."))),
-                )
-                latest_version = versions[-1]
-                major, minor, patch = map(int, latest_version[1:].split("."))
-                patch += 1
-                version = f"v{major:02}.{minor:02}.{patch:02}"
-        return version
+        return VersionAllocator(Path(self.folder_intermediate_root) / self.title).allocate()
 
     def _config_to_yaml_with_comments(
         self, config_dataclass: Any, field_comments: dict, indent=0
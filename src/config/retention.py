@@ -0,0 +1,237 @@
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from logtools import get_logger
+
+from .base import BaseConfigComponent
+from .version_allocator import VersionAllocator, parse_version
+
+logger = get_logger(name =__name__,  dir_output = '.', base_file = 'log_genesis.json')
+
+
+@dataclass
+class RetentionConfigData:
+    """Configuration settings for the retention of intermediate output versions.
+
+    Specifies how many versions to keep, the minimum age before a version may be removed and the maximum total size.
+    A value of None disables the corresponding rule.
+    """
+
+    keep_last: int | None = None
+    keep_days: float | None = None
+    max_size_mb: float | None = None
+
+
+class RetentionConfig(BaseConfigComponent):
+    """
+    Beheert het bewaarbeleid en de schijfboekhouding van de versiemappen onder '<folder_intermediate_root>/<title>'.
+
+    De grootte per versiemap wordt bijgehouden in een indexbestand. Een versie wordt alleen opnieuw
+    gemeten als deze nog niet in de index staat, als de wijzigingstijd van de map afwijkt of als het
+    de laatst uitgedeelde versie is (die kan nog door een run worden gevuld).
+
+    Bestanden met meerdere hardlinks (zie ContentStore) worden per versie apart bijgehouden, zodat
+    een bestand dat meerdere versies delen in het totaal maar één keer meetelt.
+    """
+
+    FILE_SIZES = ".sizes.json"
+
+    def __init__(self, config: RetentionConfigData, path_root: Path):
+        """
+        Initialiseert een RetentionConfig met de opgegeven configuratie en titelmap.
+
+        Args:
+            config (RetentionConfigData): De bewaarbeleid configuratiegegevens.
+            path_root (Path): De map '<folder_intermediate_root>/<title>' met de versiemappen.
+        """
+        super().__init__(config)
+        self.path_root = Path(path_root)
+        self.path_sizes = self.path_root / self.FILE_SIZES
+
+    @staticmethod
+    def _dir_size(path: Path) -> tuple[int, int, dict[str, int]]:
+        """
+        Telt de grootte en het aantal bestanden in een map, zonder symbolische links te volgen.
+
+        Een bestand met meerdere hardlinks telt binnen de map één keer mee.
+
+        Args:
+            path (Path): De map die gemeten wordt.
+
+        Returns:
+            tuple[int, int, dict[str, int]]: Het totaal aantal bytes, het aantal bestanden en de grootte
+            van de bestanden met meerdere hardlinks per '<st_dev>:<st_ino>'.
+        """
+        size, count, shared = 0, 0, {}
+        stack = [path]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                            continue
+                        stat = entry.stat(follow_symlinks=False)
+                        count += 1
+                        if stat.st_nlink > 1:
+                            key = f"{stat.st_dev}:{stat.st_ino}"
+                            if key in shared:
+                                continue
+                            shared[key] = stat.st_size
+                        size += stat.st_size
+            except OSError:
+                continue
+        return size, count, shared
+
+    @staticmethod
+    def _size_unique(usage: dict[str, dict], versions) -> int:
+        """
+        Telt de grootte van een aantal versies op, met gedeelde bestanden één keer.
+
+        Args:
+            usage (dict[str, dict]): De schijfboekhouding per versie.
+            versions: De versienamen die meetellen.
+
+        Returns:
+            int: De totale grootte in bytes.
+        """
+        size, shared = 0, {}
+        for version in versions:
+            shared_version = usage[version].get("shared", {})
+            size += usage[version]["size"] - sum(shared_version.values())
+            shared.update(shared_version)
+        return size + sum(shared.values())
+
+    def _read_sizes(self) -> dict:
+        """
+        Leest de grootte-index in; een ontbrekende of onleesbare index levert een lege dictionary op.
+        """
+        try:
+            with open(self.path_sizes, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_sizes(self, sizes: dict) -> None:
+        """
+        Schrijft de grootte-index atomair weg.
+        """
+        path_tmp = self.path_sizes.with_name(f"{self.FILE_SIZES}.{os.getpid()}.tmp")
+        try:
+            with open(path_tmp, "w", encoding="utf-8") as f:
+                json.dump(sizes, f)
+            os.replace(path_tmp, self.path_sizes)
+        except OSError as e:
+            logger.warning(f"Grootte-index '{self.path_sizes}' kon niet worden opgeslagen: {e}")
+
+    def usage(self) -> dict[str, dict]:
+        """
+        Geeft de schijfboekhouding per versiemap terug en werkt de grootte-index incrementeel bij.
+
+        Returns:
+            dict[str, dict]: Per versienaam de grootte in bytes ('size'), het aantal bestanden ('files'),
+            de wijzigingstijd van de map ('mtime_ns'), het tijdstip van meten ('measured') en de bestanden
+            met meerdere hardlinks ('shared', zie _dir_size()).
+        """
+        if not self.path_root.exists():
+            return {}
+        sizes_cached = self._read_sizes()
+        latest = VersionAllocator(self.path_root).latest()
+        sizes = {}
+        for entry in os.scandir(self.path_root):
+            if not entry.is_dir() or parse_version(entry.name) is None:
+                continue
+            mtime_ns = entry.stat().st_mtime_ns
+            cached = sizes_cached.get(entry.name)
+            if cached and "shared" in cached and cached["mtime_ns"] == mtime_ns and entry.name != latest:
+                sizes[entry.name] = cached
+                continue
+            size, count, shared = self._dir_size(Path(entry.path))
+            sizes[entry.name] = {
+                "size": size, "files": count, "mtime_ns": mtime_ns, "measured": time.time(), "shared": shared
+            }
+        if sizes != sizes_cached:
+            self._write_sizes(sizes)
+        return sizes
+
+    def total_size(self) -> int:
+        """
+        Geeft de totale grootte van alle versiemappen in bytes; gedeelde bestanden tellen één keer mee.
+
+        Returns:
+            int: De totale grootte in bytes.
+        """
+        usage = self.usage()
+        return self._size_unique(usage, usage)
+
+    def versions_to_prune(self, usage: dict[str, dict] | None = None) -> list[str]:
+        """
+        Bepaalt welke versies volgens het bewaarbeleid verwijderd moeten worden.
+
+        Een versie blijft bewaard als ze bij de laatste 'keep_last' versies hoort of jonger is dan
+        'keep_days' dagen. Als geen van beide regels is ingesteld wordt op deze grond niets verwijderd.
+        Daarna worden de oudste resterende versies verwijderd zolang de totale grootte boven
+        'max_size_mb' ligt. De nieuwste versie en versies waarin nog een run bezig is worden nooit verwijderd.
+
+        Args:
+            usage (dict[str, dict] | None): De schijfboekhouding per versie, of None om die te bepalen.
+
+        Returns:
+            list[str]: De te verwijderen versienamen, oudste eerst.
+        """
+        usage = self.usage() if usage is None else usage
+        versions = sorted(usage, key=parse_version, reverse=True)
+        if len(versions) <= 1:
+            return []
+        allocator = VersionAllocator(self.path_root)
+        running = {version for version in versions[1:] if allocator.is_running(version)}
+
+        keep_last, keep_days, max_size_mb = self._data.keep_last, self._data.keep_days, self._data.max_size_mb
+        prune = set()
+        if keep_last is not None or keep_days is not None:
+            threshold = time.time() - keep_days * 86400 if keep_days is not None else None
+            for i, version in enumerate(versions[1:], start=1):
+                keep = (keep_last is not None and i < keep_last) or (
+                    threshold is not None and usage[version]["mtime_ns"] / 1e9 >= threshold
+                )
+                if not keep and version not in running:
+                    prune.add(version)
+        if max_size_mb is not None:
+            size_max = max_size_mb * 1024 * 1024
+            for version in reversed(versions[1:]):
+                if self._size_unique(usage, [v for v in versions if v not in prune]) <= size_max:
+                    break
+                if version not in running:
+                    prune.add(version)
+        return sorted(prune, key=parse_version)
+
+    def prune(self) -> list[str]:
+        """
+        Verwijdert de versiemappen die volgens het bewaarbeleid niet bewaard hoeven te worden.
+
+        Returns:
+            list[str]: De verwijderde versienamen.
+        """
+        usage = self.usage()
+        allocator = VersionAllocator(self.path_root)
+        pruned = []
+        for version in self.versions_to_prune(usage):
+            if allocator.is_running(version):  # Net gestart, bijvoorbeeld om te hervatten
+                logger.info(f"Versie '{version}' in '{self.path_root}' overgeslagen: er loopt een run.")
+                continue
+            try:
+                shutil.rmtree(self.path_root / version)
+            except OSError as e:
+                logger.warning(f"Versie '{version}' in '{self.path_root}' kon niet worden verwijderd: {e}")
+                continue
+            allocator.release(version)
+            usage.pop(version)
+            pruned.append(version)
+            logger.info(f"Versie '{version}' in '{self.path_root}' verwijderd volgens bewaarbeleid.")
+        if pruned:
+            self._write_sizes(usage)
+        return pruned
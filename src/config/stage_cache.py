@@ -0,0 +1,227 @@
+import json
+import os
+import shutil
+from pathlib import Path
+
+from logtools import get_logger
+
+from .version_allocator import VersionAllocator
+
+logger = get_logger(name =__name__,  dir_output = '.', base_file = 'log_genesis.json')
+
+
+class StageCache:
+    """
+    Cache van de uitvoer per pipelinestap (en per eenheid binnen een stap, zoals één model).
+
+    Na het uitvoeren van een eenheid wordt in de versiemap een manifest vastgelegd met de invoersleutel
+    en de bestanden die de eenheid heeft aangemaakt. Bij een volgende run wordt eerst in de eerdere
+    versies gezocht naar een manifest met dezelfde sleutel; de bestanden daarvan worden dan naar de
+    nieuwe versie gekopieerd (of gelinkt) in plaats van opnieuw berekend.
+
+    Een volledig afgeronde stap krijgt daarnaast een voltooiingsmarkering met de invoersleutel van
+    de stap, zodat een afgebroken run vanaf de eerste onvoltooide stap hervat kan worden.
+    """
+
+    DIR_MANIFESTS = ".stages"
+    SUFFIX_COMPLETE = ".done"
+
+    def __init__(self, path_intermediate: Path, link: bool = False):
+        """
+        Initialiseert de StageCache voor de versiemap van de huidige run.
+
+        Args:
+            path_intermediate (Path): De versiemap van de huidige run.
+            link (bool): Of bestanden via hardlinks in plaats van kopieën worden doorgezet.
+        """
+        self.path_intermediate = Path(path_intermediate)
+        self.link = link
+
+    @staticmethod
+    def _name_manifest(stage: str, unit: str) -> str:
+        """
+        Geeft de bestandsnaam van het manifest van een eenheid.
+        """
+        return f"{stage}__{unit}.json" if unit else f"{stage}.json"
+
+    def _path_manifest(self, path_version: Path, stage: str, unit: str) -> Path:
+        """
+        Geeft het pad van het manifest van een eenheid in een versiemap.
+        """
+        return path_version / self.DIR_MANIFESTS / self._name_manifest(stage, unit)
+
+    def _read_manifest(self, path_version: Path, stage: str, unit: str) -> dict | None:
+        """
+        Leest het manifest van een eenheid in een versiemap, of None als het ontbreekt of onleesbaar is.
+        """
+        try:
+            with open(self._path_manifest(path_version, stage, unit), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _path_marker(self, stage: str) -> Path:
+        """
+        Geeft het pad van de voltooiingsmarkering van een stap in de versiemap.
+        """
+        return self.path_intermediate / self.DIR_MANIFESTS / f"{stage}{self.SUFFIX_COMPLETE}"
+
+    def mark_complete(self, stage: str, key: str | None) -> None:
+        """
+        Legt vast dat een stap in deze versie volledig is afgerond.
+
+        Args:
+            stage (str): De naam van de pipelinestap.
+            key (str | None): De invoersleutel van de stap, of None als die niet bepaald kon worden.
+        """
+        path_marker = self._path_marker(stage)
+        path_marker.parent.mkdir(parents=True, exist_ok=True)
+        with open(path_marker, "w", encoding="utf-8") as f:
+            json.dump({"stage": stage, "key": key}, f)
+
+    def is_complete(self, stage: str, key: str | None) -> bool:
+        """
+        Controleert of een stap in deze versie is afgerond met dezelfde invoersleutel.
+
+        Args:
+            stage (str): De naam van de pipelinestap.
+            key (str | None): De huidige invoersleutel van de stap.
+
+        Returns:
+            bool: True als de stap niet opnieuw uitgevoerd hoeft te worden.
+        """
+        try:
+            with open(self._path_marker(stage), encoding="utf-8") as f:
+                marker = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return marker.get("key") == key
+
+    def stages_complete(self) -> list[str]:
+        """
+        Geeft de stappen die in deze versie een voltooiingsmarkering hebben.
+
+        Returns:
+            list[str]: De namen van de afgeronde stappen.
+        """
+        path_manifests = self.path_intermediate / self.DIR_MANIFESTS
+        if not path_manifests.is_dir():
+            return []
+        return sorted(path.stem for path in path_manifests.glob(f"*{self.SUFFIX_COMPLETE}"))
+
+    def recorded_key(self, stage: str, unit: str) -> str | None:
+        """
+        Geeft de invoersleutel waarmee een eenheid in deze versiemap is uitgevoerd.
+
+        Args:
+            stage (str): De naam van de pipelinestap.
+            unit (str): De naam van de eenheid binnen de stap, of een lege string.
+
+        Returns:
+            str | None: De vastgelegde sleutel, of None als de eenheid hier niet is uitgevoerd.
+        """
+        manifest = self._read_manifest(self.path_intermediate, stage, unit)
+        return manifest.get("key") if manifest else None
+
+    def list_files(self) -> dict[str, int]:
+        """
+        Geeft alle uitvoerbestanden in de versiemap met hun wijzigingstijd, zonder de manifesten.
+
+        Returns:
+            dict[str, int]: Per relatief pad (met '/' als scheidingsteken) de wijzigingstijd in ns.
+        """
+        files = {}
+        stack = [self.path_intermediate]
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(Path(entry.path))
+                    else:
+                        path_rel = Path(entry.path).relative_to(self.path_intermediate).as_posix()
+                        files[path_rel] = entry.stat(follow_symlinks=False).st_mtime_ns
+        return files
+
+    def record(self, stage: str, unit: str, key: str, files_before: dict[str, int]) -> list[str]:
+        """
+        Legt het manifest van een uitgevoerde eenheid vast: de invoersleutel en de aangemaakte of gewijzigde bestanden.
+
+        Args:
+            stage (str): De naam van de pipelinestap.
+            unit (str): De naam van de eenheid binnen de stap, of een lege string.
+            key (str): De invoersleutel van de eenheid.
+            files_before (dict[str, int]): Het resultaat van list_files() van vóór het uitvoeren.
+
+        Returns:
+            list[str]: De bestanden die aan de eenheid zijn toegeschreven.
+        """
+        files = sorted(
+            path_rel
+            for path_rel, mtime_ns in self.list_files().items()
+            if files_before.get(path_rel) != mtime_ns
+        )
+        path_manifest = self._path_manifest(self.path_intermediate, stage, unit)
+        path_manifest.parent.mkdir(parents=True, exist_ok=True)
+        with open(path_manifest, "w", encoding="utf-8") as f:
+            json.dump({"stage": stage, "unit": unit, "key": key, "files": files}, f)
+        return files
+
+    def find(self, stage: str, unit: str, key: str) -> tuple[Path, dict] | None:
+        """
+        Zoekt de nieuwste eerdere versie waarin de eenheid met dezelfde invoersleutel is uitgevoerd.
+
+        Args:
+            stage (str): De naam van de pipelinestap.
+            unit (str): De naam van de eenheid binnen de stap, of een lege string.
+            key (str): De invoersleutel van de eenheid.
+
+        Returns:
+            tuple[Path, dict] | None: De versiemap en het manifest, of None als er geen treffer is.
+        """
+        path_root = self.path_intermediate.parent
+        for version in VersionAllocator(path_root).versions():
+            path_version = path_root / version
+            if path_version == self.path_intermediate:
+                continue
+            manifest = self._read_manifest(path_version, stage, unit)
+            if manifest and manifest.get("key") == key:
+                if all((path_version / path_rel).exists() for path_rel in manifest["files"]):
+                    return path_version, manifest
+        return None
+
+    def restore(self, stage: str, unit: str, key: str) -> bool:
+        """
+        Zet de uitvoer van een eerdere run met dezelfde invoersleutel door naar de huidige versie.
+
+        Args:
+            stage (str): De naam van de pipelinestap.
+            unit (str): De naam van de eenheid binnen de stap, of een lege string.
+            key (str): De invoersleutel van de eenheid.
+
+        Returns:
+            bool: True als de uitvoer is doorgezet en de eenheid overgeslagen kan worden.
+        """
+        if (found := self.find(stage, unit, key)) is None:
+            return False
+        path_version, manifest = found
+        for path_rel in manifest["files"]:
+            path_src = path_version / path_rel
+            path_dst = self.path_intermediate / path_rel
+            path_dst.parent.mkdir(parents=True, exist_ok=True)
+            if path_dst.exists():
+                path_dst.unlink()
+            if self.link:
+                try:
+                    os.link(path_src, path_dst)
+                    continue
+                except OSError:
+                    pass
+            shutil.copy2(path_src, path_dst)
+        path_manifest = self._path_manifest(self.path_intermediate, stage, unit)
+        path_manifest.parent.mkdir(parents=True, exist_ok=True)
+        with open(path_manifest, "w", encoding="utf-8") as f:
+            json.dump({**manifest, "restored_from": path_version.name}, f)
+        logger.info(f"Stap '{stage}' {unit} overgenomen uit versie {path_version.name}.")
+        return True
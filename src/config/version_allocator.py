@@ -0,0 +1,310 @@
+import json
+import os
+import re
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from logtools import get_logger
+
+logger = get_logger(name =__name__,  dir_output = '.', base_file = 'log_genesis.json')
+
+PATTERN_VERSION = re.compile(r"^v(\d+)\.(\d+)\.(\d+)$")
+
+
+def parse_version(name: str) -> tuple[int, int, int] | None:
+    """
+    Zet een versienaam in het formaat 'vXX.XX.XX' om naar een sorteerbare tuple.
+
+    Args:
+        name (str): De naam van de versiemap.
+
+    Returns:
+        tuple[int, int, int] | None: Major, minor en patch, of None als de naam geen versie is.
+    """
+    if match := PATTERN_VERSION.match(name):
+        return tuple(map(int, match.groups()))
+    return None
+
+
+@contextmanager
+def locked(path_lock: Path):
+    """
+    Houdt een exclusieve, procesoverstijgende lock vast op een lockbestand.
+
+    Args:
+        path_lock (Path): Het lockbestand; de map ervan wordt aangemaakt als die nog niet bestaat.
+    """
+    path_lock.parent.mkdir(parents=True, exist_ok=True)
+    with open(path_lock, "a+b") as file_lock:
+        if fcntl is not None:
+            fcntl.flock(file_lock.fileno(), fcntl.LOCK_EX)
+        else:
+            file_lock.seek(0)
+            msvcrt.locking(file_lock.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(file_lock.fileno(), fcntl.LOCK_UN)
+            else:
+                file_lock.seek(0)
+                msvcrt.locking(file_lock.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def is_locked(path_lock: Path) -> bool:
+    """
+    Controleert zonder te wachten of een proces de lock op een lockbestand vasthoudt.
+
+    Args:
+        path_lock (Path): Het lockbestand; als het niet bestaat is er geen lock.
+
+    Returns:
+        bool: True als de lock op dit moment wordt vastgehouden.
+    """
+    try:
+        file_lock = open(path_lock, "r+b")
+    except FileNotFoundError:
+        return False
+    with file_lock:
+        try:
+            if fcntl is not None:
+                fcntl.flock(file_lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                fcntl.flock(file_lock.fileno(), fcntl.LOCK_UN)
+            else:
+                msvcrt.locking(file_lock.fileno(), msvcrt.LK_NBLCK, 1)
+                file_lock.seek(0)
+                msvcrt.locking(file_lock.fileno(), msvcrt.LK_UNLCK, 1)
+        except OSError:
+            return True
+    return False
+
+
+def format_version(major: int, minor: int, patch: int) -> str:
+    """
+    Zet major, minor en patch om naar een versienaam in het formaat 'vXX.XX.XX'.
+
+    Returns:
+        str: De versienaam.
+    """
+    return f"v{major:02}.{minor:02}.{patch:02}"
+
+
+class VersionAllocator:
+    """
+    Deelt versienamen uit voor de outputmappen onder '<folder_intermediate_root>/<title>'.
+
+    De laatst uitgedeelde versie en de bestaande versies worden bijgehouden in een klein indexbestand
+    naast de versiemappen, zodat de volgende versie en de lijst met versies bepaald worden zonder de
+    titelmap te lezen. Het uitdelen gebeurt onder een bestandslock, waardoor twee gelijktijdig
+    gestarte runs nooit dezelfde versie krijgen, ook niet vanuit verschillende processen. De index
+    wordt alleen onder die lock geschreven; lezen gebeurt zonder lock. Bestaande versiemappen worden
+    bij de eerste allocatie eenmalig gescand om de index te vullen. Wie een versiemap verwijdert,
+    meldt dat met release().
+    """
+
+    VERSION_DEFAULT = "v00.01.00"
+    FILE_INDEX = ".versions.json"
+    FILE_LOCK = ".versions.lock"
+    FILE_RUN_LOCK = ".run.lock"
+
+    def __init__(self, path_root: Path):
+        """
+        Initialiseert de VersionAllocator voor een titelmap.
+
+        Args:
+            path_root (Path): De map '<folder_intermediate_root>/<title>' waarin de versiemappen staan.
+        """
+        self.path_root = Path(path_root)
+        self.path_index = self.path_root / self.FILE_INDEX
+        self.path_lock = self.path_root / self.FILE_LOCK
+
+    def _locked(self):
+        """
+        Houdt een exclusieve, procesoverstijgende lock vast op het lockbestand van de titelmap.
+        """
+        return locked(self.path_lock)
+
+    def _read_index(self) -> dict | None:
+        """
+        Leest het indexbestand in.
+
+        Returns:
+            dict | None: De inhoud van de index, of None als die ontbreekt of onleesbaar is.
+        """
+        try:
+            with open(self.path_index, encoding="utf-8") as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Versie-index '{self.path_index}' is onleesbaar en wordt opnieuw opgebouwd: {e}")
+            return None
+        return index if isinstance(index, dict) else None
+
+    def _write_index(self, index: dict) -> None:
+        """
+        Schrijft het indexbestand atomair weg.
+
+        Args:
+            index (dict): De nieuwe inhoud van de index.
+        """
+        path_tmp = self.path_index.with_name(f"{self.FILE_INDEX}.{os.getpid()}.tmp")
+        with open(path_tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(path_tmp, self.path_index)
+
+    def _scan_versions(self) -> list[str]:
+        """
+        Bepaalt de bestaande versies door de versiemappen te scannen (migratie).
+
+        Returns:
+            list[str]: De versienamen, nieuwste eerst.
+        """
+        if not self.path_root.exists():
+            return []
+        versions = [
+            entry.name
+            for entry in os.scandir(self.path_root)
+            if entry.is_dir() and parse_version(entry.name)
+        ]
+        return sorted(versions, key=parse_version, reverse=True)
+
+    def _load_index(self) -> dict:
+        """
+        Geeft de index terug en bouwt die eenmalig op uit de bestaande mappen als ze ontbreekt
+        of nog geen lijst met versies bevat. Moet aangeroepen worden terwijl de lock wordt vastgehouden.
+
+        Returns:
+            dict: De index met de laatst uitgedeelde versie onder 'latest' en de bestaande versies,
+            nieuwste eerst, onder 'versions'.
+        """
+        index = self._read_index()
+        if index is None or not isinstance(index.get("versions"), list):
+            versions = self._scan_versions()
+            candidates = [index.get("latest") if index else None, *versions[:1]]
+            latest = max((v for v in candidates if v and parse_version(v)), key=parse_version, default=None)
+            index = {"latest": latest, "versions": versions}
+            self._write_index(index)
+        return index
+
+    @classmethod
+    def _next(cls, latest: str | None) -> str:
+        """
+        Bepaalt de versie die na de opgegeven versie volgt door het patch-nummer te verhogen.
+
+        Args:
+            latest (str | None): De laatst uitgedeelde versie.
+
+        Returns:
+            str: De volgende versienaam.
+        """
+        if latest is None or (version := parse_version(latest)) is None:
+            return cls.VERSION_DEFAULT
+        major, minor, patch = version
+        return format_version(major, minor, patch + 1)
+
+    def run_lock(self, version: str):
+        """
+        Geeft de lock die een run op zijn versiemap vasthoudt zolang de run loopt.
+
+        Args:
+            version (str): De versienaam van de run.
+
+        Returns:
+            De contextmanager die de lock vasthoudt.
+        """
+        return locked(self.path_root / version / self.FILE_RUN_LOCK)
+
+    def is_running(self, version: str) -> bool:
+        """
+        Controleert of een run de lock op een versiemap vasthoudt.
+
+        Args:
+            version (str): De versienaam.
+
+        Returns:
+            bool: True als er nog een run in deze versiemap bezig is.
+        """
+        return is_locked(self.path_root / version / self.FILE_RUN_LOCK)
+
+    def versions(self) -> list[str]:
+        """
+        Geeft alle bestaande versiemappen terug, nieuwste eerst, uit de index.
+
+        Zonder (bijgewerkte) index worden de mappen gescand; de index wordt dan niet geschreven.
+
+        Returns:
+            list[str]: De versienamen.
+        """
+        index = self._read_index()
+        if index is not None and isinstance(index.get("versions"), list):
+            return list(index["versions"])
+        return self._scan_versions()
+
+    def latest(self) -> str | None:
+        """
+        Geeft de laatst uitgedeelde versie terug zonder een nieuwe te reserveren.
+
+        Zonder index wordt de hoogste bestaande versie gescand; de index wordt dan niet geschreven.
+
+        Returns:
+            str | None: De laatst uitgedeelde versienaam, of None als er nog geen versie is.
+        """
+        index = self._read_index()
+        if index is not None:
+            return index.get("latest")
+        versions = self._scan_versions()
+        return versions[0] if versions else None
+
+    def peek(self) -> str:
+        """
+        Geeft de versie terug die bij de volgende allocatie uitgedeeld zou worden, zonder deze te reserveren.
+
+        Returns:
+            str: De volgende versienaam.
+        """
+        return self._next(self.latest())
+
+    def allocate(self) -> str:
+        """
+        Reserveert atomair de volgende versie en maakt de bijbehorende versiemap aan.
+
+        Bestaat de map al (bijvoorbeeld handmatig aangemaakt), dan wordt doorgeteld tot een vrije versie.
+
+        Returns:
+            str: De gereserveerde versienaam.
+        """
+        with self._locked():
+            index = self._load_index()
+            version = self._next(index.get("latest"))
+            while True:
+                try:
+                    (self.path_root / version).mkdir()
+                    break
+                except FileExistsError:
+                    version = self._next(version)
+            index["latest"] = version
+            index["versions"] = [version, *(v for v in index["versions"] if v != version)]
+            self._write_index(index)
+        return version
+
+    def release(self, version: str) -> None:
+        """
+        Haalt een versie uit de index nadat de versiemap is verwijderd.
+
+        De versienaam blijft als laatst uitgedeelde versie staan, zodat die niet opnieuw wordt uitgedeeld.
+
+        Args:
+            version (str): De versienaam.
+        """
+        with self._locked():
+            index = self._load_index()
+            if version in index["versions"]:
+                index["versions"].remove(version)
+                self._write_index(index)
@@ -1,5 +1,8 @@
 import argparse
+import os
+import shutil
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from time import sleep
 
@@ -7,6 +10,7 @@ from tqdm import tqdm
 import webbrowser
 
 from config import GenesisConfig
+from config.base import ConfigFileError
 from logtools import get_logger
 
 BOLD_GREEN = "\x1b[1;92m"
@@ -20,6 +24,192 @@ RESET = "\x1b[0m"
 
 logger = get_logger(name =__name__,  dir_output = '.', base_file = 'log_genesis.json')
 
+
+# Stappen die per eenheid (model) onafhankelijk zijn en parallel uitgevoerd kunnen worden
+STAGES_PARALLEL = {"extractor"}
+
+
+def process_unit(stage: str, unit: str, path_staging: str, position: int = 0) -> str:
+    """
+    Verwerkt één eenheid van een pipelinestap en schrijft de uitvoer naar een eigen tijdelijke map.
+
+    Staat op moduleniveau zodat de functie in een procespool uitgevoerd kan worden.
+
+    Args:
+        stage (str): De naam van de pipelinestap.
+        unit (str): De naam van de eenheid, bijvoorbeeld een PowerDesigner-model.
+        path_staging (str): De tijdelijke uitvoermap van deze eenheid.
+        position (int): De regel van de voortgangsbalk bij parallelle verwerking.
+
+    Returns:
+        str: De naam van de verwerkte eenheid.
+    """
+    Path(path_staging).mkdir(parents=True, exist_ok=True)
+    label = f"{stage} {unit}".strip()
+    for _ in tqdm(range(0, 10), desc=label, colour="blue", position=position):
+        sleep(0.1)
+    return unit
+
+
+def merge_staging(path_staging: Path, path_output: Path) -> None:
+    """
+    Verplaatst de uitvoer van een eenheid vanuit de tijdelijke map naar de uitvoermap van de stap.
+
+    Args:
+        path_staging (Path): De tijdelijke uitvoermap van de eenheid.
+        path_output (Path): De uitvoermap van de stap.
+    """
+    if not path_staging.exists():
+        return
+    for path_file in sorted(p for p in path_staging.rglob("*") if p.is_file()):
+        path_target = path_output / path_file.relative_to(path_staging)
+        path_target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(path_file, path_target)
+
+
+def run_stage(
+    config: GenesisConfig, stage: str, keys: dict[str, str] | None, workers: int = 1, resume: bool = False
+) -> bool:
+    """
+    Voert een pipelinestap uit, eenheid voor eenheid.
+
+    Eenheden waarvan de invoersleutel overeenkomt met een eerdere run worden niet opnieuw berekend;
+    hun uitvoer wordt uit de stapcache naar de huidige versie doorgezet. De overige eenheden van
+    onafhankelijke stappen worden over een procespool verdeeld. Elke eenheid schrijft naar een eigen
+    tijdelijke map, waarna de uitvoer in een vaste volgorde in de uitvoermap van de stap wordt samengevoegd.
+    Na afloop krijgt de stap een voltooiingsmarkering; bij het hervatten van een versie wordt een stap
+    met een markering voor dezelfde invoer overgeslagen.
+
+    Args:
+        config (GenesisConfig): De configuratie van de run.
+        stage (str): De naam van de pipelinestap; gelijk aan het attribuut van de deelconfiguratie.
+        keys (dict[str, str] | None): De invoersleutel per eenheid, of None als caching niet mogelijk is.
+        workers (int): Het maximaal aantal workerprocessen voor onafhankelijke stappen.
+        resume (bool): Of een in deze versie al afgeronde stap overgeslagen mag worden.
+
+    Returns:
+        bool: False als de stap bij het hervatten is overgeslagen, anders True.
+    """
+    cache = config.stage_cache
+    key_stage = config.stage_key(keys)
+    if resume and cache.is_complete(stage, key_stage):
+        print(f"{BOLD_GREEN}{stage}: al afgerond in {config.path_intermediate.name}, overgeslagen.{RESET}", file=sys.stdout)
+        return False
+    keys = keys or {"": None}
+    units_pending = []
+    for unit, key in keys.items():
+        if key is not None and cache.restore(stage, unit, key):
+            label = f"{stage} {unit}".strip()
+            print(f"{BOLD_GREEN}{label}: invoer ongewijzigd, uitvoer overgenomen.{RESET}", file=sys.stdout)
+        else:
+            units_pending.append(unit)
+    if not units_pending:
+        cache.mark_complete(stage, key_stage)
+        return True
+
+    path_staging = config.path_intermediate / ".work" / stage
+    paths_staging = [str(path_staging / (unit or stage)) for unit in units_pending]
+    if stage in STAGES_PARALLEL and workers > 1 and len(units_pending) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(units_pending))) as executor:
+            list(executor.map(process_unit, [stage] * len(units_pending), units_pending, paths_staging, range(len(units_pending))))
+    else:
+        for unit, path_unit in zip(units_pending, paths_staging):
+            process_unit(stage, unit, path_unit)
+
+    path_output = getattr(config, stage).path_output
+    for unit, path_unit in zip(units_pending, paths_staging):
+        files_before = cache.list_files()
+        merge_staging(Path(path_unit), path_output)
+        if keys[unit] is not None:
+            cache.record(stage, unit, keys[unit], files_before)
+    shutil.rmtree(path_staging, ignore_errors=True)
+    try:
+        path_staging.parent.rmdir()
+    except OSError:
+        pass
+    cache.mark_complete(stage, key_stage)
+    return True
+
+
+# Antwoordbeleid bij waarschuwingen: vragen, automatisch doorgaan, automatisch stoppen of afbreken met een fout
+ANSWER_POLICIES = ["ask", "yes", "no", "fail"]
+EXIT_DECLINED = 2
+EXIT_WARNINGS = 3
+
+
+def confirm_warnings(policy: str) -> None:
+    """
+    Vraagt of de run ondanks waarschuwingen door moet gaan, of beslist dat volgens het antwoordbeleid.
+
+    Bij een non-interactief beleid wordt nooit op invoer gewacht. Als bij 'ask' geen invoer meer
+    beschikbaar is (gesloten stdin), wordt de run afgebroken in plaats van te blijven wachten.
+
+    Args:
+        policy (str): Het antwoordbeleid; een van ANSWER_POLICIES.
+    """
+    msg = f"{BOLD_YELLOW}Waarschuwingen gevonden, wil je doorgaan? (J/n):{RESET}"
+    if policy == "yes":
+        print(f"{BOLD_YELLOW}Waarschuwingen gevonden, automatisch doorgegaan.{RESET}", file=sys.stdout)
+        return
+    if policy == "no":
+        print(f"{BOLD_RED}Waarschuwingen gevonden, automatisch gestopt.{RESET}", file=sys.stdout)
+        sys.exit(EXIT_DECLINED)
+    if policy == "fail":
+        print(f"{BOLD_RED}Waarschuwingen gevonden in een non-interactieve run, afgebroken.{RESET}", file=sys.stdout)
+        logger.error("Run afgebroken vanwege waarschuwingen (antwoordbeleid 'fail').")
+        sys.exit(EXIT_WARNINGS)
+
+    lst_answers_yes = ["", "J", "JA", "JAWOHL", "Y", "YES"]
+    lst_answers_no = ["N", "NEE", "NEIN", "NO"]
+    while True:
+        print(msg, file=sys.stdout)
+        try:
+            answer = input(msg)
+        except EOFError:
+            print(f"{BOLD_RED}Geen invoer beschikbaar om de waarschuwingen te bevestigen, afgebroken.{RESET}", file=sys.stdout)
+            sys.exit(EXIT_WARNINGS)
+        if answer.upper() in lst_answers_no:
+            print(
+                f"{BOLD_RED}'We gaan niet door!{RESET}",
+                file=sys.stdout,
+            )
+        elif answer.upper() in lst_answers_yes:
+            break
+        else:
+            print(
+                f"{BOLD_RED}'{answer}' behoort niet tot de mogelijke antwoorden (j/n).{RESET}",
+                file=sys.stdout,
+            )
+
+
+def print_plan(plan: dict) -> None:
+    """
+    Toont per invoergroep de gewijzigde bestanden en per stap wat een volgende run opnieuw zou uitvoeren.
+
+    Args:
+        plan (dict): Het plan zoals bepaald door GenesisConfig.plan().
+    """
+    if plan["version"] is None:
+        print(f"{BOLD_YELLOW}Geen eerdere succesvolle versie; alles wordt gegenereerd.{RESET}", file=sys.stdout)
+    else:
+        print(f"{BOLD_CYAN}Vergeleken met versie {plan['version']}{RESET}", file=sys.stdout)
+    for group, changes in plan["files"].items():
+        for change, label in [("added", "nieuw"), ("changed", "gewijzigd"), ("removed", "verwijderd")]:
+            for path_file in changes[change]:
+                print(f"  {group}: {label} {path_file}", file=sys.stdout)
+    for stage, units in plan["stages"].items():
+        if not units["stale"]:
+            print(f"{BOLD_GREEN}{stage}: ongewijzigd{RESET}", file=sys.stdout)
+        elif units["stale"] == [""]:
+            print(f"{BOLD_YELLOW}{stage}: wordt opnieuw uitgevoerd{RESET}", file=sys.stdout)
+        else:
+            print(
+                f"{BOLD_YELLOW}{stage}: {len(units['stale'])} van {len(units['stale']) + len(units['fresh'])} "
+                f"opnieuw ({', '.join(units['stale'])}){RESET}",
+                file=sys.stdout,
+            )
+
+
 def main():
     """
     Start het Genesis orkestratieproces via de command line interface.
@@ -43,53 +233,80 @@ def main():
     parser.add_argument(
         "-s", "--skip", action="store_true", help="Sla DevOps deployment over"
     )
+    parser.add_argument(
+        "-w", "--workers", type=int, help="Aantal workerprocessen voor het parallel verwerken van modellen"
+    )
+    parser.add_argument(
+        "-r", "--resume", metavar="VERSIE", help="Hervat een afgebroken run vanaf de eerste onvoltooide stap"
+    )
+    parser.add_argument(
+        "-a", "--answer", choices=ANSWER_POLICIES,
+        help="Antwoordbeleid bij waarschuwingen; standaard 'yes' als ignore-warnings aan staat, anders 'ask'"
+    )
+    parser.add_argument(
+        "-p", "--plan", action="store_true", help="Toon wat een run opnieuw zou genereren zonder iets uit te voeren"
+    )
+    parser.add_argument(
+        "--snapshot", help=argparse.SUPPRESS  # Gevalideerde configuratie van de webapplicatie, zie GenesisConfig.write_snapshot()
+    )
     args = parser.parse_args()
 
-    config = GenesisConfig(file_config=Path(args.config_file), create_version_dir=False)
+    try:
+        if args.snapshot:
+            config = GenesisConfig.from_snapshot(args.snapshot)
+        else:
+            config = GenesisConfig(
+                file_config=Path(args.config_file), create_version_dir=not args.plan, version=args.resume
+            )
+    except ConfigFileError as e:
+        print(f"{BOLD_RED}{e}{RESET}", file=sys.stdout)
+        sys.exit(1)
+    if args.plan:
+        try:
+            print_plan(config.plan())
+        except ConfigFileError as e:
+            print(f"{BOLD_RED}{e}{RESET}", file=sys.stdout)
+            sys.exit(1)
+        return
+    with config.running():  # Het bewaarbeleid slaat een versie met een lopende run over
+        try:
+            latest = config.find_latest_success()
+            fingerprint = config.fingerprint(recorded=latest[1] if latest else None)
+        except ConfigFileError as e:
+            logger.warning(f"Vingerafdruk van de invoer kon niet worden bepaald: {e}")
+            fingerprint = None
 
-    print(
-        f"{BOLD_CYAN}{UNDERLINE}Start Genesis verwerking{RESET}",
-        file=sys.stdout,
-    )
+        print(
+            f"{BOLD_CYAN}{UNDERLINE}Start Genesis verwerking{RESET}",
+            file=sys.stdout,
+        )
 
-    logger.info("Dit is logger info")
-    logger.warning("Dit is een logger waarschuwing")
-    logger.error("Dit is logger error")
+        logger.info("Dit is logger info")
+        logger.warning("Dit is een logger waarschuwing")
+        logger.error("Dit is logger error")
 
 
-    for _ in tqdm(range(0, 25), desc="Progress 1", colour="blue"):
-        sleep(0.1)
-    for _ in tqdm(range(0, 10), desc="Progress 2", colour="magenta"):
-        sleep(0.1)
+        stage_keys = config.stage_keys(fingerprint) if fingerprint is not None else {}
+        workers = args.workers or config.extractor.workers
+        resume = args.resume is not None
+        for stage in ["extractor", "integrator", "generator"]:
+            executed = run_stage(config, stage, stage_keys.get(stage), workers=workers, resume=resume)
+            resume = resume and not executed
 
-    lst_answers_yes = ["", "J", "JA", "JAWOHL", "Y", "YES"]
-    lst_answers_no = ["N", "NEE", "NEIN", "NO"]
-    while True:
-        msg = (
-            f"{BOLD_YELLOW}Waarschuwingen gevonden, wil je doorgaan? (J/n):{RESET}"
-        )
-        print(msg, file=sys.stdout)
-        answer = input(msg)
-        if answer.upper() in lst_answers_no:
-            print(
-                f"{BOLD_RED}'We gaan niet door!{RESET}",
-                file=sys.stdout,
-            )
-        elif answer.upper() in lst_answers_yes:
-            break
-        else:
+        confirm_warnings(args.answer or ("yes" if config.ignore_warnings else "ask"))
+
+        run_stage(config, "deploy_mdde", stage_keys.get("deploy_mdde"), resume=resume)
+
+        for i in range(25):
             print(
-                f"{BOLD_RED}'{answer}' behoort niet tot de mogelijke antwoorden (j/n).{RESET}",
-                file=sys.stdout,
-            )
+                    f"{BOLD_MAGENTA}'{i}' regels.{RESET}",
+                    file=sys.stdout,
+                )
 
-    for i in range(25):
-        print(
-                f"{BOLD_MAGENTA}'{i}' regels.{RESET}",
-                file=sys.stdout,
-            )
+        webbrowser.open("https://github.com/", new=0, autoraise=True)
 
-    webbrowser.open("https://github.com/", new=0, autoraise=True)
+        if fingerprint is not None:
+            config.write_fingerprint(fingerprint)
 
     print(f"{BOLD_BLUE}Afgerond zonder fouten.{RESET}", file=sys.stdout)
 
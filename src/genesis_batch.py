@@ -0,0 +1,191 @@
+import argparse
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+BOLD_GREEN = "\x1b[1;92m"
+BOLD_RED = "\x1b[1;91m"
+BOLD_CYAN = "\x1b[1;96m"
+UNDERLINE = "\x1b[4m"
+RESET = "\x1b[0m"
+
+PATH_GENESIS = Path(__file__).resolve().parent / "genesis.py"
+PATTERN_ANSI = re.compile(r"\x1b\[[0-9;]*m")
+PATTERN_ISSUE = re.compile(r"^(WARNING|ERROR|CRITICAL):")
+
+_lock_stdout = threading.Lock()
+
+
+@dataclass
+class BatchResult:
+    """Het resultaat van één Genesis-run binnen een batch."""
+
+    path_config: Path
+    returncode: int
+    duration: float
+    warnings: int = 0
+    errors: int = 0
+
+
+def run_names(paths_config: list[Path]) -> list[str]:
+    """
+    Bepaalt per configuratie een unieke naam voor het logbestand en de prefix van de uitvoer.
+
+    Dat is de bestandsnaam zonder extensie; configuraties met dezelfde naam in verschillende mappen
+    krijgen de naam van hun map ervoor en, als die ook gelijk is, hun volgnummer erachter.
+
+    Args:
+        paths_config (list[Path]): De configuratiebestanden in de volgorde van de batch.
+
+    Returns:
+        list[str]: De namen, in dezelfde volgorde.
+    """
+    counts = Counter(path_config.stem for path_config in paths_config)
+    names = [
+        path_config.stem if counts[path_config.stem] == 1 else f"{path_config.resolve().parent.name}_{path_config.stem}"
+        for path_config in paths_config
+    ]
+    counts = Counter(names)
+    return [name if counts[name] == 1 else f"{name}-{index}" for index, name in enumerate(names, start=1)]
+
+
+def run_config(path_config: Path, args_genesis: list[str], dir_logs: Path | None, name: str | None = None) -> BatchResult:
+    """
+    Voert genesis.py uit voor één configuratiebestand in een eigen proces en verwerkt de uitvoer.
+
+    De uitvoer wordt regel voor regel met de naam van de run als prefix naar stdout geschreven, of naar
+    '<dir_logs>/<naam>.log' als dir_logs is opgegeven. Stdin is gesloten, zodat een run nooit op
+    invoer blijft wachten. Als het proces niet gestart kan worden, telt dat als een mislukte run.
+
+    Args:
+        path_config (Path): Het configuratiebestand.
+        args_genesis (list[str]): Extra argumenten voor genesis.py.
+        dir_logs (Path | None): De map voor logbestanden per configuratie, of None voor stdout.
+        name (str | None): De naam van de run (zie run_names()), of None voor de bestandsnaam zonder extensie.
+
+    Returns:
+        BatchResult: De exitcode, duur en het aantal waarschuwingen en fouten van de run.
+    """
+    time_start = time.perf_counter()
+    name = name or path_config.stem
+    result = BatchResult(path_config=path_config, returncode=-1, duration=0.0)
+    file_log = None
+    try:
+        file_log = open(dir_logs / f"{name}.log", "w", encoding="utf-8") if dir_logs else None
+        process = subprocess.Popen(
+            [sys.executable, str(PATH_GENESIS), str(path_config), *args_genesis],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            env={**os.environ, "PYTHONUNBUFFERED": "1"},
+        )
+    except OSError as e:
+        if file_log:
+            file_log.close()
+        result.errors += 1
+        result.duration = time.perf_counter() - time_start
+        with _lock_stdout:
+            print(f"[{name}] {BOLD_RED}ERROR{RESET}: Genesis kon niet worden gestart: {e}", file=sys.stdout, flush=True)
+        return result
+    try:
+        for line in process.stdout:
+            # Voortgangsbalken overschrijven zichzelf met '\r'; alleen de laatste stand is relevant
+            line = line.rstrip("\n").split("\r")[-1]
+            if match := PATTERN_ISSUE.match(PATTERN_ANSI.sub("", line)):
+                if match.group(1) == "WARNING":
+                    result.warnings += 1
+                else:
+                    result.errors += 1
+            if file_log:
+                file_log.write(f"{line}\n")
+            else:
+                with _lock_stdout:
+                    print(f"[{name}] {line}", file=sys.stdout, flush=True)
+        result.returncode = process.wait()
+    finally:
+        if file_log:
+            file_log.close()
+    result.duration = time.perf_counter() - time_start
+    return result
+
+
+def print_summary(results: list[BatchResult]) -> None:
+    """
+    Toont een overzichtstabel met per configuratie de status, duur en het aantal waarschuwingen en fouten.
+
+    Args:
+        results (list[BatchResult]): De resultaten van de runs.
+    """
+    width = max([len("Configuratie"), *(len(result.path_config.name) for result in results)])
+    print(f"\n{BOLD_CYAN}{UNDERLINE}Samenvatting{RESET}", file=sys.stdout)
+    print(f"{'Configuratie':<{width}}  {'Status':<10}  {'Duur':>8}  {'Waarsch.':>8}  {'Fouten':>6}", file=sys.stdout)
+    for result in results:
+        status = "ok" if result.returncode == 0 else f"exit {result.returncode}"
+        colour = BOLD_GREEN if result.returncode == 0 else BOLD_RED
+        print(
+            f"{result.path_config.name:<{width}}  {colour}{status:<10}{RESET}  {result.duration:>7.1f}s  "
+            f"{result.warnings:>8}  {result.errors:>6}",
+            file=sys.stdout,
+        )
+
+
+def main():
+    """
+    Voert Genesis voor meerdere configuratiebestanden parallel uit via de command line interface.
+
+    Elke configuratie draait in een eigen proces; het aantal gelijktijdige runs is begrensd. De
+    exitcode is 0 als alle runs geslaagd zijn, anders 1.
+    """
+    parser = argparse.ArgumentParser(description="Voert de Genesis workflow uit voor meerdere configuraties")
+    parser.add_argument("config_files", nargs="+", help="Locaties van configuratiebestanden")
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=max(1, (os.cpu_count() or 1) // 2),
+        help="Maximaal aantal configuraties dat tegelijk wordt uitgevoerd"
+    )
+    parser.add_argument(
+        "-l", "--log-dir", type=Path, help="Schrijf de uitvoer per configuratie naar '<log-dir>/<naam>.log'"
+    )
+    parser.add_argument(
+        "-a", "--answer", choices=["yes", "no", "fail"],
+        help="Antwoordbeleid bij waarschuwingen; standaard volgens ignore-warnings, anders afbreken"
+    )
+    parser.add_argument("-s", "--skip", action="store_true", help="Sla DevOps deployment over")
+    args = parser.parse_args()
+
+    paths_config = [Path(file_config) for file_config in args.config_files]
+    jobs = max(1, min(args.jobs, len(paths_config)))
+    # Verdeel de processoren over de runs, zodat parallelle extractie binnen een run niet overboekt
+    args_genesis = ["--workers", str(max(1, (os.cpu_count() or 1) // jobs))]
+    if args.answer:
+        args_genesis += ["--answer", args.answer]
+    if args.skip:
+        args_genesis.append("--skip")
+    if args.log_dir:
+        args.log_dir.mkdir(parents=True, exist_ok=True)
+
+    names = run_names(paths_config)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        results = list(
+            executor.map(
+                lambda path_config, name: run_config(path_config, args_genesis, args.log_dir, name),
+                paths_config,
+                names,
+            )
+        )
+
+    print_summary(results)
+    sys.exit(0 if all(result.returncode == 0 for result in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
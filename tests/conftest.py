@@ -0,0 +1,31 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+import yaml
+
+PATH_REPO = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PATH_REPO / "src"))
+
+
+def pytest_sessionstart(session):
+    """De app leest configs/ uit de werkmap en schrijft daar zijn logbestanden; gebruik een lege tijdelijke map."""
+    dir_work = tempfile.mkdtemp(prefix="genesis-tests-")
+    os.makedirs(os.path.join(dir_work, "configs"))
+    os.chdir(dir_work)
+
+
+@pytest.fixture
+def path_config(tmp_path):
+    """Een kopie van de voorbeeldconfiguratie met titel 'test' en de output en modellen in tmp_path."""
+    data = yaml.safe_load((PATH_REPO / "configs" / "config.yml").read_text(encoding="utf-8"))
+    data.update({
+        "title": "test",
+        "folder-intermediate-root": str(tmp_path / "output"),
+        "power-designer": {"folder": str(tmp_path / "models"), "files": []},
+    })
+    path_config = tmp_path / "test.yaml"
+    path_config.write_text(yaml.safe_dump(data), encoding="utf-8")
+    return path_config
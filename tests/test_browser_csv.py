@@ -0,0 +1,65 @@
+import pytest
+
+from app.app import app
+from app.routes.browser import csv_indexes
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch):
+    """De root van de bestandsbrowser is de werkmap; maak die een submap zodat er ook iets buiten valt."""
+    path_root = tmp_path / "root"
+    path_root.mkdir()
+    monkeypatch.chdir(path_root)
+    return path_root
+
+
+@pytest.fixture
+def client(root):
+    return app.test_client()
+
+
+def test_patch_targets_row_from_csv_rows(client, root):
+    (root / "data.csv").write_bytes(b"a,b\n1,x\n\n2,y\n3,z\n")
+    page = client.get("/browser/csv_rows/data.csv?start=1&stop=3").get_json()
+    assert [(row["_row"], row["a"]) for row in page["data"]] == [(1, "2"), (2, "3")]
+
+    version = csv_indexes.get(root / "data.csv").version
+    response = client.post(
+        "/browser/edit_csv/data.csv",
+        json={"version": version, "cells": [{"row": page["data"][0]["_row"], "field": "b", "value": "changed"}]},
+    )
+    assert response.status_code == 200
+    assert (root / "data.csv").read_bytes() == b"a,b\n1,x\n\n2,changed\n3,z\n"
+
+
+def test_patch_with_stale_version_is_rejected(client, root):
+    (root / "data.csv").write_bytes(b"a,b\n1,x\n")
+    response = client.post(
+        "/browser/edit_csv/data.csv", json={"version": "old", "cells": [{"row": 0, "field": "b", "value": "y"}]}
+    )
+    assert response.status_code == 409
+    assert (root / "data.csv").read_bytes() == b"a,b\n1,x\n"
+
+
+def test_save_outside_root_is_refused(client, root):
+    path_outside = root.parent / "outside.csv"
+    path_outside.write_bytes(b"a,b\n1,x\n")
+    response = client.post("/browser/edit_csv/../outside.csv", json={"csv": "a,b\nhacked,1\n"})
+    assert response.status_code == 403
+    assert path_outside.read_bytes() == b"a,b\n1,x\n"
+
+
+def test_export_filename_is_quoted(client, root):
+    (root / "my data;x.csv").write_bytes(b"a,b\n1,x\n")
+    response = client.get("/browser/export_csv/my data;x.csv?gzip=1")
+    assert response.status_code == 200
+    assert response.headers["Content-Disposition"] == 'attachment; filename="my data;x.csv.gz"'
+
+
+def test_export_non_ascii_filename(client, root):
+    (root / "prijzen €.csv").write_bytes(b"a,b\n1,x\n")
+    response = client.get("/browser/export_csv/prijzen €.csv")
+    assert response.status_code == 200
+    assert response.headers["Content-Disposition"] == (
+        "attachment; filename=\"prijzen .csv\"; filename*=UTF-8''prijzen%20%E2%82%AC.csv"
+    )
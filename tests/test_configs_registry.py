@@ -0,0 +1,14 @@
+from app.configs_registry import ConfigRegistry
+
+
+def test_add_keeps_the_runner_of_a_registered_config(path_config, tmp_path, monkeypatch):
+    registry = ConfigRegistry()
+    monkeypatch.setattr(ConfigRegistry, "CONFIG_DIR", tmp_path)
+    monkeypatch.setattr(ConfigRegistry, "FILE_SNAPSHOT", tmp_path / ".registry_snapshot.json")
+    monkeypatch.setattr(registry, "_configs", registry._configs)
+    monkeypatch.setattr(registry, "_sort_indexes", registry._sort_indexes)
+
+    registry.add(path_config.name)
+    runner = registry.get_config_runner(path_config.name)
+    registry.add(path_config.name)
+    assert registry.get_config_runner(path_config.name) is runner
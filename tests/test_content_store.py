@@ -0,0 +1,40 @@
+from config.content_store import ContentStore
+
+
+def test_deduplicate_and_collect_garbage(tmp_path):
+    path_output = tmp_path / "output"
+    for version in ("v00.01.00", "v00.01.01"):
+        (path_output / version).mkdir(parents=True)
+        (path_output / version / "model.json").write_text("{}", encoding="utf-8")
+    store = ContentStore(tmp_path / ContentStore.DIR_STORE)
+
+    linked, saved = store.deduplicate(path_output)
+    assert (linked, saved) == (1, 2)
+    assert (path_output / "v00.01.00" / "model.json").stat().st_nlink == 3
+
+    (store.path_store / "stray.txt").write_text("geen blob", encoding="utf-8")
+    assert store.collect_garbage() == 0
+
+    for version in ("v00.01.00", "v00.01.01"):
+        (path_output / version / "model.json").unlink()
+    assert store.collect_garbage() == 1
+    assert (store.path_store / "stray.txt").exists()
+
+
+def test_deduplicate_skips_a_failing_file(tmp_path, monkeypatch):
+    path_output = tmp_path / "output"
+    for version in ("v00.01.00", "v00.01.01"):
+        (path_output / version).mkdir(parents=True)
+        (path_output / version / "a.txt").write_text("a", encoding="utf-8")
+        (path_output / version / "b.txt").write_text("b", encoding="utf-8")
+    store = ContentStore(tmp_path / ContentStore.DIR_STORE)
+    add = store.add
+
+    def add_failing(path, stat=None):
+        if path.endswith("a.txt"):
+            raise PermissionError(path)
+        return add(path, stat)
+
+    monkeypatch.setattr(store, "add", add_failing)
+    assert store.deduplicate(path_output) == (1, 1)
+    assert (path_output / "v00.01.00" / "b.txt").stat().st_nlink == 3
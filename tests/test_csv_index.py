@@ -0,0 +1,39 @@
+from app.csv_index import CsvIndex
+
+CONTENT = 'a,b\n1,x\n\n2,y\n\r\n"3\nz","q""\n"\n4,w'
+EXPECTED = [["1", "x"], ["2", "y"], ["3\nz", 'q"\n'], ["4", "w"]]
+
+
+def make_index(tmp_path, content=CONTENT):
+    path_file = tmp_path / "data.csv"
+    path_file.write_bytes(content.encode("utf-8"))
+    return CsvIndex(path_file)
+
+
+def test_blank_lines_and_multiline_fields_are_not_counted(tmp_path):
+    index = make_index(tmp_path)
+    assert index.header == ["a", "b"]
+    assert index.row_count == 4
+    assert index.rows(0, 10) == list(enumerate(EXPECTED))
+
+
+def test_row_numbers_do_not_depend_on_page_start(tmp_path):
+    index = make_index(tmp_path)
+    for start in range(4):
+        assert index.rows(start, start + 2) == list(enumerate(EXPECTED))[start:start + 2]
+
+
+def test_sorted_rows_keep_file_row_numbers(tmp_path):
+    index = make_index(tmp_path)
+    assert index.rows(0, 4, sort_column="a", descending=True) == [(3, EXPECTED[3]), (2, EXPECTED[2]), (1, EXPECTED[1]), (0, EXPECTED[0])]
+
+
+def test_patch_after_blank_line_changes_the_right_record(tmp_path):
+    index = make_index(tmp_path)
+    path_out = tmp_path / "out.csv"
+    with open(path_out, "wb") as f_out:
+        index.write_patched(f_out, {1: {"b": "changed"}, 2: {"a": "three"}})
+    patched = CsvIndex(path_out)
+    assert patched.rows(0, 10) == [(0, ["1", "x"]), (1, ["2", "changed"]), (2, ["three", 'q"\n']), (3, ["4", "w"])]
+    # Ongewijzigde bytes, inclusief de lege regels, blijven behouden
+    assert path_out.read_bytes().startswith(b"a,b\n1,x\n\n2,changed\n\r\n")
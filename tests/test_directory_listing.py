@@ -0,0 +1,14 @@
+import os
+
+from app.directory_listing import ListingCache
+
+
+def test_tag_survives_a_rescan_of_an_unchanged_directory(tmp_path):
+    (tmp_path / "model.json").write_text("{}", encoding="utf-8")
+    cache = ListingCache(max_age=0)
+
+    _, tag, _ = cache.get(tmp_path, tmp_path)
+    assert cache.get(tmp_path, tmp_path)[1] == tag
+
+    os.utime(tmp_path / "model.json", (0, 0))
+    assert cache.get(tmp_path, tmp_path)[1] != tag
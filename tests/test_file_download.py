@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.app import app
+
+CONTENT = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch):
+    """De root van de bestandsbrowser is de werkmap."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data.bin").write_bytes(CONTENT)
+    return tmp_path
+
+
+@pytest.fixture
+def client(root, monkeypatch):
+    monkeypatch.setitem(app.config, "DOWNLOAD_OFFLOAD", None)
+    return app.test_client()
+
+
+def test_full_download(client):
+    response = client.get("/browser/download-file/data.bin")
+    assert response.status_code == 200
+    assert response.data == CONTENT
+    assert response.headers["Accept-Ranges"] == "bytes"
+    assert response.headers["ETag"]
+
+
+def test_range_returns_partial_content(client):
+    response = client.get("/browser/download-file/data.bin", headers={"Range": "bytes=10-19"})
+    assert response.status_code == 206
+    assert response.headers["Content-Range"] == f"bytes 10-19/{len(CONTENT)}"
+    assert response.data == CONTENT[10:20]
+
+    response = client.get("/browser/download-file/data.bin", headers={"Range": "bytes=1000-"})
+    assert response.status_code == 206
+    assert response.data == CONTENT[1000:]
+
+
+def test_range_outside_file_is_not_satisfiable(client):
+    response = client.get("/browser/download-file/data.bin", headers={"Range": f"bytes={len(CONTENT)}-"})
+    assert response.status_code == 416
+    assert response.headers["Content-Range"] == f"bytes */{len(CONTENT)}"
+
+
+def test_not_modified_by_etag_and_by_date(client):
+    response = client.get("/browser/download-file/data.bin")
+    etag, last_modified = response.headers["ETag"], response.headers["Last-Modified"]
+
+    response = client.get("/browser/download-file/data.bin", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.data == b""
+
+    response = client.get("/browser/download-file/data.bin", headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 304
+
+
+def test_if_range_mismatch_returns_whole_file(client):
+    etag = client.get("/browser/download-file/data.bin").headers["ETag"]
+    response = client.get("/browser/download-file/data.bin", headers={"Range": "bytes=0-9", "If-Range": etag})
+    assert response.status_code == 206
+
+    response = client.get("/browser/download-file/data.bin", headers={"Range": "bytes=0-9", "If-Range": '"other"'})
+    assert response.status_code == 200
+    assert response.data == CONTENT
+
+    date_old = (datetime.now(timezone.utc) - timedelta(days=1)).strftime("%a, %d %b %Y %H:%M:%S GMT")
+    response = client.get("/browser/download-file/data.bin", headers={"Range": "bytes=0-9", "If-Range": date_old})
+    assert response.status_code == 200
+    assert response.data == CONTENT
+
+
+def test_offload_to_proxy(client, root, monkeypatch):
+    monkeypatch.setitem(app.config, "DOWNLOAD_OFFLOAD", "x-accel")
+    monkeypatch.setitem(app.config, "DOWNLOAD_ACCEL_PREFIX", "/protected/")
+    response = client.get("/browser/download-file/data.bin")
+    assert response.headers["X-Accel-Redirect"] == "/protected/data.bin"
+    assert response.data == b""
+
+    monkeypatch.setitem(app.config, "DOWNLOAD_OFFLOAD", "x-sendfile")
+    response = client.get("/browser/download-file/data.bin")
+    assert response.headers["X-Sendfile"] == str(root.resolve() / "data.bin")
+    assert response.data == b""
+
+
+def test_non_ascii_filename_gets_ascii_fallback(client, root):
+    (root / "héllo €.csv").write_bytes(b"a\n")
+    response = client.get("/browser/download-file/héllo €.csv")
+    assert response.status_code == 200
+    disposition = response.headers["Content-Disposition"]
+    disposition.encode("latin-1")
+    assert disposition == "attachment; filename=\"hello .csv\"; filename*=UTF-8''h%C3%A9llo%20%E2%82%AC.csv"
+
+
+def test_folder_zip_with_non_ascii_name(client, root):
+    (root / "résultats").mkdir()
+    (root / "résultats" / "a.txt").write_bytes(b"a")
+    response = client.get("/browser/download-folder/résultats")
+    assert response.status_code == 200
+    assert response.headers["Content-Disposition"] == (
+        "attachment; filename=resultats.zip; filename*=UTF-8''r%C3%A9sultats.zip"
+    )
+    assert response.data[:2] == b"PK"
@@ -0,0 +1,19 @@
+from pathlib import Path
+
+import genesis_batch
+
+
+def test_run_names_are_unique():
+    paths_config = [Path("a/config.yml"), Path("b/config.yml"), Path("b/config.yaml"), Path("c/other.yml")]
+    assert genesis_batch.run_names(paths_config) == ["a_config", "b_config-2", "b_config-3", "other"]
+
+
+def test_failed_start_is_a_failed_result(tmp_path, monkeypatch):
+    def popen_failing(*args, **kwargs):
+        raise OSError("geen python")
+
+    monkeypatch.setattr(genesis_batch.subprocess, "Popen", popen_failing)
+    result = genesis_batch.run_config(tmp_path / "config.yml", [], tmp_path, name="a_config")
+    assert result.returncode != 0
+    assert result.errors == 1
+    assert (tmp_path / "a_config.log").exists()
@@ -0,0 +1,38 @@
+import os
+import sys
+
+import pytest
+
+from app.app import app
+from config import GenesisConfig
+
+runner_routes = sys.modules["app.routes.runner"]
+
+
+def test_fingerprint_of_snapshot_ignores_later_edits(path_config):
+    genesis_config = GenesisConfig(file_config=path_config, create_version_dir=True)
+    path_snapshot = genesis_config.write_snapshot()
+    digest = genesis_config.fingerprint()["digest"]
+
+    path_config.write_text(path_config.read_text(encoding="utf-8").replace("title: test", "title: edited"), encoding="utf-8")
+    assert GenesisConfig.from_snapshot(path_snapshot).fingerprint()["digest"] == digest
+    assert GenesisConfig(file_config=path_config, create_version_dir=False).fingerprint()["digest"] != digest
+
+
+def test_failed_start_discards_snapshot_and_version(path_config, tmp_path, monkeypatch):
+    class RunnerFailing:
+        status = "idle"
+
+        def start(self, args):
+            self.args = args
+            raise OSError("kan niet starten")
+
+    runner = RunnerFailing()
+    monkeypatch.setattr(runner_routes, "CONFIG_DIR", tmp_path)
+    monkeypatch.setattr(runner_routes.config_registry, "get_config_runner", lambda filename: runner)
+    with app.test_request_context(method="POST"), pytest.raises(OSError):
+        runner_routes.launch(path_config.name)
+
+    path_snapshot = runner.args[runner.args.index("--snapshot") + 1]
+    assert not os.path.exists(path_snapshot)
+    assert not any(path.name.startswith("v") for path in (tmp_path / "output" / "test").iterdir())
@@ -0,0 +1,25 @@
+import json
+
+from app.log_index import LogIndex, query_logs
+
+
+def write_log(path, messages):
+    with open(path, "w", encoding="utf-8") as f:
+        for number, message in enumerate(messages):
+            record = {"asctime": f"2025-01-01 00:00:{number:02}", "levelname": "INFO", "module": "app", "message": message}
+            f.write(json.dumps(record) + "\n")
+
+
+def test_text_filter_matches_escaped_characters(tmp_path):
+    path_log = tmp_path / "log_app.json"
+    write_log(path_log, ["Café geopend", "prijs 5 €", 'pad "C:\\data"', "gewone regel"])
+
+    def search(text):
+        entries, _ = query_logs(LogIndex, path_log, text=text)
+        return [entry["message"] for entry in entries]
+
+    assert search("café") == ["Café geopend"]
+    assert search("€") == ["prijs 5 €"]
+    assert search('"c:\\data"') == ['pad "C:\\data"']
+    assert search("regel") == ["gewone regel"]
+    assert search("asctime") == []
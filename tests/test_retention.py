@@ -0,0 +1,31 @@
+from config.content_store import ContentStore
+from config.retention import RetentionConfig, RetentionConfigData
+from config.version_allocator import VersionAllocator
+
+
+def make_versions(path_root, count, content=b"x" * 1000):
+    allocator = VersionAllocator(path_root)
+    versions = [allocator.allocate() for _ in range(count)]
+    for version in versions:
+        (path_root / version / "model.json").write_bytes(content)
+    return versions
+
+
+def test_shared_files_count_once(tmp_path):
+    path_root = tmp_path / "output" / "test"
+    make_versions(path_root, 3)
+    retention = RetentionConfig(RetentionConfigData(), path_root=path_root)
+    assert retention.total_size() == 3000
+
+    ContentStore(tmp_path / "output" / ContentStore.DIR_STORE).deduplicate(path_root)
+    assert retention.total_size() == 1000
+
+
+def test_prune_skips_running_version(tmp_path):
+    path_root = tmp_path / "output" / "test"
+    versions = make_versions(path_root, 3)
+    retention = RetentionConfig(RetentionConfigData(keep_last=1), path_root=path_root)
+    with VersionAllocator(path_root).run_lock(versions[0]):
+        assert retention.prune() == [versions[1]]
+    assert (path_root / versions[0]).is_dir()
+    assert retention.prune() == [versions[0]]
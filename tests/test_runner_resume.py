@@ -0,0 +1,37 @@
+import sys
+
+import pytest
+
+from app.app import app
+from config import GenesisConfig
+from config.base import ConfigFileError
+from config.stage_cache import StageCache
+
+runner_routes = sys.modules["app.routes.runner"]
+
+
+@pytest.fixture
+def path_resumable(path_config, tmp_path, monkeypatch):
+    """Een afgebroken run v00.01.00 van de configuratie en een versiemap van een andere titel ernaast."""
+    monkeypatch.setattr(runner_routes, "CONFIG_DIR", tmp_path)
+    StageCache(tmp_path / "output" / "test" / "v00.01.00").mark_complete("extractor", None)
+    (tmp_path / "output" / "other" / "v00.01.00").mkdir(parents=True)
+    return path_config
+
+
+def test_resume_version_outside_title_is_rejected(path_resumable):
+    with pytest.raises(ConfigFileError, match="geen geldige versienaam"):
+        GenesisConfig(file_config=path_resumable, create_version_dir=False, version="../other/v00.01.00")
+
+
+def test_resume_only_accepts_resumable_version(path_resumable, monkeypatch):
+    launched = []
+    monkeypatch.setattr(runner_routes, "launch", lambda filename, args=None: launched.append(args) or "")
+    client = app.test_client()
+
+    response = client.post("/runner/resume/test.yaml", data={"version": "../other/v00.01.00"})
+    assert response.status_code == 409
+    assert launched == []
+
+    client.post("/runner/resume/test.yaml", data={"version": "v00.01.00"})
+    assert launched == [["--resume", "v00.01.00"]]
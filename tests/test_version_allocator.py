@@ -0,0 +1,20 @@
+from config.version_allocator import VersionAllocator
+
+
+def test_versions_and_latest_are_served_from_the_index(tmp_path):
+    path_root = tmp_path / "output" / "test"
+    (path_root / "v00.01.04").mkdir(parents=True)
+    allocator = VersionAllocator(path_root)
+
+    assert allocator.versions() == ["v00.01.04"]
+    assert allocator.latest() == "v00.01.04"
+    assert not allocator.path_index.exists()
+
+    assert allocator.allocate() == "v00.01.05"
+    (path_root / "v00.02.00").mkdir()
+    assert allocator.versions() == ["v00.01.05", "v00.01.04"]
+    assert allocator.latest() == "v00.01.05"
+
+    allocator.release("v00.01.04")
+    assert allocator.versions() == ["v00.01.05"]
+    assert allocator.allocate() == "v00.01.06"